@@ -29,3 +29,9 @@ print(decision)
 
 # Memorize mistakes and reflect
 # ta.reflect_and_remember(1000) # parameter is the position returns
+
+# Backtest over a date range, reflecting on realized returns (resumes from its checkpoint)
+# from tradingagents.graph.backtest import Backtester
+# backtester = Backtester(ta, ["NVDA"], "2024-05-01", "2024-05-31", holding_days=1)
+# backtester.run()
+# print(backtester.summary())
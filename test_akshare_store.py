@@ -0,0 +1,189 @@
+"""
+测试 AkShare 本地增量时间序列存储（pickle + JSON 元数据）
+"""
+import json
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.dataflows import akshare_store
+from tradingagents.dataflows.akshare_store import get_local_series
+from tradingagents.dataflows.config import get_config, set_config
+
+
+class FakeSource:
+    """模拟行情接口：记录每次调用的 since，并按 since 返回数据"""
+
+    def __init__(self, closes):
+        self.frame = self._frame(closes)
+        self.calls = []
+        self.fail = False
+
+    @staticmethod
+    def _frame(closes):
+        index = pd.to_datetime(list(closes))
+        index.name = "Date"
+        return pd.DataFrame({"Close": list(closes.values())}, index=index)
+
+    def set(self, closes):
+        self.frame = self._frame(closes)
+
+    def __call__(self, symbol, source, since):
+        self.calls.append(since)
+        if self.fail:
+            raise ConnectionError("接口超时")
+        data = self.frame if since is None else self.frame[self.frame.index >= since]
+        return data.copy(), source or f"sh{symbol}"
+
+
+def _use_temp_store():
+    original = get_config()["data_cache_dir"]
+    set_config({"data_cache_dir": tempfile.mkdtemp()})
+    akshare_store._series_cache.clear()
+    return original
+
+
+def _restore(original):
+    set_config({"data_cache_dir": original})
+    akshare_store._series_cache.clear()
+
+
+def _start_new_day(kind, symbol, checked_on="2024-01-10"):
+    """把元数据的检查日期改为过去，并清空进程内缓存，模拟之后某天的新进程"""
+    meta_path = akshare_store._store_path(kind, symbol, ".json")
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["checked_on"] = checked_on
+    with open(meta_path, "w", encoding="utf-8") as f:
+        json.dump(meta, f)
+    akshare_store._series_cache.clear()
+    return meta
+
+
+def test_round_trip():
+    """测试首次下载写入存储，之后同一天直接读取本地数据"""
+    original = _use_temp_store()
+    try:
+        fetch = FakeSource({"2024-01-02": 10.0, "2024-01-03": 10.5, "2024-01-04": 10.2})
+        data = get_local_series("index", "000300", fetch, rebase_column="Close")
+        assert fetch.calls == [None]
+        assert list(data["Close"]) == [10.0, 10.5, 10.2]
+
+        # 新进程当天再次读取：来自磁盘，不请求接口
+        akshare_store._series_cache.clear()
+        again = get_local_series("index", "000300", fetch, rebase_column="Close")
+        assert fetch.calls == [None]
+        pd.testing.assert_frame_equal(again, data)
+
+        with open(akshare_store._store_path("index", "000300", ".json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        assert meta["last_bar"] == "2024-01-04"
+        assert meta["source"] == "sh000300"
+    finally:
+        _restore(original)
+    print("✓ 本地存储读写测试通过")
+
+
+def test_incremental_update_overwrites_unsettled_bar():
+    """测试增量更新从已确认K线开始，盘中写入的最后一根K线被覆盖而不触发重新下载"""
+    original = _use_temp_store()
+    try:
+        fetch = FakeSource({"2024-01-02": 10.0, "2024-01-03": 10.5, "2024-01-04": 10.2})
+        get_local_series("stock", "000001", fetch, rebase_column="Close")
+
+        # 01-04 收盘价在收盘后变化，并新增 01-05
+        fetch.set({"2024-01-02": 10.0, "2024-01-03": 10.5, "2024-01-04": 10.4, "2024-01-05": 10.8})
+        meta = _start_new_day("stock", "000001")
+        assert meta["source"] == "sh000001"
+
+        data = get_local_series("stock", "000001", fetch, rebase_column="Close")
+        assert fetch.calls == [None, pd.Timestamp("2024-01-03")]
+        assert list(data.index.strftime("%Y-%m-%d")) == [
+            "2024-01-02", "2024-01-03", "2024-01-04", "2024-01-05",
+        ]
+        assert list(data["Close"]) == [10.0, 10.5, 10.4, 10.8]
+    finally:
+        _restore(original)
+    print("✓ 增量更新测试通过")
+
+
+def test_rebased_history_is_reloaded():
+    """测试已确认K线数值变化（如除权重算前复权）时重新下载全部历史"""
+    original = _use_temp_store()
+    try:
+        fetch = FakeSource({"2024-01-02": 10.0, "2024-01-03": 10.5, "2024-01-04": 10.2})
+        get_local_series("stock", "600000", fetch, rebase_column="Close")
+
+        fetch.set({"2024-01-02": 5.0, "2024-01-03": 5.25, "2024-01-04": 5.1, "2024-01-05": 5.3})
+        _start_new_day("stock", "600000")
+        data = get_local_series("stock", "600000", fetch, rebase_column="Close")
+        assert fetch.calls == [None, pd.Timestamp("2024-01-03"), None]
+        assert list(data["Close"]) == [5.0, 5.25, 5.1, 5.3]
+    finally:
+        _restore(original)
+    print("✓ 重算检测测试通过")
+
+
+def test_covered_range_and_failed_refresh():
+    """测试已覆盖的查询不请求接口，刷新失败时返回已存数据"""
+    original = _use_temp_store()
+    try:
+        fetch = FakeSource({"2024-01-02": 1.01, "2024-01-03": 1.02})
+        get_local_series("fund", "000001", fetch, covers_through="2024-01-03")
+
+        _start_new_day("fund", "000001")
+        get_local_series("fund", "000001", fetch, covers_through="2024-01-03")
+        assert fetch.calls == [None]
+
+        fetch.fail = True
+        data = get_local_series("fund", "000001", fetch, covers_through="2024-01-10")
+        assert len(fetch.calls) == 2
+        assert list(data["Close"]) == [1.01, 1.02]
+    finally:
+        _restore(original)
+    print("✓ 覆盖区间与刷新失败测试通过")
+
+
+def test_unsettled_bar_does_not_cover_its_day():
+    """测试盘中写入的最后一根K线不算覆盖当天，之后查询当天时会更新"""
+    original = _use_temp_store()
+    try:
+        fetch = FakeSource({"2024-01-02": 10.0, "2024-01-03": 10.5})
+        get_local_series("index", "000300", fetch, covers_through="2024-01-03")
+
+        # 01-03 盘中检查：查询 01-03 时重新获取并覆盖这根K线
+        fetch.set({"2024-01-02": 10.0, "2024-01-03": 10.7})
+        _start_new_day("index", "000300", "2024-01-03")
+        data = get_local_series("index", "000300", fetch, covers_through="2024-01-03")
+        assert fetch.calls == [None, pd.Timestamp("2024-01-02")]
+        assert list(data["Close"]) == [10.0, 10.7]
+
+        # 01-03 之后检查过：直接使用本地数据
+        _start_new_day("index", "000300", "2024-01-04")
+        get_local_series("index", "000300", fetch, covers_through="2024-01-03")
+        # 之后还有K线时，更早的日期一定已确认
+        _start_new_day("index", "000300", "2024-01-03")
+        get_local_series("index", "000300", fetch, covers_through="2024-01-02")
+        assert len(fetch.calls) == 2
+    finally:
+        _restore(original)
+    print("✓ 未确认K线刷新测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("AkShare 本地存储测试")
+    print("=" * 60 + "\n")
+
+    test_round_trip()
+    test_incremental_update_overwrites_unsettled_bar()
+    test_rebased_history_is_reloaded()
+    test_covered_range_and_failed_refresh()
+    test_unsettled_bar_does_not_cover_its_day()
+
+    print("\n所有测试完成\n")
@@ -0,0 +1,257 @@
+"""
+测试 Alpha Vantage 完整序列缓存（内存 + pickle）
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.dataflows import alpha_vantage_common
+from tradingagents.dataflows.alpha_vantage_common import (
+    AlphaVantageAPIKeyError,
+    AlphaVantageRateLimitError,
+    get_series_frame,
+)
+from tradingagents.dataflows.config import get_config, set_config
+
+DAILY_CSV = (
+    "timestamp,open,high,low,close,adjusted_close,volume,dividend_amount,split_coefficient\n"
+    "2024-01-04,182.15,183.09,180.88,181.91,181.91,71983600,0.0,1.0\n"
+    "2024-01-03,184.22,185.88,183.43,184.25,184.25,58414500,0.0,1.0\n"
+    "2024-01-02,187.15,188.44,183.89,185.64,185.64,82488700,0.0,1.0\n"
+)
+
+NEWER_CSV = (
+    "timestamp,open,high,low,close,adjusted_close,volume,dividend_amount,split_coefficient\n"
+    "2024-01-05,181.99,182.76,180.17,181.18,181.18,62303300,0.0,1.0\n"
+) + DAILY_CSV.split("\n", 1)[1]
+
+
+class FakeApi:
+    """替代 _make_api_request，记录请求并返回预设的 CSV"""
+
+    def __init__(self, response):
+        self.response = response
+        self.calls = []
+
+    def __call__(self, function_name, params):
+        self.calls.append((function_name, params))
+        if isinstance(self.response, Exception):
+            raise self.response
+        return self.response
+
+
+def _setup(response):
+    original = (get_config()["data_cache_dir"], alpha_vantage_common._make_api_request)
+    set_config({"data_cache_dir": tempfile.mkdtemp()})
+    alpha_vantage_common._series_frames.clear()
+    api = FakeApi(response)
+    alpha_vantage_common._make_api_request = api
+    return original, api
+
+
+def _restore(original):
+    set_config({"data_cache_dir": original[0]})
+    alpha_vantage_common._make_api_request = original[1]
+    alpha_vantage_common._series_frames.clear()
+
+
+def _age_stored_series(checked_on="2024-01-10"):
+    """把已存序列的检查日期改为过去，并清空内存缓存，模拟之后某天的新进程"""
+    cache_dir = os.path.join(get_config()["data_cache_dir"], "alpha_vantage")
+    for name in os.listdir(cache_dir):
+        path = os.path.join(cache_dir, name)
+        stored = pd.read_pickle(path)
+        stored["checked_on"] = checked_on
+        pd.to_pickle(stored, path)
+    alpha_vantage_common._series_frames.clear()
+
+
+def test_round_trip():
+    """测试序列解析后写入磁盘，新进程从磁盘读取而不请求接口"""
+    original, api = _setup(DAILY_CSV)
+    try:
+        params = {"symbol": "AAPL", "outputsize": "full"}
+        frame = get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+        assert len(api.calls) == 1
+        assert api.calls[0][1]["datatype"] == "csv"
+        # 按日期升序索引
+        assert list(frame.index.strftime("%Y-%m-%d")) == ["2024-01-02", "2024-01-03", "2024-01-04"]
+        assert frame.loc["2024-01-03", "close"] == 184.25
+
+        alpha_vantage_common._series_frames.clear()
+        again = get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-03")
+        assert len(api.calls) == 1
+        pd.testing.assert_frame_equal(again, frame)
+
+        # 参数不同的序列分开缓存
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", {"symbol": "MSFT", "outputsize": "full"})
+        assert len(api.calls) == 2
+    finally:
+        _restore(original)
+    print("✓ 序列缓存读写测试通过")
+
+
+def test_refresh_when_window_is_not_covered():
+    """测试已存序列不覆盖查询日期且今天未检查时重新获取"""
+    original, api = _setup(DAILY_CSV)
+    try:
+        params = {"symbol": "AAPL", "outputsize": "full"}
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+
+        # 过去的窗口仍被覆盖：不请求
+        _age_stored_series()
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+        assert len(api.calls) == 1
+
+        # 更新的窗口：重新获取并替换已存序列
+        api.response = NEWER_CSV
+        frame = get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-05")
+        assert len(api.calls) == 2
+        assert frame.index[-1] == pd.Timestamp("2024-01-05")
+
+        alpha_vantage_common._series_frames.clear()
+        stored = get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-05")
+        assert len(api.calls) == 2
+        assert len(stored) == 4
+    finally:
+        _restore(original)
+    print("✓ 序列刷新测试通过")
+
+
+def test_unsettled_last_bar_is_refreshed():
+    """测试盘中获取的最后一根K线不算覆盖当天，之后的查询会重新获取"""
+    original, api = _setup(DAILY_CSV)
+    try:
+        params = {"symbol": "AAPL", "outputsize": "full"}
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+
+        # 01-04 盘中获取：01-04 的K线尚未确定，回测 01-04 时重新获取
+        _age_stored_series("2024-01-04")
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+        assert len(api.calls) == 2
+
+        # 01-04 收盘后获取：之后的查询直接使用已存序列
+        _age_stored_series("2024-01-05")
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-04")
+        assert len(api.calls) == 2
+
+        # 之后还有K线时，更早的日期一定已确定
+        _age_stored_series("2024-01-04")
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-03")
+        assert len(api.calls) == 2
+    finally:
+        _restore(original)
+    print("✓ 未确定K线刷新测试通过")
+
+
+def test_failed_refresh_serves_stored_series():
+    """测试刷新失败时返回已存序列，没有已存序列时抛出异常"""
+    original, api = _setup(DAILY_CSV)
+    try:
+        params = {"symbol": "AAPL", "outputsize": "full"}
+        get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params)
+        _age_stored_series()
+
+        api.response = ConnectionError("timeout")
+        frame = get_series_frame("TIME_SERIES_DAILY_ADJUSTED", params, covers_through="2024-01-10")
+        assert len(frame) == 3
+
+        try:
+            get_series_frame("TIME_SERIES_DAILY_ADJUSTED", {"symbol": "IBM", "outputsize": "full"})
+        except ConnectionError:
+            pass
+        else:
+            raise AssertionError("get_series_frame() should raise without a stored series")
+
+        # 错误响应不会被当作序列缓存
+        api.response = '{"Error Message": "Invalid API call."}'
+        try:
+            get_series_frame("RSI", {"symbol": "IBM", "interval": "daily"})
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("get_series_frame() should reject a non-CSV response")
+        assert not any(
+            name.startswith("RSI_")
+            for name in os.listdir(os.path.join(get_config()["data_cache_dir"], "alpha_vantage"))
+        )
+    finally:
+        _restore(original)
+    print("✓ 刷新失败测试通过")
+
+
+class FakeResponse:
+    def __init__(self, text):
+        self.text = text
+
+
+class FakeClient:
+    """替代共享的 AlphaVantageClient，返回预设的响应并记录是否清空了令牌桶"""
+
+    def __init__(self, text):
+        self.text = text
+        self.drained = False
+
+    def get(self, params):
+        return FakeResponse(self.text)
+
+    def record_server_rate_limit(self):
+        self.drained = True
+
+
+def test_information_replies():
+    """测试只有真正的限流回复才清空令牌桶，API key 问题抛出单独的异常"""
+    original = (alpha_vantage_common.get_client, os.environ.get("ALPHA_VANTAGE_API_KEY"))
+    os.environ["ALPHA_VANTAGE_API_KEY"] = "test"
+    try:
+        replies = [
+            ("Thank you for using Alpha Vantage! Our standard API rate limit is 25 requests per day.",
+             AlphaVantageRateLimitError, True),
+            ("Please consider spreading out your free API requests more sparingly (1 request per second).",
+             AlphaVantageRateLimitError, True),
+            ("the parameter apikey is invalid or missing. Please claim your free API key.",
+             AlphaVantageAPIKeyError, False),
+            ("Invalid API key. Please retry or visit the support page.",
+             AlphaVantageAPIKeyError, False),
+        ]
+        for message, error, drained in replies:
+            client = FakeClient('{"Information": "%s"}' % message)
+            alpha_vantage_common.get_client = lambda: client
+            try:
+                alpha_vantage_common._make_api_request("RSI", {"symbol": "IBM"})
+            except error:
+                pass
+            else:
+                raise AssertionError(f"{message!r} should raise {error.__name__}")
+            assert client.drained == drained, message
+
+        client = FakeClient(DAILY_CSV)
+        alpha_vantage_common.get_client = lambda: client
+        assert alpha_vantage_common._make_api_request("TIME_SERIES_DAILY", {}) == DAILY_CSV
+        assert not client.drained
+    finally:
+        alpha_vantage_common.get_client = original[0]
+        if original[1] is None:
+            os.environ.pop("ALPHA_VANTAGE_API_KEY")
+        else:
+            os.environ["ALPHA_VANTAGE_API_KEY"] = original[1]
+    print("✓ Information 回复测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("Alpha Vantage 序列缓存测试")
+    print("=" * 60 + "\n")
+
+    test_round_trip()
+    test_refresh_when_window_is_not_covered()
+    test_unsettled_last_bar_is_refreshed()
+    test_failed_refresh_serves_stored_series()
+    test_information_replies()
+
+    print("\n所有测试完成\n")
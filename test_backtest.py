@@ -0,0 +1,140 @@
+"""
+测试回测的断点续跑（使用替身图，不调用 LLM 和行情接口）
+"""
+import os
+import sys
+import tempfile
+
+import pandas as pd
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.graph.backtest import Backtester
+
+CLOSES = {
+    "2024-01-02": 100.0,
+    "2024-01-03": 101.0,
+    "2024-01-04": 99.0,
+    "2024-01-05": 102.0,
+    "2024-01-08": 103.0,
+    "2024-01-09": 101.0,
+}
+
+
+class Interrupted(BaseException):
+    """模拟进程被中断（不会被回测当作单步失败处理）"""
+
+
+class StubGraph:
+    """替身 TradingAgentsGraph：固定给出 BUY，记录每次反思"""
+
+    def __init__(self, results_dir, interrupt_propagate_on=None, interrupt_reflection_at=None):
+        self.config = {"results_dir": results_dir}
+        self.curr_state = None
+        self.propagated = []
+        self.reflections = []
+        self.interrupt_propagate_on = interrupt_propagate_on
+        self.interrupt_reflection_at = interrupt_reflection_at
+
+    def propagate(self, ticker, trade_date):
+        if trade_date == self.interrupt_propagate_on:
+            raise Interrupted()
+        self.propagated.append(trade_date)
+        final_state = {
+            "market_report": f"market {trade_date}",
+            "sentiment_report": "",
+            "news_report": "",
+            "fundamentals_report": "",
+            "trader_investment_plan": "",
+            "investment_debate_state": {"bull_history": "", "bear_history": "", "judge_decision": ""},
+            "risk_debate_state": {"judge_decision": ""},
+        }
+        return final_state, "BUY"
+
+    def reflect_and_remember(self, returns_summary):
+        if len(self.reflections) == self.interrupt_reflection_at:
+            raise Interrupted()
+        self.reflections.append(self.curr_state["market_report"])
+
+
+def _price_loader(ticker):
+    index = pd.to_datetime(list(CLOSES))
+    return pd.DataFrame({"Close": list(CLOSES.values())}, index=index)
+
+
+def _backtester(graph, checkpoint_path):
+    return Backtester(
+        graph, ["AAPL"], "2024-01-02", "2024-01-08",
+        checkpoint_path=checkpoint_path, price_loader=_price_loader,
+    )
+
+
+def _run_until_interrupted(backtester):
+    try:
+        backtester.run()
+    except Interrupted:
+        return
+    raise AssertionError("the stub graph should have interrupted the run")
+
+
+def test_full_run():
+    """测试完整运行：每个交易日一次决策，退出价已知后各反思一次"""
+    results_dir = tempfile.mkdtemp()
+    graph = StubGraph(results_dir)
+    backtester = _backtester(graph, None)
+    steps = backtester.run()
+
+    assert [step.trade_date for step in steps] == list(CLOSES)[:5]
+    assert all(step.reflected for step in steps)
+    assert graph.reflections == [f"market {date}" for date in list(CLOSES)[:5]]
+    assert os.path.exists(backtester.checkpoint_path)
+    assert abs(steps[0].realized_return - 0.01) < 1e-9
+    print("✓ 完整回测测试通过")
+
+
+def test_resume_after_interrupted_propagate():
+    """测试决策时中断后续跑，已完成的反思不会重复写入记忆"""
+    checkpoint = os.path.join(tempfile.mkdtemp(), "backtest.json")
+
+    # 01-05 决策前已经反思了 01-04，随后 propagate 被中断
+    first = StubGraph(None, interrupt_propagate_on="2024-01-05")
+    _run_until_interrupted(_backtester(first, checkpoint))
+    assert first.reflections == ["market 2024-01-02", "market 2024-01-03", "market 2024-01-04"]
+
+    second = StubGraph(None)
+    steps = _backtester(second, checkpoint).run()
+    assert second.propagated == ["2024-01-05", "2024-01-08"]
+    assert second.reflections == ["market 2024-01-05", "market 2024-01-08"]
+    assert [step.trade_date for step in steps] == list(CLOSES)[:5]
+    assert all(step.reflected for step in steps)
+    print("✓ 决策中断续跑测试通过")
+
+
+def test_resume_after_interrupted_reflection():
+    """测试在两次反思之间中断后续跑，只补做未完成的反思"""
+    checkpoint = os.path.join(tempfile.mkdtemp(), "backtest.json")
+
+    # 最后统一反思时，第 5 次反思被中断
+    first = StubGraph(None, interrupt_reflection_at=4)
+    _run_until_interrupted(_backtester(first, checkpoint))
+    assert len(first.reflections) == 4
+
+    second = StubGraph(None)
+    steps = _backtester(second, checkpoint).run()
+    assert second.propagated == []
+    assert second.reflections == ["market 2024-01-08"]
+    assert all(step.reflected for step in steps)
+    print("✓ 反思中断续跑测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("回测断点续跑测试")
+    print("=" * 60 + "\n")
+
+    test_full_run()
+    test_resume_after_interrupted_propagate()
+    test_resume_after_interrupted_reflection()
+
+    print("\n所有测试完成\n")
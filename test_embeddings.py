@@ -0,0 +1,106 @@
+"""
+测试本地哈希 n-gram 向量（embedding_provider = "local"）
+"""
+import os
+import sys
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.agents.utils.embeddings import (
+    EmbeddingProvider,
+    HashedNgramEmbeddingProvider,
+    create_embedding_provider,
+)
+
+
+def _cosine(a, b):
+    a = np.asarray(a, dtype=np.float32)
+    b = np.asarray(b, dtype=np.float32)
+    return float(a @ b / (np.linalg.norm(a) * np.linalg.norm(b)))
+
+
+def test_deterministic():
+    """测试相同文本在不同实例中得到相同向量"""
+    text = "High inflation with rising interest rates and declining consumer spending"
+    first = HashedNgramEmbeddingProvider().embed([text])[0]
+    second = HashedNgramEmbeddingProvider().embed([text, "other text"])[0]
+    assert np.array_equal(first, second)
+    assert first.dtype == np.float16
+    print("✓ 确定性测试通过")
+
+
+def test_dimensions():
+    """测试向量维度与配置一致且已归一化"""
+    for dimensions in (64, 256, 1024):
+        provider = HashedNgramEmbeddingProvider(dimensions)
+        vectors = provider.embed(["Tech sector showing high volatility", "贵州茅台 业绩 超预期"])
+        assert len(vectors) == 2
+        for vector in vectors:
+            assert vector.shape == (dimensions,)
+            assert abs(float(np.linalg.norm(vector.astype(np.float32))) - 1.0) < 1e-2
+        assert provider.dimensions == dimensions
+        assert provider.namespace == f"hashed-ngram-{dimensions}"
+
+    provider = create_embedding_provider({"embedding_provider": "local", "embedding_dimensions": 128})
+    assert isinstance(provider, HashedNgramEmbeddingProvider)
+    assert provider.embed(["x"])[0].shape == (128,)
+    # 空文本得到全零向量而不是 NaN
+    assert not np.isnan(provider.embed([""])[0].astype(np.float32)).any()
+    print("✓ 维度测试通过")
+
+
+def test_similar_texts_score_higher():
+    """测试相似文本的余弦相似度高于无关文本"""
+    provider = HashedNgramEmbeddingProvider()
+    query, similar, unrelated = provider.embed([
+        "Rising interest rates are hurting growth stocks and tech valuations",
+        "Higher interest rates hurt tech stocks and growth valuations",
+        "The company opened a new cafeteria for employees in its headquarters",
+    ])
+    assert _cosine(query, similar) > _cosine(query, unrelated)
+    assert _cosine(query, similar) > 0.3
+
+    cn_query, cn_similar, cn_unrelated = provider.embed([
+        "美联储加息导致科技股估值承压",
+        "美联储加息导致科技股估值继续承压",
+        "公司食堂本周推出新的午餐菜单",
+    ])
+    assert _cosine(cn_query, cn_similar) > _cosine(cn_query, cn_unrelated)
+    print("✓ 相似度测试通过")
+
+
+def test_provider_is_abstract():
+    """测试基类不能直接实例化，子类必须实现 embed"""
+    try:
+        EmbeddingProvider()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("EmbeddingProvider should be abstract")
+
+    class Incomplete(EmbeddingProvider):
+        pass
+
+    try:
+        Incomplete()
+    except TypeError:
+        pass
+    else:
+        raise AssertionError("subclasses without embed() should not be instantiable")
+    print("✓ 抽象基类测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("本地向量测试")
+    print("=" * 60 + "\n")
+
+    test_deterministic()
+    test_dimensions()
+    test_similar_texts_score_higher()
+    test_provider_is_abstract()
+
+    print("\n所有测试完成\n")
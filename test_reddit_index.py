@@ -0,0 +1,140 @@
+"""
+测试 Reddit 数据的 SQLite 索引（按日期分区、按股票标注）
+"""
+import json
+import os
+import sqlite3
+import sys
+import tempfile
+from datetime import datetime, timezone
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.reddit_utils import (
+    _index_path,
+    build_reddit_index,
+    fetch_top_from_category,
+    fetch_top_from_category_range,
+)
+
+
+def _post(day, ups, title, selftext=""):
+    created = datetime.strptime(day, "%Y-%m-%d").replace(hour=12, tzinfo=timezone.utc)
+    return {
+        "created_utc": created.timestamp(),
+        "ups": ups,
+        "title": title,
+        "selftext": selftext,
+        "url": f"https://reddit.com/{title.replace(' ', '_')}",
+    }
+
+
+def _write_jsonl(path, posts, mode="w"):
+    with open(path, mode, encoding="utf-8") as f:
+        for post in posts:
+            f.write(json.dumps(post) + "\n")
+
+
+def _make_data_dir():
+    data_path = tempfile.mkdtemp()
+    company = os.path.join(data_path, "company_news")
+    os.makedirs(company)
+    _write_jsonl(os.path.join(company, "stocks.jsonl"), [
+        _post("2024-01-02", 50, "Apple beats earnings"),
+        _post("2024-01-02", 80, "Tesla deliveries miss"),
+        _post("2024-01-03", 10, "Why I sold my AAPL shares"),
+    ])
+    _write_jsonl(os.path.join(company, "investing.jsonl"), [
+        _post("2024-01-02", 30, "Market wrap", "Apple and Microsoft led the rally"),
+    ])
+    return data_path
+
+
+def _use_temp_cache():
+    original = get_config()["data_cache_dir"]
+    set_config({"data_cache_dir": tempfile.mkdtemp()})
+    return original
+
+
+def test_round_trip():
+    """测试建立索引后按日期和股票查询"""
+    original = _use_temp_cache()
+    try:
+        data_path = _make_data_dir()
+        build_reddit_index(data_path)
+        assert os.path.exists(_index_path(data_path))
+
+        posts = fetch_top_from_category("company_news", "2024-01-02", 10, data_path=data_path)
+        # 按日期、子版块、点赞数排序
+        assert [post["title"] for post in posts] == [
+            "Market wrap", "Tesla deliveries miss", "Apple beats earnings",
+        ]
+        assert posts[1]["upvotes"] == 80
+        assert posts[1]["posted_date"] == "2024-01-02"
+
+        apple = fetch_top_from_category_range(
+            "company_news", "2024-01-02", "2024-01-03", 10, query="AAPL", data_path=data_path
+        )
+        assert [post["title"] for post in apple] == [
+            "Market wrap", "Apple beats earnings", "Why I sold my AAPL shares",
+        ]
+
+        # 每个子版块每天最多 max_limit // 文件数 条
+        limited = fetch_top_from_category("company_news", "2024-01-02", 2, data_path=data_path)
+        assert [post["title"] for post in limited] == ["Market wrap", "Tesla deliveries miss"]
+    finally:
+        set_config({"data_cache_dir": original})
+    print("✓ Reddit 索引读写测试通过")
+
+
+def test_incremental_update():
+    """测试只重建新增、修改或删除的文件"""
+    original = _use_temp_cache()
+    try:
+        data_path = _make_data_dir()
+        company = os.path.join(data_path, "company_news")
+        build_reddit_index(data_path)
+
+        # 追加一条帖子：修改过的文件被重新解析，不会产生重复
+        _write_jsonl(os.path.join(company, "stocks.jsonl"),
+                     [_post("2024-01-03", 99, "Apple Vision Pro launch date")], mode="a")
+        apple = fetch_top_from_category(
+            "company_news", "2024-01-03", 10, query="AAPL", data_path=data_path
+        )
+        assert [post["title"] for post in apple] == [
+            "Apple Vision Pro launch date", "Why I sold my AAPL shares",
+        ]
+
+        # 删除文件后其帖子从索引中移除
+        os.remove(os.path.join(company, "investing.jsonl"))
+        posts = fetch_top_from_category("company_news", "2024-01-02", 10, data_path=data_path)
+        assert [post["title"] for post in posts] == ["Tesla deliveries miss", "Apple beats earnings"]
+
+        conn = sqlite3.connect(_index_path(data_path))
+        try:
+            files = conn.execute("SELECT file_name FROM files ORDER BY file_name").fetchall()
+            post_count = conn.execute("SELECT COUNT(*) FROM posts").fetchone()[0]
+            orphan_tags = conn.execute(
+                "SELECT COUNT(*) FROM post_tickers WHERE post_id NOT IN (SELECT id FROM posts)"
+            ).fetchone()[0]
+        finally:
+            conn.close()
+        assert files == [("stocks.jsonl",)]
+        assert post_count == 4
+        assert orphan_tags == 0
+    finally:
+        set_config({"data_cache_dir": original})
+    print("✓ Reddit 索引增量更新测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("Reddit 索引测试")
+    print("=" * 60 + "\n")
+
+    test_round_trip()
+    test_incremental_update()
+
+    print("\n所有测试完成\n")
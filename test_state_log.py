@@ -0,0 +1,112 @@
+"""
+测试按运行分文件的状态日志（JSONL + 偏移索引）
+"""
+import json
+import os
+import sys
+import tempfile
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.graph.state_log import StateLogReader, StateLogWriter
+
+
+def _write_run(log_dir, trade_date, run_id, updates, final_state):
+    writer = StateLogWriter(log_dir, "AAPL", trade_date, run_id=run_id)
+    for update in updates:
+        writer.log_update(update)
+    writer.log_final(final_state)
+    return writer
+
+
+def test_round_trip():
+    """测试写入一次运行后按索引读回最终状态和节点更新"""
+    log_dir = tempfile.mkdtemp()
+    updates = [
+        {"Market Analyst": {"market_report": "上涨趋势"}},
+        {"News Analyst": {"news_report": "财报超预期"}, "Social Analyst": {"sentiment_report": "乐观"}},
+    ]
+    final_state = {"company_of_interest": "AAPL", "final_trade_decision": "BUY"}
+    writer = _write_run(log_dir, "2024-01-05", "run-a", updates, final_state)
+
+    assert writer.events == 3
+    reader = StateLogReader("AAPL", log_dir)
+    runs = reader.runs()
+    assert [run["run_id"] for run in runs] == ["run-a"]
+    assert runs[0]["events"] == 3
+
+    assert reader.load("2024-01-05") == final_state
+
+    records = list(reader.iter_updates("2024-01-05"))
+    assert [record["node"] for record in records] == ["Market Analyst", "News Analyst", "Social Analyst"]
+    assert [record["seq"] for record in records] == [0, 1, 2]
+    assert records[1]["update"] == {"news_report": "财报超预期"}
+    print("✓ 状态日志读写测试通过")
+
+
+def test_final_offset_points_at_final_line():
+    """测试索引中的偏移量正好指向 final 行"""
+    log_dir = tempfile.mkdtemp()
+    writer = _write_run(
+        log_dir, "2024-01-05", "run-a",
+        [{"Trader": {"trader_investment_plan": "x" * 1000}}],
+        {"final_trade_decision": "HOLD"},
+    )
+    entry = StateLogReader("AAPL", log_dir).runs()[0]
+
+    with open(writer.path, "rb") as f:
+        lines = f.readlines()
+    assert len(lines) == 2
+    assert entry["final_offset"] == len(lines[0])
+    assert json.loads(lines[1])["type"] == "final"
+    print("✓ 偏移量测试通过")
+
+
+def test_runs_are_appended_to_the_index():
+    """测试多次运行追加到索引，且可按日期和 run_id 读取"""
+    log_dir = tempfile.mkdtemp()
+    _write_run(log_dir, "2024-01-05", "run-a", [], {"final_trade_decision": "BUY"})
+    _write_run(log_dir, "2024-01-08", "run-b", [], {"final_trade_decision": "SELL"})
+    _write_run(log_dir, "2024-01-05", "run-c", [], {"final_trade_decision": "HOLD"})
+
+    reader = StateLogReader("AAPL", log_dir)
+    assert [run["run_id"] for run in reader.runs()] == ["run-a", "run-b", "run-c"]
+    assert [run["run_id"] for run in reader.runs("2024-01-05")] == ["run-a", "run-c"]
+
+    # 默认读取该日期最新的一次运行
+    assert reader.load("2024-01-05") == {"final_trade_decision": "HOLD"}
+    assert reader.load("2024-01-05", run_id="run-a") == {"final_trade_decision": "BUY"}
+    assert reader.load("2024-01-08") == {"final_trade_decision": "SELL"}
+    print("✓ 多次运行索引测试通过")
+
+
+def test_unfinished_run_is_not_indexed():
+    """测试未完成的运行不出现在索引中"""
+    log_dir = tempfile.mkdtemp()
+    writer = StateLogWriter(log_dir, "AAPL", "2024-01-05", run_id="crashed")
+    writer.log_update({"Market Analyst": {"market_report": "..."}})
+    writer.close()
+
+    reader = StateLogReader("AAPL", log_dir)
+    assert reader.runs() == []
+    try:
+        reader.load("2024-01-05")
+    except KeyError:
+        pass
+    else:
+        raise AssertionError("load() should raise KeyError for a date without finished runs")
+    print("✓ 未完成运行测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("状态日志测试")
+    print("=" * 60 + "\n")
+
+    test_round_trip()
+    test_final_offset_points_at_final_line()
+    test_runs_are_appended_to_the_index()
+    test_unfinished_run_is_not_indexed()
+
+    print("\n所有测试完成\n")
@@ -0,0 +1,205 @@
+"""
+测试工具结果缓存（内存 LRU + SQLite）
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.dataflows.config import get_config, set_config
+from tradingagents.dataflows.tool_cache import (
+    ToolResultCache,
+    get_tool_cache,
+    has_dated_values,
+    is_cacheable_result,
+    tool_cache_ttl,
+)
+
+STOCK_CSV = (
+    "# Stock data for AAPL from 2024-01-02 to 2024-01-05\n"
+    "# Total records: 2\n\n"
+    "Date,Open,High,Low,Close,Volume\n"
+    "2024-01-02,187.15,188.44,183.89,185.64,82488700\n"
+    "2024-01-03,184.22,185.88,183.43,184.25,58414500\n"
+)
+
+
+def _new_cache(memory_entries=512):
+    tmp_dir = tempfile.mkdtemp()
+    return ToolResultCache(os.path.join(tmp_dir, "tool_cache.sqlite3"), memory_entries)
+
+
+def test_lru_evicts_least_recently_used():
+    """测试内存层按最近使用顺序淘汰"""
+    cache = _new_cache(memory_entries=2)
+    cache.put("get_stock_data", "yfinance", ("A",), {}, ["a"], None)
+    cache.put("get_stock_data", "yfinance", ("B",), {}, ["b"], None)
+    # 访问 A 后 B 成为最久未使用的条目
+    assert cache.get("get_stock_data", "yfinance", ("A",), {}) == ["a"]
+    cache.put("get_stock_data", "yfinance", ("C",), {}, ["c"], None)
+
+    assert cache.stats()["memory_entries"] == 2
+    key_b = cache.make_key("get_stock_data", "yfinance", ("B",), {})
+    key_a = cache.make_key("get_stock_data", "yfinance", ("A",), {})
+    assert key_b not in cache._memory
+    assert key_a in cache._memory
+
+    # 被淘汰的条目仍可从 SQLite 读回
+    assert cache.get("get_stock_data", "yfinance", ("B",), {}) == ["b"]
+    stats = cache.stats()
+    assert stats["memory_hits"] == 1
+    assert stats["disk_hits"] == 1
+    print("✓ LRU 淘汰测试通过")
+
+
+def test_sqlite_tier_survives_new_instance():
+    """测试 SQLite 层在新的缓存实例中仍然可用"""
+    cache = _new_cache()
+    cache.put("get_indicators", "yfinance", ("AAPL", "rsi"), {"look_back_days": 30}, [STOCK_CSV], None)
+
+    reopened = ToolResultCache(cache.db_path)
+    value = reopened.get("get_indicators", "yfinance", ("AAPL", "rsi"), {"look_back_days": 30})
+    assert value == [STOCK_CSV]
+    assert reopened.stats()["disk_hits"] == 1
+    # 参数不同则不命中
+    assert reopened.get("get_indicators", "yfinance", ("AAPL", "rsi"), {"look_back_days": 10}) is None
+    print("✓ SQLite 持久化测试通过")
+
+
+def test_expired_entries_are_dropped():
+    """测试过期条目在内存层和 SQLite 层都不再返回"""
+    cache = _new_cache()
+    cache.put("get_news", "google", ("AAPL",), {}, ["news"], 0.05)
+    cache.put("get_news", "google", ("MSFT",), {}, ["news"], None)
+    assert cache.get("get_news", "google", ("AAPL",), {}) == ["news"]
+    time.sleep(0.1)
+    assert cache.get("get_news", "google", ("AAPL",), {}) is None
+
+    reopened = ToolResultCache(cache.db_path)
+    assert reopened.get("get_news", "google", ("AAPL",), {}) is None
+    assert reopened.get("get_news", "google", ("MSFT",), {}) == ["news"]
+
+    # ttl <= 0 不写入
+    cache.put("get_news", "google", ("TSLA",), {}, ["news"], 0)
+    assert cache.get("get_news", "google", ("TSLA",), {}) is None
+    print("✓ 过期测试通过")
+
+
+def test_closed_ttl_applies_to_past_dates_only():
+    """测试 ttl 与 closed_ttl 的选择"""
+    original = get_config().get("tool_cache")
+    set_config({"tool_cache": {
+        "ttl": {"core_stock_apis": 900, "news_data": 3600, "default": 60},
+        "closed_ttl": {"core_stock_apis": None, "news_data": 86400},
+    }})
+    try:
+        past = ("AAPL", "2024-01-02", "2024-01-05")
+        today = date.today().isoformat()
+        open_range = ("AAPL", "2024-01-02", today)
+
+        # 已收盘区间且结果有数据：永不过期
+        assert tool_cache_ttl("core_stock_apis", past, {}, [STOCK_CSV]) is None
+        # 包含今天的区间：使用常规 ttl
+        assert tool_cache_ttl("core_stock_apis", open_range, {}, [STOCK_CSV]) == 900
+        # 日期也可以在关键字参数中
+        assert tool_cache_ttl("core_stock_apis", ("AAPL",), {"end_date": today}, [STOCK_CSV]) == 900
+        # 有限的 closed_ttl 不需要数据校验
+        assert tool_cache_ttl("news_data", past, {}, ["some headlines"]) == 86400
+        # 没有配置的类别使用 default
+        tomorrow = (date.today() + timedelta(days=1)).isoformat()
+        assert tool_cache_ttl("unknown", ("X", tomorrow), {}, ["x"]) == 60
+    finally:
+        set_config({"tool_cache": original})
+    print("✓ ttl / closed_ttl 测试通过")
+
+
+def test_closed_ttl_needs_dated_values():
+    """测试没有数据行的已收盘结果不会永久缓存"""
+    past = ("AAPL", "2024-01-06", "2024-01-07")
+    empty_window = (
+        "## rsi values from 2024-01-06 to 2024-01-07:\n\n"
+        "2024-01-07: N/A: Not a trading day (weekend or holiday)\n"
+        "2024-01-06: N/A: Not a trading day (weekend or holiday)\n"
+    )
+    indicator_window = (
+        "## rsi values from 2024-01-02 to 2024-01-03:\n\n"
+        "2024-01-03: 54.2311\n"
+        "2024-01-02: 52.0087\n"
+    )
+    assert not has_dated_values([empty_window])
+    assert has_dated_values([indicator_window])
+    assert has_dated_values([STOCK_CSV])
+    assert not has_dated_values([STOCK_CSV, empty_window])
+    assert not has_dated_values([])
+
+    ttl = tool_cache_ttl("technical_indicators", past, {}, [empty_window])
+    assert ttl is not None and ttl > 0
+    assert tool_cache_ttl("technical_indicators", past, {}, [indicator_window]) is None
+    print("✓ 数据行校验测试通过")
+
+
+def test_error_strings_are_not_cacheable():
+    """测试以文本形式返回的错误不会被缓存"""
+    failures = [
+        "Error retrieving rsi data: timeout",
+        "error: upstream closed the connection",
+        "No data found for symbol 'AAPL' between 2024-01-01 and 2024-01-05",
+        "No balance sheet data found for symbol 'AAPL'",
+        "Failed after multiple retries",
+        "获取股票 000001 数据时出错: HTTPSConnectionPool timed out",
+        "未找到指数 '000300' 在 2024-01-01 到 2024-01-05 之间的数据",
+        "",
+        "   \n",
+        None,
+    ]
+    for failure in failures:
+        assert not is_cacheable_result([failure]), failure
+        assert not is_cacheable_result([STOCK_CSV, failure]), failure
+
+    assert not is_cacheable_result([])
+    assert is_cacheable_result([STOCK_CSV])
+    assert is_cacheable_result(["## Reddit news: no errors reported this week"])
+    print("✓ 错误文本拒绝测试通过")
+
+
+def test_switching_cache_dir_closes_old_cache():
+    """测试切换 data_cache_dir 时关闭旧缓存的 SQLite 连接"""
+    original = get_config()["data_cache_dir"]
+    try:
+        set_config({"data_cache_dir": tempfile.mkdtemp()})
+        first = get_tool_cache()
+        assert get_tool_cache() is first
+        first.put("get_stock_data", "yfinance", ("A",), {}, ["a"], None)
+
+        set_config({"data_cache_dir": tempfile.mkdtemp()})
+        second = get_tool_cache()
+        assert second is not first
+        assert first._conn is None
+        # 仍持有旧缓存的调用方只使用内存层，不会因连接已关闭而出错
+        assert first.get("get_stock_data", "yfinance", ("A",), {}) == ["a"]
+        assert first.get("get_stock_data", "yfinance", ("B",), {}) is None
+        first.put("get_stock_data", "yfinance", ("B",), {}, ["b"], None)
+        first.clear()
+    finally:
+        set_config({"data_cache_dir": original})
+    print("✓ 切换缓存目录测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("工具结果缓存测试")
+    print("=" * 60 + "\n")
+
+    test_lru_evicts_least_recently_used()
+    test_sqlite_tier_survives_new_instance()
+    test_expired_entries_are_dropped()
+    test_closed_ttl_applies_to_past_dates_only()
+    test_closed_ttl_needs_dated_values()
+    test_error_strings_are_not_cacheable()
+    test_switching_cache_dir_closes_old_cache()
+
+    print("\n所有测试完成\n")
@@ -0,0 +1,120 @@
+"""
+测试内存映射向量索引（.f32 + .jsonl + .meta.json）
+"""
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# 添加项目路径
+sys.path.insert(0, os.path.abspath(os.path.dirname(__file__)))
+
+from tradingagents.agents.utils.vector_index import LocalVectorIndex
+
+
+def _add(index, start, vectors):
+    index.add(
+        documents=[f"situation {start + i}" for i in range(len(vectors))],
+        metadatas=[{"recommendation": f"advice {start + i}"} for i in range(len(vectors))],
+        embeddings=vectors,
+        ids=[str(start + i) for i in range(len(vectors))],
+    )
+
+
+def test_in_memory_query():
+    """测试余弦相似度排序和距离"""
+    index = LocalVectorIndex("bull_memory")
+    _add(index, 0, [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [1.0, 1.0, 0.0]])
+
+    result = index.query(query_embeddings=[[2.0, 0.1, 0.0]], n_results=2)
+    assert result["ids"] == [["0", "2"]]
+    assert result["documents"][0][0] == "situation 0"
+    assert result["metadatas"][0][0] == {"recommendation": "advice 0"}
+    distances = result["distances"][0]
+    assert distances[0] < distances[1]
+    assert abs(distances[0] - (1.0 - 2.0 / np.sqrt(4.01))) < 1e-5
+
+    # 请求数量超过已有条目时返回全部
+    assert len(index.query(query_embeddings=[[0.0, 0.0, 1.0]], n_results=10)["ids"][0]) == 3
+    print("✓ 内存索引查询测试通过")
+
+
+def test_round_trip_on_disk():
+    """测试写入目录后重新打开得到相同的查询结果"""
+    directory = tempfile.mkdtemp()
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(20, 8)).astype(np.float32)
+
+    index = LocalVectorIndex("trader_memory", directory)
+    _add(index, 0, vectors)
+    before = index.query(query_embeddings=vectors[:3], n_results=5)
+
+    reopened = LocalVectorIndex("trader_memory", directory)
+    assert reopened.count() == 20
+    after = reopened.query(query_embeddings=vectors[:3], n_results=5)
+    assert after["ids"] == before["ids"]
+    assert np.allclose(after["distances"], before["distances"], atol=1e-6)
+    # 每个向量与自身的距离为 0
+    assert [ids[0] for ids in after["ids"]] == ["0", "1", "2"]
+    print("✓ 磁盘索引读写测试通过")
+
+
+def test_incremental_append():
+    """测试重新打开后继续追加，文件按行增长"""
+    directory = tempfile.mkdtemp()
+    rng = np.random.default_rng(1)
+
+    index = LocalVectorIndex("risk_memory", directory)
+    _add(index, 0, rng.normal(size=(5, 4)))
+    reopened = LocalVectorIndex("risk_memory", directory)
+    new_vectors = rng.normal(size=(3, 4))
+    _add(reopened, 5, new_vectors)
+
+    assert reopened.count() == 8
+    assert os.path.getsize(os.path.join(directory, "risk_memory.f32")) == 8 * 4 * 4
+    again = LocalVectorIndex("risk_memory", directory)
+    assert again.count() == 8
+    assert again.query(query_embeddings=new_vectors[-1:], n_results=1)["ids"] == [["7"]]
+
+    try:
+        again.add(["bad"], [{}], [[1.0, 2.0]], ["bad"])
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("add() should reject embeddings with the wrong dimensions")
+    print("✓ 增量追加测试通过")
+
+
+def test_recovers_from_partial_append():
+    """测试两个文件长度不一致时以较短的一方为准"""
+    directory = tempfile.mkdtemp()
+    index = LocalVectorIndex("judge_memory", directory)
+    _add(index, 0, np.eye(4))
+
+    # 模拟向量写入了一半时崩溃
+    with open(os.path.join(directory, "judge_memory.f32"), "ab") as f:
+        f.write(b"\x00" * 6)
+    reopened = LocalVectorIndex("judge_memory", directory)
+    assert reopened.count() == 4
+    assert os.path.getsize(os.path.join(directory, "judge_memory.f32")) == 4 * 4 * 4
+
+    # 模拟文档写入后向量文件被截短
+    os.truncate(os.path.join(directory, "judge_memory.f32"), 3 * 4 * 4)
+    reopened = LocalVectorIndex("judge_memory", directory)
+    assert reopened.count() == 3
+    assert LocalVectorIndex("judge_memory", directory).count() == 3
+    print("✓ 崩溃恢复测试通过")
+
+
+if __name__ == "__main__":
+    print("\n" + "=" * 60)
+    print("向量索引测试")
+    print("=" * 60 + "\n")
+
+    test_in_memory_query()
+    test_round_trip_on_disk()
+    test_incremental_append()
+    test_recovers_from_partial_append()
+
+    print("\n所有测试完成\n")
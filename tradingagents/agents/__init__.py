@@ -5,6 +5,7 @@ from .utils.memory import FinancialSituationMemory
 from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
 from .analysts.news_analyst import create_news_analyst
+from .analysts.report_digester import create_report_digester
 from .analysts.social_media_analyst import create_social_media_analyst
 
 from .researchers.bear_researcher import create_bear_researcher
@@ -32,6 +33,7 @@ __all__ = [
     "create_market_analyst",
     "create_neutral_debator",
     "create_news_analyst",
+    "create_report_digester",
     "create_risky_debator",
     "create_risk_manager",
     "create_safe_debator",
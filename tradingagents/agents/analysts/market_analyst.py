@@ -1,14 +1,15 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.runnables import RunnableLambda
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators
+from tradingagents.agents.utils.agent_utils import get_stock_data, get_indicators, get_indicators_batch
 from tradingagents.dataflows.config import get_config
 from tradingagents.utils.language import get_language_instruction
 
 
 def create_market_analyst(llm):
 
-    def market_analyst_node(state):
+    def build_chain(state):
         current_date = state["trade_date"]
         ticker = state["company_of_interest"]
         company_name = state["company_of_interest"]
@@ -16,6 +17,7 @@ def create_market_analyst(llm):
         tools = [
             get_stock_data,
             get_indicators,
+            get_indicators_batch,
         ]
 
         system_message = (
@@ -43,7 +45,7 @@ MACD 相关：
 成交量指标 (Volume-Based Indicators)：
 - vwma: VWMA：按成交量加权的移动平均线。用途：通过整合价格行为与成交量数据确认趋势。提示：注意成交量激增导致的偏差结果；与其他成交量分析结合使用。
 
-- 选择提供多样化和互补信息的指标。避免冗余（例如，不要同时选择 rsi 和 stochrsi）。还要简要解释为什么它们适合给定的市场环境。当你调用工具时，请使用上面提供的指标的确切名称，因为它们是定义的参数，否则你的调用将失败。请确保首先调用 get_stock_data 以检索生成指标所需的 CSV。然后使用 get_indicators 与特定指标名称。撰写一份非常详细且细致的趋势报告。不要简单地说趋势是混合的，而是提供详细且精细的分析和见解，帮助交易员做出决策。"""
+- 选择提供多样化和互补信息的指标。避免冗余（例如，不要同时选择 rsi 和 stochrsi）。还要简要解释为什么它们适合给定的市场环境。当你调用工具时，请使用上面提供的指标的确切名称，因为它们是定义的参数，否则你的调用将失败。请确保首先调用 get_stock_data 以检索生成指标所需的 CSV。然后优先使用 get_indicators_batch，以逗号分隔的形式一次性传入所有选定的指标名称（例如 close_50_sma,macd,rsi），在一次调用中获得所有指标的合并表格；仅在需要单独补充某个指标时才使用 get_indicators。撰写一份非常详细且细致的趋势报告。不要简单地说趋势是混合的，而是提供详细且精细的分析和见解，帮助交易员做出决策。"""
             + """ 确保在报告末尾附上一个 Markdown 表格，以组织报告中的关键点，使其条理清晰、易于阅读。"""
             + get_language_instruction()
         )
@@ -70,18 +72,25 @@ MACD 相关：
         prompt = prompt.partial(current_date=current_date)
         prompt = prompt.partial(ticker=ticker)
 
-        chain = prompt | llm.bind_tools(tools)
-
-        result = chain.invoke(state["messages"])
+        return prompt | llm.bind_tools(tools)
 
+    def build_update(result):
         report = ""
 
         if len(result.tool_calls) == 0:
             report = result.content
-       
+
         return {
             "messages": [result],
             "market_report": report,
         }
 
-    return market_analyst_node
+    def market_analyst_node(state):
+        result = build_chain(state).invoke(state["messages"])
+        return build_update(result)
+
+    async def amarket_analyst_node(state):
+        result = await build_chain(state).ainvoke(state["messages"])
+        return build_update(result)
+
+    return RunnableLambda(market_analyst_node, afunc=amarket_analyst_node)
@@ -0,0 +1,57 @@
+from langchain_core.runnables import RunnableLambda
+from tradingagents.utils.language import get_language_instruction
+
+
+def analyst_reports_context(state, news_label="最新世界事务新闻") -> str:
+    """Analyst input for a debate prompt: the digest if one was made, else the full reports."""
+    digest = state.get("report_digest", "")
+    if digest:
+        return f"分析师报告摘要（由四份完整报告提炼）：\n{digest}"
+
+    return f"""市场研究报告：{state["market_report"]}
+社交媒体情绪报告：{state["sentiment_report"]}
+{news_label}：{state["news_report"]}
+公司基本面报告：{state["fundamentals_report"]}"""
+
+
+def create_report_digester(llm):
+    def build_prompt(state) -> str:
+        company_name = state["company_of_interest"]
+        trade_date = state["trade_date"]
+        market_research_report = state["market_report"]
+        sentiment_report = state["sentiment_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
+
+        prompt = f"""你是研究团队的报告编辑。以下是分析师团队在 {trade_date} 为 {company_name} 撰写的完整报告。后续的多头/空头研究员和风险分析师将只阅读你的摘要而不是完整报告，因此请将它们压缩为一份结构化、信息密集的摘要，不要遗漏任何会影响交易决策的事实。
+
+按以下结构输出，每个部分使用简短的要点：
+
+1. 关键数据：价格、涨跌幅、技术指标读数、估值和财务指标等具体数字，保留原始数值和日期，并注明来源报告（市场/情绪/新闻/基本面）。
+2. 看多信号：支持买入的证据。
+3. 看空信号：支持卖出的证据。
+4. 主要风险与不确定性：事件、催化剂、数据缺口或报告之间相互矛盾之处。
+5. 各报告结论：每份报告的结论各用一句话概括。
+
+不要添加报告中没有的信息，也不要给出你自己的交易建议。
+
+市场研究报告：{market_research_report}
+
+社交媒体情绪报告：{sentiment_report}
+
+最新世界事务新闻：{news_report}
+
+公司基本面报告：{fundamentals_report}
+""" + get_language_instruction()
+
+        return prompt
+
+    def report_digester_node(state) -> dict:
+        response = llm.invoke(build_prompt(state))
+        return {"report_digest": response.content}
+
+    async def areport_digester_node(state) -> dict:
+        response = await llm.ainvoke(build_prompt(state))
+        return {"report_digest": response.content}
+
+    return RunnableLambda(report_digester_node, afunc=areport_digester_node)
@@ -1,20 +1,28 @@
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
+from tradingagents.agents.utils.debate_context import DebateContext
 
 
-def create_research_manager(llm, memory):
-    def research_manager_node(state) -> dict:
-        history = state["investment_debate_state"].get("history", "")
+def create_research_manager(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(history_token_budget=None)
+
+    def build_situation(state) -> str:
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
 
-        investment_debate_state = state["investment_debate_state"]
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def build_prompt(state, past_memories, history) -> str:
+        market_research_report = state["market_report"]
+        sentiment_report = state["sentiment_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        investment_debate_state = state["investment_debate_state"]
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -37,7 +45,11 @@ def create_research_manager(llm, memory):
 以下是辩论内容：
 辩论历史：
 {history}""" + get_language_instruction()
-        response = llm.invoke(prompt)
+
+        return prompt
+
+    def build_update(state, response, context_fields) -> dict:
+        investment_debate_state = state["investment_debate_state"]
 
         new_investment_debate_state = {
             "judge_decision": response.content,
@@ -46,6 +58,7 @@ def create_research_manager(llm, memory):
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
             "count": investment_debate_state["count"],
+            **context_fields,
         }
 
         return {
@@ -53,4 +66,34 @@ def create_research_manager(llm, memory):
             "investment_plan": response.content,
         }
 
-    return research_manager_node
+    def research_manager_node(state) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        past_memories = memory.get_memories(build_situation(state), n_matches=2)
+        history = debate_context.compact(investment_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = llm.invoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                investment_debate_state, history, "Research Manager", prompt, response
+            ),
+        )
+
+    async def aresearch_manager_node(state) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        past_memories = await memory.aget_memories(
+            build_situation(state), n_matches=2
+        )
+        history = await debate_context.acompact(investment_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = await llm.ainvoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                investment_debate_state, history, "Research Manager", prompt, response
+            ),
+        )
+
+    return RunnableLambda(research_manager_node, afunc=aresearch_manager_node)
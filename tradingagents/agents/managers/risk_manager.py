@@ -1,14 +1,25 @@
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
+from tradingagents.agents.utils.debate_context import DebateContext
 
 
-def create_risk_manager(llm, memory):
-    def risk_manager_node(state) -> dict:
+def create_risk_manager(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(history_token_budget=None)
+
+    def build_situation(state) -> str:
+        market_research_report = state["market_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["news_report"]
+        sentiment_report = state["sentiment_report"]
+
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def build_prompt(state, past_memories, history) -> str:
 
         company_name = state["company_of_interest"]
 
-        history = state["risk_debate_state"]["history"]
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
@@ -16,9 +27,6 @@ def create_risk_manager(llm, memory):
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
@@ -44,7 +52,10 @@ def create_risk_manager(llm, memory):
 
 专注于可操作的见解和持续改进。在过去的经验基础上，批判性地评估所有观点，并确保每个决策都能推进更好的结果。""" + get_language_instruction()
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def build_update(state, response, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
 
         new_risk_debate_state = {
             "judge_decision": response.content,
@@ -57,6 +68,7 @@ def create_risk_manager(llm, memory):
             "current_safe_response": risk_debate_state["current_safe_response"],
             "current_neutral_response": risk_debate_state["current_neutral_response"],
             "count": risk_debate_state["count"],
+            **context_fields,
         }
 
         return {
@@ -64,4 +76,34 @@ def create_risk_manager(llm, memory):
             "final_trade_decision": response.content,
         }
 
-    return risk_manager_node
+    def risk_manager_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        past_memories = memory.get_memories(build_situation(state), n_matches=2)
+        history = debate_context.compact(risk_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = llm.invoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Risk Judge", prompt, response
+            ),
+        )
+
+    async def arisk_manager_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        past_memories = await memory.aget_memories(
+            build_situation(state), n_matches=2
+        )
+        history = await debate_context.acompact(risk_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = await llm.ainvoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Risk Judge", prompt, response
+            ),
+        )
+
+    return RunnableLambda(risk_manager_node, afunc=arisk_manager_node)
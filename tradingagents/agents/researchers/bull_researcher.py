@@ -1,23 +1,29 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
+from tradingagents.agents.analysts.report_digester import analyst_reports_context
+from tradingagents.agents.utils.debate_context import DebateContext
 
 
-def create_bull_researcher(llm, memory):
-    def bull_node(state) -> dict:
-        investment_debate_state = state["investment_debate_state"]
-        history = investment_debate_state.get("history", "")
-        bull_history = investment_debate_state.get("bull_history", "")
+def create_bull_researcher(llm, memory, debate_context=None):
+    debate_context = debate_context or DebateContext(history_token_budget=None)
 
-        current_response = investment_debate_state.get("current_response", "")
+    def build_situation(state) -> str:
         market_research_report = state["market_report"]
         sentiment_report = state["sentiment_report"]
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def build_prompt(state, past_memories, history) -> str:
+        investment_debate_state = state["investment_debate_state"]
+        bull_history = investment_debate_state.get("bull_history", "")
+
+        current_response = investment_debate_state.get("current_response", "")
+        analyst_reports = analyst_reports_context(state)
 
         past_memory_str = ""
         for i, rec in enumerate(past_memories, 1):
@@ -33,17 +39,19 @@ def create_bull_researcher(llm, memory):
 - 参与度：以对话方式呈现你的论点，直接与空头分析师的观点互动并有效辩论，而不仅仅是列出数据。
 
 可用资源：
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务新闻：{news_report}
-公司基本面报告：{fundamentals_report}
+{analyst_reports}
 辩论的对话历史：{history}
 上一个空头论点：{current_response}
 类似情况的反思和经验教训：{past_memory_str}
 使用这些信息提供一个有说服力的多头论点，驳斥空头的关注点，并参与动态辩论，展示多头立场的优势。你还必须解决反思并从过去的经验教训和错误中学习。
 """ + get_language_instruction()
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def build_update(state, response, context_fields) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        history = investment_debate_state.get("history", "")
+        bull_history = investment_debate_state.get("bull_history", "")
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -53,8 +61,39 @@ def create_bull_researcher(llm, memory):
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
 
-    return bull_node
+    def bull_node(state) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        past_memories = memory.get_memories(build_situation(state), n_matches=2)
+        history = debate_context.compact(investment_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = llm.invoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                investment_debate_state, history, "Bull Researcher", prompt, response
+            ),
+        )
+
+    async def abull_node(state) -> dict:
+        investment_debate_state = state["investment_debate_state"]
+        past_memories = await memory.aget_memories(
+            build_situation(state), n_matches=2
+        )
+        history = await debate_context.acompact(investment_debate_state)
+        prompt = build_prompt(state, past_memories, history.text)
+        response = await llm.ainvoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                investment_debate_state, history, "Bull Researcher", prompt, response
+            ),
+        )
+
+    return RunnableLambda(bull_node, afunc=abull_node)
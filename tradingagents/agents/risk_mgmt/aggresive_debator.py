@@ -1,21 +1,22 @@
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
+from tradingagents.agents.analysts.report_digester import analyst_reports_context
+from tradingagents.agents.utils.debate_context import DebateContext
 
 
-def create_risky_debator(llm):
-    def risky_node(state) -> dict:
+def create_risky_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(history_token_budget=None)
+
+    def build_prompt(state, history) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         risky_history = risk_debate_state.get("risky_history", "")
 
         current_safe_response = risk_debate_state.get("current_safe_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        analyst_reports = analyst_reports_context(state, news_label="最新世界事务报告")
 
         trader_decision = state["trader_investment_plan"]
 
@@ -25,15 +26,17 @@ def create_risky_debator(llm):
 
 你的任务是为交易员的决定创建一个有说服力的论证，通过质疑和批评保守型和中立型立场，以展示为什么你的高回报视角提供了最佳前进道路。将以下来源的见解纳入你的论点：
 
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务报告：{news_report}
-公司基本面报告：{fundamentals_report}
+{analyst_reports}
 以下是当前对话历史：{history} 以下是保守型分析师的最后论点：{current_safe_response} 以下是中立型分析师的最后论点：{current_neutral_response}。如果其他观点没有回应，不要臆造，只需陈述你的观点。
 
 积极参与，解决提出的任何具体关注点，驳斥他们逻辑中的弱点，并主张冒险的好处以超越市场规范。专注于辩论和说服，而不仅仅是呈现数据。挑战每个反驳点，以强调为什么高风险方法是最优的。以对话方式输出，就像你在说话一样，不需要任何特殊格式。""" + get_language_instruction()
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def build_update(state, response, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        risky_history = risk_debate_state.get("risky_history", "")
 
         argument = f"Risky Analyst: {response.content}"
 
@@ -49,8 +52,35 @@ def create_risky_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return risky_node
+    def risky_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = debate_context.compact(risk_debate_state)
+        prompt = build_prompt(state, history.text)
+        response = llm.invoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Risky Analyst", prompt, response
+            ),
+        )
+
+    async def arisky_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = await debate_context.acompact(risk_debate_state)
+        prompt = build_prompt(state, history.text)
+        response = await llm.ainvoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Risky Analyst", prompt, response
+            ),
+        )
+
+    return RunnableLambda(risky_node, afunc=arisky_node)
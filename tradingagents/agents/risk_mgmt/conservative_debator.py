@@ -1,22 +1,23 @@
 from langchain_core.messages import AIMessage
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
+from tradingagents.agents.analysts.report_digester import analyst_reports_context
+from tradingagents.agents.utils.debate_context import DebateContext
 
 
-def create_safe_debator(llm):
-    def safe_node(state) -> dict:
+def create_safe_debator(llm, debate_context=None):
+    debate_context = debate_context or DebateContext(history_token_budget=None)
+
+    def build_prompt(state, history) -> str:
         risk_debate_state = state["risk_debate_state"]
-        history = risk_debate_state.get("history", "")
         safe_history = risk_debate_state.get("safe_history", "")
 
         current_risky_response = risk_debate_state.get("current_risky_response", "")
         current_neutral_response = risk_debate_state.get("current_neutral_response", "")
 
-        market_research_report = state["market_report"]
-        sentiment_report = state["sentiment_report"]
-        news_report = state["news_report"]
-        fundamentals_report = state["fundamentals_report"]
+        analyst_reports = analyst_reports_context(state, news_label="最新世界事务报告")
 
         trader_decision = state["trader_investment_plan"]
 
@@ -26,15 +27,17 @@ def create_safe_debator(llm):
 
 你的任务是积极反驳激进型和中立型分析师的论点，突出他们的观点可能忽视潜在威胁或未能优先考虑可持续性的地方。直接回应他们的观点，利用以下数据源为交易员决定的低风险方法调整建立有说服力的论证：
 
-市场研究报告：{market_research_report}
-社交媒体情绪报告：{sentiment_report}
-最新世界事务报告：{news_report}
-公司基本面报告：{fundamentals_report}
+{analyst_reports}
 以下是当前对话历史：{history} 以下是激进型分析师的最后回应：{current_risky_response} 以下是中立型分析师的最后回应：{current_neutral_response}。如果其他观点没有回应，不要臆造，只需陈述你的观点。
 
 通过质疑他们的乐观情绪并强调他们可能忽视的潜在不利因素来参与。解决他们的每个反驳点，以展示为什么保守立场最终是公司资产最安全的道路。专注于辩论和批评他们的论点，以展示低风险策略相对于他们的方法的优势。以对话方式输出，就像你在说话一样，不需要任何特殊格式。""" + get_language_instruction()
 
-        response = llm.invoke(prompt)
+        return prompt
+
+    def build_update(state, response, context_fields) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = risk_debate_state.get("history", "")
+        safe_history = risk_debate_state.get("safe_history", "")
 
         argument = f"Safe Analyst: {response.content}"
 
@@ -52,8 +55,35 @@ def create_safe_debator(llm):
                 "current_neutral_response", ""
             ),
             "count": risk_debate_state["count"] + 1,
+            **context_fields,
         }
 
         return {"risk_debate_state": new_risk_debate_state}
 
-    return safe_node
+    def safe_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = debate_context.compact(risk_debate_state)
+        prompt = build_prompt(state, history.text)
+        response = llm.invoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Safe Analyst", prompt, response
+            ),
+        )
+
+    async def asafe_node(state) -> dict:
+        risk_debate_state = state["risk_debate_state"]
+        history = await debate_context.acompact(risk_debate_state)
+        prompt = build_prompt(state, history.text)
+        response = await llm.ainvoke(prompt)
+        return build_update(
+            state,
+            response,
+            debate_context.state_fields(
+                risk_debate_state, history, "Safe Analyst", prompt, response
+            ),
+        )
+
+    return RunnableLambda(safe_node, afunc=asafe_node)
@@ -1,11 +1,20 @@
 import functools
+from langchain_core.runnables import RunnableLambda
 import time
 import json
 from tradingagents.utils.language import get_language_instruction
 
 
 def create_trader(llm, memory):
-    def trader_node(state, name):
+    def build_situation(state) -> str:
+        market_research_report = state["market_report"]
+        sentiment_report = state["sentiment_report"]
+        news_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
+
+        return f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
+
+    def build_messages(state, past_memories) -> list:
         company_name = state["company_of_interest"]
         investment_plan = state["investment_plan"]
         market_research_report = state["market_report"]
@@ -13,9 +22,6 @@ def create_trader(llm, memory):
         news_report = state["news_report"]
         fundamentals_report = state["fundamentals_report"]
 
-        curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
-        past_memories = memory.get_memories(curr_situation, n_matches=2)
-
         past_memory_str = ""
         if past_memories:
             for i, rec in enumerate(past_memories, 1):
@@ -36,12 +42,28 @@ def create_trader(llm, memory):
             context,
         ]
 
-        result = llm.invoke(messages)
+        return messages
 
+    def build_update(result, name) -> dict:
         return {
             "messages": [result],
             "trader_investment_plan": result.content,
             "sender": name,
         }
 
-    return functools.partial(trader_node, name="Trader")
+    def trader_node(state, name):
+        past_memories = memory.get_memories(build_situation(state), n_matches=2)
+        result = llm.invoke(build_messages(state, past_memories))
+        return build_update(result, name)
+
+    async def atrader_node(state, name):
+        past_memories = await memory.aget_memories(
+            build_situation(state), n_matches=2
+        )
+        result = await llm.ainvoke(build_messages(state, past_memories))
+        return build_update(result, name)
+
+    return RunnableLambda(
+        functools.partial(trader_node, name="Trader"),
+        afunc=functools.partial(atrader_node, name="Trader"),
+    )
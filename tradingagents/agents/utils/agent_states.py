@@ -19,6 +19,9 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    summary: Annotated[str, "Rolling summary of the turns before summarized_upto"]
+    summarized_upto: Annotated[int, "Characters of history covered by the summary"]
+    token_usage: Annotated[list, "Prompt/response token counts of each debate node call"]
 
 
 # Risk management team state
@@ -45,6 +48,9 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    summary: Annotated[str, "Rolling summary of the turns before summarized_upto"]
+    summarized_upto: Annotated[int, "Characters of history covered by the summary"]
+    token_usage: Annotated[list, "Prompt/response token counts of each debate node call"]
 
 
 class AgentState(MessagesState):
@@ -60,6 +66,9 @@ class AgentState(MessagesState):
         str, "Report from the News Researcher of current world affairs"
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
+    report_digest: Annotated[
+        str, "Compact digest of the analyst reports read by the debate agents"
+    ]
 
     # researcher team discussion step
     investment_debate_state: Annotated[
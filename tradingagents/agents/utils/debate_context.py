@@ -0,0 +1,197 @@
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _ENCODING = None
+
+
+# Every debate turn is appended to the history as "\n<Speaker> Analyst: <response>"
+_TURN_START = re.compile(r"\n(?=(?:Bull|Bear|Risky|Safe|Neutral) Analyst: )")
+_CJK_CHAR = re.compile(r"[\u3000-\u9fff\uac00-\ud7af\uff00-\uffef]")
+
+
+def count_tokens(text: str) -> int:
+    """Token count of a prompt fragment (cl100k_base, or an estimate without tiktoken)."""
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    # Roughly one token per CJK character and per four other characters
+    cjk = len(_CJK_CHAR.findall(text))
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def split_turns(history: str) -> List[int]:
+    """Start offsets of the debate turns in a history string."""
+    return [match.start() for match in _TURN_START.finditer(history)]
+
+
+@dataclass
+class DebateHistory:
+    """The history a debate node puts in its prompt, and the compaction behind it."""
+
+    text: str
+    summary: str
+    summarized_upto: int
+    tokens: int
+    compacted: bool = False
+
+
+class DebateContext:
+    """Keeps the debate history a prompt embeds within a token budget.
+
+    The full ``history`` string in the debate state is never rewritten. When
+    the part of it a prompt would embed goes over ``history_token_budget``,
+    every turn except the last ``keep_last_turns`` is folded into a rolling
+    summary, stored in the debate state as ``summary`` together with
+    ``summarized_upto`` (how many characters of ``history`` it covers), so
+    later nodes only summarize the turns added since. Each node also appends
+    its prompt/response token counts to the state's ``token_usage``.
+    """
+
+    def __init__(
+        self,
+        llm=None,
+        history_token_budget: Optional[int] = 8000,
+        keep_last_turns: int = 2,
+        summary_token_target: int = 800,
+    ):
+        """
+        Args:
+            llm: Chat model that writes the rolling summary; without one the
+                older turns are cut down to their opening lines instead
+            history_token_budget: Token budget of the embedded history (None: unlimited)
+            keep_last_turns: Most recent turns that are always kept verbatim
+            summary_token_target: Length the summary is asked to stay under
+        """
+        self.llm = llm
+        self.history_token_budget = history_token_budget
+        self.keep_last_turns = max(0, keep_last_turns)
+        self.summary_token_target = summary_token_target
+
+    @staticmethod
+    def _render(summary: str, recent: str) -> str:
+        if not summary:
+            return recent
+        return f"[此前辩论摘要]\n{summary}\n\n[最近的发言]{recent}"
+
+    def _current(self, debate_state: Dict[str, Any]) -> DebateHistory:
+        history = debate_state.get("history", "")
+        summary = debate_state.get("summary", "")
+        summarized_upto = debate_state.get("summarized_upto", 0)
+        text = self._render(summary, history[summarized_upto:])
+        return DebateHistory(text, summary, summarized_upto, count_tokens(text))
+
+    def _split_point(self, debate_state: Dict[str, Any], current: DebateHistory) -> Optional[int]:
+        """History offset to summarize up to, or None if no compaction is needed."""
+        if self.history_token_budget is None or current.tokens <= self.history_token_budget:
+            return None
+        history = debate_state.get("history", "")
+        starts = [
+            start for start in split_turns(history) if start >= current.summarized_upto
+        ]
+        if len(starts) <= self.keep_last_turns:
+            return None
+        if self.keep_last_turns == 0:
+            return len(history)
+        return starts[-self.keep_last_turns]
+
+    def _summary_prompt(self, summary: str, turns: str) -> str:
+        return f"""请将以下辩论内容压缩为一份滚动摘要，供后续发言者参考。保留每一方的核心论点、引用的关键数据和证据、已被反驳的观点以及尚未解决的分歧，去掉客套和重复内容。摘要不超过 {self.summary_token_target} 个词元，只输出摘要本身。
+
+已有摘要：
+{summary or "（无）"}
+
+需要并入摘要的新发言：
+{turns}"""
+
+    def _truncated_summary(self, summary: str, turns: str) -> str:
+        """Summary without an LLM: the opening of each turn, within the target length."""
+        lines = [summary] if summary else []
+        for turn in _TURN_START.split(turns):
+            turn = turn.strip()
+            if turn:
+                lines.append(turn.splitlines()[0][:300])
+        text = "\n".join(lines)
+        while count_tokens(text) > self.summary_token_target and len(lines) > 1:
+            lines.pop(0)
+            text = "\n".join(lines)
+        return text
+
+    def _compacted(self, debate_state, split, summary) -> DebateHistory:
+        history = debate_state.get("history", "")
+        text = self._render(summary, history[split:])
+        return DebateHistory(text, summary, split, count_tokens(text), compacted=True)
+
+    def compact(self, debate_state: Dict[str, Any]) -> DebateHistory:
+        """History to embed in the next prompt, compacting it if over budget."""
+        current = self._current(debate_state)
+        split = self._split_point(debate_state, current)
+        if split is None:
+            return current
+
+        turns = debate_state.get("history", "")[current.summarized_upto:split]
+        if self.llm is None:
+            summary = self._truncated_summary(current.summary, turns)
+        else:
+            summary = self.llm.invoke(self._summary_prompt(current.summary, turns)).content
+        return self._compacted(debate_state, split, summary)
+
+    async def acompact(self, debate_state: Dict[str, Any]) -> DebateHistory:
+        """Async variant of compact."""
+        current = self._current(debate_state)
+        split = self._split_point(debate_state, current)
+        if split is None:
+            return current
+
+        turns = debate_state.get("history", "")[current.summarized_upto:split]
+        if self.llm is None:
+            summary = self._truncated_summary(current.summary, turns)
+        else:
+            response = await self.llm.ainvoke(self._summary_prompt(current.summary, turns))
+            summary = response.content
+        return self._compacted(debate_state, split, summary)
+
+    def state_fields(
+        self,
+        debate_state: Dict[str, Any],
+        history: DebateHistory,
+        node: str,
+        prompt: str,
+        response,
+    ) -> Dict[str, Any]:
+        """Compaction and token-usage fields to carry into the node's debate state update."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        entry = {
+            "node": node,
+            "turn": debate_state.get("count", 0),
+            "prompt_tokens": usage.get("input_tokens") or count_tokens(prompt),
+            "history_tokens": history.tokens,
+            "response_tokens": usage.get("output_tokens") or count_tokens(response.content),
+            "compacted": history.compacted,
+        }
+        return {
+            "summary": history.summary,
+            "summarized_upto": history.summarized_upto,
+            "token_usage": list(debate_state.get("token_usage", [])) + [entry],
+        }
+
+
+def token_usage_by_node(token_usage: List[Dict[str, Any]]) -> Dict[str, Dict[str, int]]:
+    """Total calls and prompt/response tokens per node from a debate state's token_usage."""
+    totals: Dict[str, Dict[str, int]] = {}
+    for entry in token_usage:
+        node = totals.setdefault(
+            entry["node"],
+            {"calls": 0, "prompt_tokens": 0, "response_tokens": 0, "max_prompt_tokens": 0},
+        )
+        node["calls"] += 1
+        node["prompt_tokens"] += entry["prompt_tokens"]
+        node["response_tokens"] += entry["response_tokens"]
+        node["max_prompt_tokens"] = max(node["max_prompt_tokens"], entry["prompt_tokens"])
+    return totals
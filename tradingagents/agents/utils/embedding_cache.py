@@ -0,0 +1,80 @@
+import hashlib
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+
+class EmbeddingCache:
+    """Embeddings keyed by a hash of (model, dimensions, text), kept in memory and in SQLite.
+
+    The cache is shared by every memory that uses the same directory, so a
+    situation string that several agents look up is only embedded once.
+    """
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._vectors = {}
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model, dimensions, text):
+        return hashlib.sha256(f"{model}\x00{dimensions}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys):
+        """Return {key: vector} for the keys that are cached"""
+        found = {}
+        with self._lock:
+            missing = []
+            for key in keys:
+                if key in self._vectors:
+                    found[key] = self._vectors[key]
+                else:
+                    missing.append(key)
+
+            for key in missing:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    vector = np.frombuffer(row[0], dtype=np.float32).tolist()
+                    self._vectors[key] = vector
+                    found[key] = vector
+        return found
+
+    def put_many(self, vectors):
+        """Store {key: vector}"""
+        if not vectors:
+            return
+        with self._lock:
+            self._vectors.update(vectors)
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                [
+                    (key, np.asarray(vector, dtype=np.float32).tobytes())
+                    for key, vector in vectors.items()
+                ],
+            )
+            self._conn.commit()
+
+
+_caches = {}
+_caches_guard = threading.Lock()
+
+
+def get_embedding_cache(directory):
+    """Return the process-wide embedding cache stored under a directory"""
+    db_path = os.path.abspath(os.path.join(directory, "embedding_cache.sqlite3"))
+    with _caches_guard:
+        if db_path not in _caches:
+            _caches[db_path] = EmbeddingCache(db_path)
+        return _caches[db_path]
@@ -0,0 +1,134 @@
+import asyncio
+import hashlib
+import math
+import os
+import re
+from abc import ABC, abstractmethod
+from collections import Counter
+
+import numpy as np
+
+
+class EmbeddingProvider(ABC):
+    """Turns texts into vectors for FinancialSituationMemory.
+
+    Subclasses set ``model`` and ``dimensions`` (part of the embedding cache
+    key), ``batch_size`` (inputs per request) and ``cacheable`` (whether the
+    vectors are worth keeping in the embedding cache). ``namespace`` is
+    appended to collection names so stores built with different providers
+    never mix; the default provider keeps the original names.
+    """
+
+    model = None
+    dimensions = None
+    batch_size = 10
+    cacheable = True
+    namespace = ""
+
+    @abstractmethod
+    def embed(self, texts):
+        """Return one vector per text, in input order."""
+
+    async def aembed(self, texts):
+        return await asyncio.to_thread(self.embed, texts)
+
+
+class OpenAIEmbeddingProvider(EmbeddingProvider):
+    """OpenAI-compatible embeddings endpoint (DashScope by default)."""
+
+    # DashScope accepts at most 10 inputs per embeddings request
+    batch_size = 10
+    dimensions = 2048
+
+    def __init__(self, config):
+        from openai import AsyncOpenAI, OpenAI
+
+        if config["backend_url"] == "http://localhost:11434/v1":
+            self.model = "nomic-embed-text"
+        else:
+            self.model = "text-embedding-v4"
+        self.client = OpenAI(base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
+                             , api_key=os.getenv("QWEN_API_KEY"))
+        self.async_client = AsyncOpenAI(base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
+                                        , api_key=os.getenv("QWEN_API_KEY"))
+
+    @staticmethod
+    def _response_vectors(response):
+        return [item.embedding for item in sorted(response.data, key=lambda item: item.index)]
+
+    def embed(self, texts):
+        response = self.client.embeddings.create(
+            model=self.model, input=list(texts),
+            dimensions=self.dimensions, encoding_format="float"
+        )
+        return self._response_vectors(response)
+
+    async def aembed(self, texts):
+        response = await self.async_client.embeddings.create(
+            model=self.model, input=list(texts),
+            dimensions=self.dimensions, encoding_format="float"
+        )
+        return self._response_vectors(response)
+
+
+class HashedNgramEmbeddingProvider(EmbeddingProvider):
+    """Deterministic CPU embeddings from hashed word and character n-grams.
+
+    Word unigrams/bigrams and character 3-5 grams are hashed into a fixed
+    number of signed buckets with sublinear (1 + log tf) weighting, then
+    L2-normalised and stored as float16. No network, no model files, and the
+    same text always yields the same vector.
+    """
+
+    batch_size = 256
+    cacheable = False
+
+    _token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def __init__(self, dimensions=256):
+        self.dimensions = dimensions
+        self.model = f"hashed-ngram-{dimensions}"
+        self.namespace = self.model
+
+    def _features(self, text):
+        text = text.lower()
+        words = self._token_pattern.findall(text)
+        features = Counter(words)
+        features.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+
+        padded = f" {' '.join(words)} "
+        for n in (3, 4, 5):
+            features.update(
+                f"#{padded[i:i + n]}" for i in range(len(padded) - n + 1)
+            )
+        return features
+
+    def _embed_one(self, text):
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        for feature, count in self._features(text).items():
+            digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+            value = int.from_bytes(digest, "little")
+            sign = 1.0 if value & 1 else -1.0
+            vector[(value >> 1) % self.dimensions] += sign * (1.0 + math.log(count))
+
+        norm = np.linalg.norm(vector)
+        if norm > 0:
+            vector /= norm
+        return vector.astype(np.float16)
+
+    def embed(self, texts):
+        return [self._embed_one(text) for text in texts]
+
+    async def aembed(self, texts):
+        # Pure CPU and fast; running it inline beats a thread hop
+        return self.embed(texts)
+
+
+def create_embedding_provider(config):
+    """Build the embedding provider selected by config["embedding_provider"]"""
+    provider = config.get("embedding_provider", "openai")
+    if provider == "openai":
+        return OpenAIEmbeddingProvider(config)
+    if provider == "local":
+        return HashedNgramEmbeddingProvider(config.get("embedding_dimensions") or 256)
+    raise ValueError(f"Unsupported embedding provider: {provider}")
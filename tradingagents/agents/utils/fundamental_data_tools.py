@@ -1,6 +1,6 @@
 from langchain_core.tools import tool
 from typing import Annotated
-from tradingagents.dataflows.interface import route_to_vendor
+from tradingagents.dataflows.interface import route_to_vendor, aroute_to_vendor
 
 
 @tool
@@ -20,6 +20,16 @@ def get_fundamentals(
     return route_to_vendor("get_fundamentals", ticker, curr_date)
 
 
+async def _aget_fundamentals(
+    ticker: str,
+    curr_date: str,
+) -> str:
+    return await aroute_to_vendor("get_fundamentals", ticker, curr_date)
+
+
+get_fundamentals.coroutine = _aget_fundamentals
+
+
 @tool
 def get_balance_sheet(
     ticker: Annotated[str, "ticker symbol"],
@@ -39,6 +49,17 @@ def get_balance_sheet(
     return route_to_vendor("get_balance_sheet", ticker, freq, curr_date)
 
 
+async def _aget_balance_sheet(
+    ticker: str,
+    freq: str = "quarterly",
+    curr_date: str = None,
+) -> str:
+    return await aroute_to_vendor("get_balance_sheet", ticker, freq, curr_date)
+
+
+get_balance_sheet.coroutine = _aget_balance_sheet
+
+
 @tool
 def get_cashflow(
     ticker: Annotated[str, "ticker symbol"],
@@ -58,6 +79,17 @@ def get_cashflow(
     return route_to_vendor("get_cashflow", ticker, freq, curr_date)
 
 
+async def _aget_cashflow(
+    ticker: str,
+    freq: str = "quarterly",
+    curr_date: str = None,
+) -> str:
+    return await aroute_to_vendor("get_cashflow", ticker, freq, curr_date)
+
+
+get_cashflow.coroutine = _aget_cashflow
+
+
 @tool
 def get_income_statement(
     ticker: Annotated[str, "ticker symbol"],
@@ -74,4 +106,15 @@ def get_income_statement(
     Returns:
         str: A formatted report containing income statement data
     """
-    return route_to_vendor("get_income_statement", ticker, freq, curr_date)
\ No newline at end of file
+    return route_to_vendor("get_income_statement", ticker, freq, curr_date)
+
+
+async def _aget_income_statement(
+    ticker: str,
+    freq: str = "quarterly",
+    curr_date: str = None,
+) -> str:
+    return await aroute_to_vendor("get_income_statement", ticker, freq, curr_date)
+
+
+get_income_statement.coroutine = _aget_income_statement
@@ -1,29 +1,132 @@
+import asyncio
 import os
+import threading
+from collections import OrderedDict
 
-import chromadb
-from chromadb.config import Settings
-from openai import OpenAI
+import numpy as np
+
+from tradingagents.agents.utils.embedding_cache import EmbeddingCache, get_embedding_cache
+from tradingagents.agents.utils.embeddings import create_embedding_provider
+from tradingagents.agents.utils.vector_index import LocalVectorIndex
+
+
+# Distinct (situation, n_matches) lookups remembered per memory
+RECALL_MEMO_SIZE = 64
 
 
 class FinancialSituationMemory:
     def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
+        self.embedder = create_embedding_provider(config)
+        if self.embedder.namespace:
+            name = f"{name}_{self.embedder.namespace}"
+
+        memory_dir = config.get("memory_dir")
+        # Reflections survive the process; the embedding cache lives alongside them
+        self.embedding_cache = (
+            get_embedding_cache(memory_dir or config["data_cache_dir"])
+            if self.embedder.cacheable
+            else None
+        )
+
+        backend = config.get("memory_backend", "chroma")
+        if backend == "local":
+            self.situation_collection = LocalVectorIndex(
+                name, os.path.join(memory_dir, "vector_index") if memory_dir else None
+            )
+        elif backend == "chroma":
+            self.situation_collection = self._open_chroma_collection(name, memory_dir)
+        else:
+            raise ValueError(f"Unsupported memory backend: {backend}")
+
+        # The situation only changes between propagations, so every debate round
+        # and every node asking about the same state shares one lookup
+        self._recall_memo = OrderedDict()
+        self._recall_lock = threading.Lock()
+
+    @staticmethod
+    def _open_chroma_collection(name, memory_dir):
+        # Imported here so the local backend never pays for loading Chroma
+        import chromadb
+        from chromadb.config import Settings
+
+        if memory_dir:
+            chroma_client = chromadb.PersistentClient(
+                path=memory_dir, settings=Settings(allow_reset=True)
+            )
         else:
-            self.embedding = "text-embedding-v4"
-        self.client = OpenAI(base_url="https://dashscope.aliyuncs.com/compatible-mode/v1"
-                             , api_key=os.getenv("QWEN_API_KEY"))
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+            chroma_client = chromadb.Client(Settings(allow_reset=True))
+        return chroma_client.get_or_create_collection(name=name)
+
+    @staticmethod
+    def _as_float32(vectors):
+        # Providers may return compact float16 vectors; both stores take float32
+        return list(np.asarray(vectors, dtype=np.float32))
+
+    def _cache_keys(self, texts):
+        return [
+            EmbeddingCache.make_key(self.embedder.model, self.embedder.dimensions, text)
+            for text in texts
+        ]
+
+    def _pending_batches(self, texts, keys, cached):
+        """Unique uncached (key, text) pairs, split into request-sized batches"""
+        pending = {}
+        for key, text in zip(keys, texts):
+            if key not in cached:
+                pending.setdefault(key, text)
+        pending = list(pending.items())
+        batch_size = self.embedder.batch_size
+        return [
+            pending[i:i + batch_size]
+            for i in range(0, len(pending), batch_size)
+        ]
+
+    def _cached_vectors(self, keys):
+        return self.embedding_cache.get_many(keys) if self.embedding_cache else {}
+
+    def _store_vectors(self, vectors):
+        if self.embedding_cache:
+            self.embedding_cache.put_many(vectors)
 
     def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
+        """Get the embedding for a text from the configured provider"""
+        return self.get_embeddings([text])[0]
+
+    def get_embeddings(self, texts):
+        """Get embeddings for several texts, reusing cached ones and batching the rest"""
+        keys = self._cache_keys(texts)
+        vectors = self._cached_vectors(keys)
+
+        fresh = {}
+        for batch in self._pending_batches(texts, keys, vectors):
+            embedded = self.embedder.embed([text for _, text in batch])
+            fresh.update(zip((key for key, _ in batch), embedded))
+
+        self._store_vectors(fresh)
+        vectors.update(fresh)
+        return [vectors[key] for key in keys]
 
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text,
-            dimensions=2048, encoding_format="float"
+    async def aget_embedding(self, text):
+        """Get the embedding for a text without blocking the event loop"""
+        return (await self.aget_embeddings([text]))[0]
+
+    async def aget_embeddings(self, texts):
+        """Async variant of get_embeddings; the batches are requested concurrently"""
+        keys = self._cache_keys(texts)
+        vectors = self._cached_vectors(keys)
+
+        batches = self._pending_batches(texts, keys, vectors)
+        embedded = await asyncio.gather(
+            *(self.embedder.aembed([text for _, text in batch]) for batch in batches)
         )
-        return response.data[0].embedding
+
+        fresh = {}
+        for batch, batch_vectors in zip(batches, embedded):
+            fresh.update(zip((key for key, _ in batch), batch_vectors))
+
+        self._store_vectors(fresh)
+        vectors.update(fresh)
+        return [vectors[key] for key in keys]
 
     def add_situations(self, situations_and_advice):
         """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
@@ -31,7 +134,6 @@ class FinancialSituationMemory:
         situations = []
         advice = []
         ids = []
-        embeddings = []
 
         offset = self.situation_collection.count()
 
@@ -39,21 +141,65 @@ class FinancialSituationMemory:
             situations.append(situation)
             advice.append(recommendation)
             ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+
+        if not situations:
+            return
 
         self.situation_collection.add(
             documents=situations,
             metadatas=[{"recommendation": rec} for rec in advice],
-            embeddings=embeddings,
+            embeddings=self._as_float32(self.get_embeddings(situations)),
             ids=ids,
         )
 
+        # New reflections can change the neighbours of any situation
+        with self._recall_lock:
+            self._recall_memo.clear()
+
     def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
+        """Find matching recommendations using the configured embeddings"""
+        memo_key = self._memo_key(current_situation, n_matches)
+        memoized = self._recall(memo_key)
+        if memoized is not None:
+            return memoized
+
         query_embedding = self.get_embedding(current_situation)
+        return self._memoize(memo_key, self._query_memories(query_embedding, n_matches))
+
+    async def aget_memories(self, current_situation, n_matches=1):
+        """Async variant of get_memories; only the embedding call does network I/O"""
+        memo_key = self._memo_key(current_situation, n_matches)
+        memoized = self._recall(memo_key)
+        if memoized is not None:
+            return memoized
+
+        query_embedding = await self.aget_embedding(current_situation)
+        return self._memoize(memo_key, self._query_memories(query_embedding, n_matches))
+
+    def _memo_key(self, current_situation, n_matches):
+        return self._cache_keys([current_situation])[0], n_matches
+
+    def _recall(self, memo_key):
+        """Return a copy of a memoized lookup, or None"""
+        with self._recall_lock:
+            matches = self._recall_memo.get(memo_key)
+            if matches is None:
+                return None
+            self._recall_memo.move_to_end(memo_key)
+            return [dict(match) for match in matches]
+
+    def _memoize(self, memo_key, matches):
+        with self._recall_lock:
+            self._recall_memo[memo_key] = [dict(match) for match in matches]
+            self._recall_memo.move_to_end(memo_key)
+            while len(self._recall_memo) > RECALL_MEMO_SIZE:
+                self._recall_memo.popitem(last=False)
+        return matches
 
+    def _query_memories(self, query_embedding, n_matches):
+        """Look up the closest stored situations for an embedding"""
         results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
+            query_embeddings=self._as_float32([query_embedding]),
             n_results=n_matches,
             include=["metadatas", "documents", "distances"],
         )
@@ -0,0 +1,127 @@
+import json
+import os
+import threading
+
+import numpy as np
+
+
+class LocalVectorIndex:
+    """Exact cosine top-k over a contiguous float32 matrix, without Chroma.
+
+    Vectors are L2-normalised on insert so a query is one matrix-vector
+    product. With a directory the matrix lives in ``<name>.f32`` (memory-mapped,
+    appended to in place) and the documents and metadata in ``<name>.jsonl``;
+    without one everything stays in memory.
+
+    The methods mirror the parts of a Chroma collection that
+    FinancialSituationMemory uses (count / add / query), with cosine distances.
+    """
+
+    def __init__(self, name, directory=None):
+        self.name = name
+        self.directory = directory
+        self._lock = threading.Lock()
+        self._records = []
+        self._matrix = np.empty((0, 0), dtype=np.float32)
+        self._dimensions = None
+
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._load()
+
+    def _path(self, suffix):
+        return os.path.join(self.directory, f"{self.name}{suffix}")
+
+    def _load(self):
+        meta_path = self._path(".meta.json")
+        if not os.path.exists(meta_path):
+            return
+        with open(meta_path, "r") as f:
+            self._dimensions = json.load(f)["dimensions"]
+
+        if os.path.exists(self._path(".jsonl")):
+            with open(self._path(".jsonl"), "r", encoding="utf-8") as f:
+                self._records = [json.loads(line) for line in f if line.strip()]
+        if not os.path.exists(self._path(".f32")):
+            open(self._path(".f32"), "wb").close()
+
+        # A crash between the two appends can leave one side longer; trust the shorter
+        vector_rows = os.path.getsize(self._path(".f32")) // (4 * self._dimensions)
+        rows = min(len(self._records), vector_rows)
+        if rows != len(self._records):
+            self._records = self._records[:rows]
+            with open(self._path(".jsonl"), "w", encoding="utf-8") as f:
+                for record in self._records:
+                    f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.truncate(self._path(".f32"), rows * 4 * self._dimensions)
+        self._map(rows)
+
+    def _map(self, rows):
+        if rows == 0:
+            self._matrix = np.empty((0, self._dimensions), dtype=np.float32)
+        else:
+            self._matrix = np.memmap(
+                self._path(".f32"), dtype=np.float32, mode="r", shape=(rows, self._dimensions)
+            )
+
+    @staticmethod
+    def _normalise(vectors):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, np.finfo(np.float32).tiny)
+
+    def count(self):
+        return len(self._records)
+
+    def add(self, documents, metadatas, embeddings, ids):
+        vectors = self._normalise(embeddings)
+        records = [
+            {"id": id_, "document": document, "metadata": metadata}
+            for id_, document, metadata in zip(ids, documents, metadatas)
+        ]
+
+        with self._lock:
+            if self._dimensions is None:
+                self._dimensions = vectors.shape[1]
+                self._matrix = np.empty((0, self._dimensions), dtype=np.float32)
+                if self.directory:
+                    with open(self._path(".meta.json"), "w") as f:
+                        json.dump({"dimensions": self._dimensions}, f)
+            elif vectors.shape[1] != self._dimensions:
+                raise ValueError(
+                    f"Embedding has {vectors.shape[1]} dimensions, index '{self.name}' expects {self._dimensions}"
+                )
+
+            if self.directory:
+                with open(self._path(".f32"), "ab") as f:
+                    f.write(vectors.tobytes())
+                with open(self._path(".jsonl"), "a", encoding="utf-8") as f:
+                    for record in records:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                self._records.extend(records)
+                self._map(len(self._records))
+            else:
+                self._records.extend(records)
+                self._matrix = np.concatenate([self._matrix, vectors])
+
+    def query(self, query_embeddings, n_results, include=None):
+        with self._lock:
+            matrix = self._matrix
+            records = self._records
+
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for query in self._normalise(query_embeddings).reshape(len(query_embeddings), -1):
+            k = min(n_results, matrix.shape[0])
+            if k == 0:
+                top = np.empty(0, dtype=np.int64)
+                scores = np.empty(0, dtype=np.float32)
+            else:
+                scores = matrix @ query
+                top = np.argpartition(-scores, k - 1)[:k]
+                top = top[np.argsort(-scores[top], kind="stable")]
+
+            result["ids"].append([records[i]["id"] for i in top])
+            result["documents"].append([records[i]["document"] for i in top])
+            result["metadatas"].append([records[i]["metadata"] for i in top])
+            result["distances"].append([float(1.0 - scores[i]) for i in top])
+        return result
@@ -2,10 +2,16 @@
 AkShare 数据获取模块
 支持A股、港股、基金等数据获取
 """
-from typing import Annotated
+import threading
+import time
+from typing import Annotated, List, Union
 from datetime import datetime
 import pandas as pd
 
+from .config import get_config_section
+from .akshare_store import get_local_series
+from .price_store import get_price_frame, slice_price_frame
+
 try:
     import akshare as ak
     AKSHARE_AVAILABLE = True
@@ -14,6 +20,119 @@ except ImportError:
     print("WARNING: akshare is not installed. Please install it with: pip install akshare")
 
 
+# A股日线列名 -> 标准列名
+STOCK_COLUMN_MAPPING = {
+    '日期': 'Date',
+    '开盘': 'Open',
+    '收盘': 'Close',
+    '最高': 'High',
+    '最低': 'Low',
+    '成交量': 'Volume',
+    '成交额': 'Amount',
+    '振幅': 'Amplitude',
+    '涨跌幅': 'Change_Pct',
+    '涨跌额': 'Change',
+    '换手率': 'Turnover'
+}
+
+
+# 指数日线列名 -> 标准列名
+INDEX_COLUMN_MAPPING = {
+    'date': 'Date',
+    'open': 'Open',
+    'high': 'High',
+    'low': 'Low',
+    'close': 'Close',
+    'volume': 'Volume'
+}
+
+
+def _since_param(since) -> str:
+    """增量下载的起始日期（YYYYMMDD）；没有已存数据时从头下载"""
+    return since.strftime("%Y%m%d") if since is not None else "19700101"
+
+
+def _fetch_stock_bars(symbol: str, source, since):
+    """下载A股前复权日线（从 since 开始，含当天）"""
+    df = ak.stock_zh_a_hist(
+        symbol=symbol,
+        period="daily",
+        start_date=_since_param(since),
+        end_date=datetime.now().strftime("%Y%m%d"),
+        adjust="qfq"  # 前复权
+    )
+    if df.empty:
+        return df, symbol
+
+    df = df.rename(columns=STOCK_COLUMN_MAPPING)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.set_index('Date').sort_index(), symbol
+
+
+def _load_stock_history(symbol: str) -> pd.DataFrame:
+    """
+    A股全部前复权日线，按日期升序索引
+
+    由 price_store 的进程内缓存调用；本地存储每次只补充新的交易日，
+    前复权价格被重算时重新下载全部历史
+    """
+    return get_local_series("stock", symbol, _fetch_stock_bars, rebase_column="Close")
+
+
+def _fetch_fund_nav(symbol: str, source, since):
+    """下载基金单位净值走势（接口只提供全部历史，按 since 截取新数据）"""
+    df = ak.fund_open_fund_info_em(fund=symbol, indicator="单位净值走势")
+    if df.empty:
+        return df, symbol
+
+    df = df.rename(columns={
+        '净值日期': 'Date',
+        '单位净值': 'NAV',
+        '日增长率': 'Daily_Return'
+    })
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.set_index('Date').sort_index()
+    if since is not None:
+        df = df[df.index >= since]
+    return df, symbol
+
+
+def _fetch_index_daily(source: str, since) -> pd.DataFrame:
+    """下载一个带交易所前缀的指数日线（如 'sh000001'）
+
+    首次下载和增量更新都使用东方财富接口，保证同一序列的成交量口径和列一致
+    """
+    df = ak.stock_zh_index_daily_em(
+        symbol=source,
+        start_date=_since_param(since),
+        end_date=datetime.now().strftime("%Y%m%d"),
+    )
+    if df is None or df.empty:
+        return pd.DataFrame()
+
+    df = df[[col for col in INDEX_COLUMN_MAPPING if col in df.columns]]
+    df = df.rename(columns=INDEX_COLUMN_MAPPING)
+    df['Date'] = pd.to_datetime(df['Date'])
+    return df.set_index('Date').sort_index()
+
+
+def _fetch_index_bars(symbol: str, source, since):
+    """下载指数日线；首次依次尝试上海(sh)、深圳(sz)前缀，之后直接使用已解析的前缀"""
+    candidates = [source] if source else [f"sh{symbol}", f"sz{symbol}"]
+    last_error = None
+    for candidate in candidates:
+        try:
+            df = _fetch_index_daily(candidate, since)
+        except Exception as e:
+            last_error = e
+            continue
+        if not df.empty:
+            return df, candidate
+    if last_error is not None:
+        raise last_error
+    return pd.DataFrame(), source
+
+
 def get_stock_data(
     symbol: Annotated[str, "股票代码，如 '000001' (平安银行) 或 '600000' (浦发银行)"],
     start_date: Annotated[str, "开始日期，格式: YYYY-MM-DD"],
@@ -38,40 +157,12 @@ def get_stock_data(
     datetime.strptime(end_date, "%Y-%m-%d")
 
     try:
-        # 使用 akshare 获取股票历史数据
-        # stock_zh_a_hist: 获取A股历史行情数据（前复权）
-        df = ak.stock_zh_a_hist(
-            symbol=symbol,
-            period="daily",  # 日线数据
-            start_date=start_date.replace("-", ""),  # akshare 需要 YYYYMMDD 格式
-            end_date=end_date.replace("-", ""),
-            adjust="qfq"  # 前复权
-        )
+        # 全部前复权日线在进程内只下载一次，按日期范围切片
+        history = get_price_frame(symbol, "akshare_qfq", _load_stock_history)
+        df = slice_price_frame(history, start_date, end_date).copy()
 
         if df.empty:
-            return f"未找到股票代码 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据"
-
-        # 重命名列以符合标准格式
-        column_mapping = {
-            '日期': 'Date',
-            '开盘': 'Open',
-            '收盘': 'Close',
-            '最高': 'High',
-            '最低': 'Low',
-            '成交量': 'Volume',
-            '成交额': 'Amount',
-            '振幅': 'Amplitude',
-            '涨跌幅': 'Change_Pct',
-            '涨跌额': 'Change',
-            '换手率': 'Turnover'
-        }
-
-        df = df.rename(columns=column_mapping)
-
-        # 设置日期为索引
-        if 'Date' in df.columns:
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.set_index('Date')
+            raise ValueError(f"未找到股票代码 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据")
 
         # 数值列保留2位小数
         numeric_columns = ['Open', 'High', 'Low', 'Close']
@@ -90,8 +181,10 @@ def get_stock_data(
 
         return header + csv_string
 
+    except ValueError:
+        raise
     except Exception as e:
-        return f"获取股票 {symbol} 数据时出错: {str(e)}"
+        raise RuntimeError(f"获取股票 {symbol} 数据时出错: {e}") from e
 
 
 def get_fund_data(
@@ -118,35 +211,17 @@ def get_fund_data(
     datetime.strptime(end_date, "%Y-%m-%d")
 
     try:
-        # 获取基金历史净值数据
-        df = ak.fund_open_fund_info_em(fund=symbol, indicator="单位净值走势")
+        # 本地存储的净值序列覆盖查询区间时不再请求接口
+        history = get_local_series("fund", symbol, _fetch_fund_nav, covers_through=end_date)
 
-        if df.empty:
-            return f"未找到基金代码 '{symbol}' 的数据"
-
-        # 重命名列
-        column_mapping = {
-            '净值日期': 'Date',
-            '单位净值': 'NAV',
-            '日增长率': 'Daily_Return'
-        }
-
-        # 只保留需要的列
-        df = df.rename(columns=column_mapping)
-
-        # 转换日期格式
-        df['Date'] = pd.to_datetime(df['Date'])
+        if history.empty:
+            raise ValueError(f"未找到基金代码 '{symbol}' 的数据")
 
         # 过滤日期范围
-        start = pd.to_datetime(start_date)
-        end = pd.to_datetime(end_date)
-        df = df[(df['Date'] >= start) & (df['Date'] <= end)]
+        df = slice_price_frame(history, start_date, end_date)
 
         if df.empty:
-            return f"未找到基金 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据"
-
-        # 设置日期为索引
-        df = df.set_index('Date')
+            raise ValueError(f"未找到基金 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据")
 
         # 转换为CSV字符串
         csv_string = df.to_csv()
@@ -158,8 +233,86 @@ def get_fund_data(
 
         return header + csv_string
 
+    except ValueError:
+        raise
     except Exception as e:
-        return f"获取基金 {symbol} 数据时出错: {str(e)}"
+        raise RuntimeError(f"获取基金 {symbol} 数据时出错: {e}") from e
+
+
+# 全市场实时行情快照: (获取时间, 以代码为索引的 DataFrame)
+_spot_snapshot = None
+_spot_lock = threading.Lock()
+
+
+def get_spot_snapshot() -> pd.DataFrame:
+    """
+    获取全市场A股实时行情快照（以股票代码为索引）
+
+    快照在进程内共享，有效期为 config["akshare"]["spot_snapshot_ttl"] 秒；
+    并发调用只会触发一次下载，其余调用等待并复用同一份快照
+    """
+    global _spot_snapshot
+    if not AKSHARE_AVAILABLE:
+        raise ImportError("akshare is not installed")
+
+    ttl = get_config_section("akshare")["spot_snapshot_ttl"]
+    with _spot_lock:
+        if _spot_snapshot is not None and time.monotonic() - _spot_snapshot[0] < ttl:
+            return _spot_snapshot[1]
+
+        df = ak.stock_zh_a_spot_em()
+        df = df.drop_duplicates(subset='代码').set_index('代码')
+        _spot_snapshot = (time.monotonic(), df)
+        return df
+
+
+def _format_stock_info(symbol: str, info: pd.Series) -> str:
+    """把快照中的一行转换为易读格式"""
+    result = f"# 股票 {symbol} 实时信息\n\n"
+    result += f"名称: {info.get('名称', 'N/A')}\n"
+    result += f"最新价: {info.get('最新价', 'N/A')}\n"
+    result += f"涨跌幅: {info.get('涨跌幅', 'N/A')}%\n"
+    result += f"涨跌额: {info.get('涨跌额', 'N/A')}\n"
+    result += f"成交量: {info.get('成交量', 'N/A')}\n"
+    result += f"成交额: {info.get('成交额', 'N/A')}\n"
+    result += f"振幅: {info.get('振幅', 'N/A')}%\n"
+    result += f"换手率: {info.get('换手率', 'N/A')}%\n"
+    result += f"市盈率: {info.get('市盈率-动态', 'N/A')}\n"
+    result += f"市净率: {info.get('市净率', 'N/A')}\n"
+    return result
+
+
+def get_stock_info_batch(
+    symbols: Annotated[Union[List[str], str], "股票代码列表，或逗号分隔的代码字符串"]
+) -> str:
+    """
+    基于同一份行情快照批量获取多只股票的基本信息
+
+    参数:
+        symbols: 股票代码列表或逗号分隔的字符串
+
+    返回:
+        每只股票的基本信息文本，依次拼接
+    """
+    if isinstance(symbols, str):
+        symbols = [symbol.strip() for symbol in symbols.split(",")]
+    symbols = list(dict.fromkeys(symbol for symbol in symbols if symbol))
+
+    if not AKSHARE_AVAILABLE:
+        raise ImportError("akshare is not installed")
+
+    try:
+        snapshot = get_spot_snapshot()
+    except Exception as e:
+        raise RuntimeError(f"获取股票 {', '.join(symbols)} 信息时出错: {e}") from e
+
+    results = []
+    for symbol in symbols:
+        if symbol in snapshot.index:
+            results.append(_format_stock_info(symbol, snapshot.loc[symbol]))
+        else:
+            results.append(f"未找到股票代码 '{symbol}' 的信息")
+    return "\n".join(results)
 
 
 def get_stock_info(
@@ -178,33 +331,18 @@ def get_stock_info(
         raise ImportError("akshare is not installed")
 
     try:
-        # 获取实时行情数据
-        df = ak.stock_zh_a_spot_em()
+        # 从共享的实时行情快照中按代码查找
+        snapshot = get_spot_snapshot()
 
-        # 筛选指定股票
-        stock_info = df[df['代码'] == symbol]
+        if symbol not in snapshot.index:
+            raise ValueError(f"未找到股票代码 '{symbol}' 的信息")
 
-        if stock_info.empty:
-            return f"未找到股票代码 '{symbol}' 的信息"
-
-        # 转换为易读格式
-        info = stock_info.iloc[0]
-        result = f"# 股票 {symbol} 实时信息\n\n"
-        result += f"名称: {info.get('名称', 'N/A')}\n"
-        result += f"最新价: {info.get('最新价', 'N/A')}\n"
-        result += f"涨跌幅: {info.get('涨跌幅', 'N/A')}%\n"
-        result += f"涨跌额: {info.get('涨跌额', 'N/A')}\n"
-        result += f"成交量: {info.get('成交量', 'N/A')}\n"
-        result += f"成交额: {info.get('成交额', 'N/A')}\n"
-        result += f"振幅: {info.get('振幅', 'N/A')}%\n"
-        result += f"换手率: {info.get('换手率', 'N/A')}%\n"
-        result += f"市盈率: {info.get('市盈率-动态', 'N/A')}\n"
-        result += f"市净率: {info.get('市净率', 'N/A')}\n"
-
-        return result
+        return _format_stock_info(symbol, snapshot.loc[symbol])
 
+    except ValueError:
+        raise
     except Exception as e:
-        return f"获取股票 {symbol} 信息时出错: {str(e)}"
+        raise RuntimeError(f"获取股票 {symbol} 信息时出错: {e}") from e
 
 
 def get_stock_financial_report(
@@ -227,7 +365,7 @@ def get_stock_financial_report(
         df_income = ak.stock_financial_report_sina(stock=symbol, symbol="利润表")
 
         if df_income.empty:
-            return f"未找到股票 '{symbol}' 的财务报表数据"
+            raise ValueError(f"未找到股票 '{symbol}' 的财务报表数据")
 
         # 转换为CSV
         csv_string = df_income.to_csv(index=False)
@@ -237,8 +375,10 @@ def get_stock_financial_report(
 
         return header + csv_string
 
+    except ValueError:
+        raise
     except Exception as e:
-        return f"获取股票 {symbol} 财务报表时出错: {str(e)}"
+        raise RuntimeError(f"获取股票 {symbol} 财务报表时出错: {e}") from e
 
 
 def get_index_data(
@@ -264,38 +404,19 @@ def get_index_data(
     datetime.strptime(end_date, "%Y-%m-%d")
 
     try:
-        # 获取指数数据
-        df = ak.stock_zh_index_daily(symbol=f"sh{symbol}")
-
-        if df.empty:
-            # 尝试深圳指数
-            df = ak.stock_zh_index_daily(symbol=f"sz{symbol}")
-
-        if df.empty:
-            return f"未找到指数 '{symbol}' 的数据"
+        # 本地存储的指数序列，记住已解析的 sh/sz 前缀，只补充新的交易日
+        history = get_local_series(
+            "index", symbol, _fetch_index_bars, covers_through=end_date, rebase_column="Close"
+        )
 
-        # 转换日期
-        df['date'] = pd.to_datetime(df['date'])
+        if history.empty:
+            raise ValueError(f"未找到指数 '{symbol}' 的数据")
 
         # 过滤日期范围
-        start = pd.to_datetime(start_date)
-        end = pd.to_datetime(end_date)
-        df = df[(df['date'] >= start) & (df['date'] <= end)]
+        df = slice_price_frame(history, start_date, end_date)
 
         if df.empty:
-            return f"未找到指数 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据"
-
-        # 重命名列
-        df = df.rename(columns={
-            'date': 'Date',
-            'open': 'Open',
-            'close': 'Close',
-            'high': 'High',
-            'low': 'Low',
-            'volume': 'Volume'
-        })
-
-        df = df.set_index('Date')
+            raise ValueError(f"未找到指数 '{symbol}' 在 {start_date} 到 {end_date} 之间的数据")
 
         csv_string = df.to_csv()
 
@@ -305,8 +426,10 @@ def get_index_data(
 
         return header + csv_string
 
+    except ValueError:
+        raise
     except Exception as e:
-        return f"获取指数 {symbol} 数据时出错: {str(e)}"
+        raise RuntimeError(f"获取指数 {symbol} 数据时出错: {e}") from e
 
 
 # 为了兼容现有系统，提供别名
@@ -0,0 +1,154 @@
+"""
+AkShare 本地增量时间序列存储
+
+每个 (类型, 代码) 在 ``<data_cache_dir>/akshare_store`` 下保存一个 pickle 的
+DataFrame（按日期升序索引）和一个 JSON 元数据文件，记录最后检查日期、最后一根
+K线日期以及解析出的数据源代码（例如指数实际使用的 sh/sz 前缀）。
+
+更新时只请求已存倒数第二个交易日（最后一根已收盘确认的K线）之后的数据；最后
+一根K线可能是盘中写入的，只会被新数据覆盖而不参与重算检测。如果已存数据已经
+覆盖所查询的结束日期（该日期之后还有K线，或结束日期当天的K线是在之后某天检查
+时写入的），或今天已经检查过，则完全在本地完成区间查询。
+"""
+import json
+import os
+import threading
+from datetime import date
+from typing import Callable, Dict, Optional, Tuple
+
+import pandas as pd
+
+from .config import get_config
+
+# fetch(symbol, source, since) -> (新数据, 数据源代码)
+SeriesFetcher = Callable[
+    [str, Optional[str], Optional[pd.Timestamp]], Tuple[pd.DataFrame, Optional[str]]
+]
+
+_series_cache: Dict[str, Tuple[pd.DataFrame, dict]] = {}
+_locks: Dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _series_lock(key: str) -> threading.Lock:
+    with _locks_guard:
+        if key not in _locks:
+            _locks[key] = threading.Lock()
+        return _locks[key]
+
+
+def _store_path(kind: str, symbol: str, suffix: str) -> str:
+    store_dir = os.path.join(get_config()["data_cache_dir"], "akshare_store")
+    os.makedirs(store_dir, exist_ok=True)
+    return os.path.join(store_dir, f"{kind}_{symbol}{suffix}")
+
+
+def _read_store(kind: str, symbol: str):
+    frame_path = _store_path(kind, symbol, ".pkl")
+    meta_path = _store_path(kind, symbol, ".json")
+    if not (os.path.exists(frame_path) and os.path.exists(meta_path)):
+        return None, None
+    with open(meta_path, "r", encoding="utf-8") as f:
+        meta = json.load(f)
+    return pd.read_pickle(frame_path), meta
+
+
+def _write_store(kind: str, symbol: str, data: pd.DataFrame, meta: dict) -> None:
+    frame_path = _store_path(kind, symbol, ".pkl")
+    tmp_path = frame_path + ".tmp"
+    data.to_pickle(tmp_path)
+    os.replace(tmp_path, frame_path)
+    with open(_store_path(kind, symbol, ".json"), "w", encoding="utf-8") as f:
+        json.dump(meta, f, ensure_ascii=False)
+
+
+def _rebased(
+    stored: pd.DataFrame, fresh: pd.DataFrame, bar: Optional[pd.Timestamp], column: Optional[str]
+) -> bool:
+    """重叠的已确认交易日数值发生变化（如前复权因除权而重算，或数据源口径不同）时需要重新下载全部历史"""
+    if column is None or bar is None or column not in fresh.columns:
+        return False
+    if bar not in fresh.index:
+        return False
+    old = float(stored.loc[bar, column])
+    new = float(fresh.loc[bar, column])
+    return abs(new - old) > 1e-6 * max(abs(old), 1.0)
+
+
+def get_local_series(
+    kind: str,
+    symbol: str,
+    fetch: SeriesFetcher,
+    covers_through: Optional[str] = None,
+    rebase_column: Optional[str] = None,
+) -> pd.DataFrame:
+    """
+    返回本地存储的完整日线序列，必要时增量更新
+
+    参数:
+        kind: 数据类型（如 'stock'、'fund'、'index'），与代码一起组成存储键
+        symbol: 代码
+        fetch: 下载函数 fetch(symbol, source, since)。source 为上次解析出的数据源
+            代码（首次为 None），since 为已存倒数第二个交易日（首次为 None，表示
+            下载全部历史）；返回 (按日期升序索引的数据, 实际使用的数据源代码)
+        covers_through: 查询的结束日期 (YYYY-MM-DD)；已存数据以已确认的K线覆盖到
+            该日期时不再更新
+        rebase_column: 用于检测历史数据被重算的列（如前复权收盘价）
+
+    返回:
+        按日期升序索引的 DataFrame，调用方不要原地修改
+    """
+    key = f"{kind}:{symbol}"
+    today = date.today().isoformat()
+
+    with _series_lock(key):
+        cached = _series_cache.get(key)
+        stored, meta = cached if cached is not None else _read_store(kind, symbol)
+
+        if stored is not None and not stored.empty:
+            covered = False
+            if covers_through is not None:
+                # 结束日期当天的K线只有在之后还有K线，或在之后某天检查过时才算已确认
+                through = pd.Timestamp(covers_through)
+                checked_on = meta.get("checked_on")
+                covered = stored.index[-1] > through or (
+                    stored.index[-1] == through
+                    and checked_on is not None
+                    and pd.Timestamp(checked_on) > through
+                )
+            if meta.get("checked_on") == today or covered:
+                _series_cache[key] = (stored, meta)
+                return stored
+            # 最后一根K线可能写入时尚未收盘，从它之前的已确认K线开始更新并比较
+            settled_bar = stored.index[-2] if len(stored) > 1 else None
+            since = stored.index[-1] if settled_bar is None else settled_bar
+        else:
+            stored, since, settled_bar = None, None, None
+
+        source = meta.get("source") if meta else None
+        try:
+            fresh, source = fetch(symbol, source, since)
+            if stored is not None and _rebased(stored, fresh, settled_bar, rebase_column):
+                fresh, source = fetch(symbol, source, None)
+                stored = None
+        except Exception as e:
+            if stored is None:
+                raise
+            print(f"WARNING: Could not refresh akshare {kind} {symbol}, serving stored data: {e}")
+            return stored
+
+        if stored is None:
+            data = fresh
+        else:
+            data = pd.concat([stored, fresh])
+            data = data[~data.index.duplicated(keep="last")].sort_index()
+
+        meta = {
+            "checked_on": today,
+            "last_bar": str(data.index.max())[:10] if not data.empty else None,
+            "source": source,
+        }
+        if not data.empty:
+            _write_store(kind, symbol, data, meta)
+            _series_cache[key] = (data, meta)
+        return data
@@ -1,9 +1,15 @@
+import hashlib
 import os
+import threading
+import time
 import requests
 import pandas as pd
 import json
-from datetime import datetime
+from datetime import date, datetime
 from io import StringIO
+from requests.adapters import HTTPAdapter
+
+from .config import get_config, get_config_section
 
 API_BASE_URL = "https://www.alphavantage.co/query"
 
@@ -39,11 +45,191 @@ class AlphaVantageRateLimitError(Exception):
     """Exception raised when Alpha Vantage API rate limit is exceeded."""
     pass
 
+class AlphaVantageAPIKeyError(ValueError):
+    """Exception raised when Alpha Vantage rejects the API key as invalid or missing."""
+    pass
+
+# Phrases of the server's "Information" replies when the quota is used up or
+# requests come in too fast ("... standard API rate limit is 25 requests per
+# day", "... spreading out your free API requests more sparingly ...")
+_RATE_LIMIT_PHRASES = ("rate limit", "requests per", "spreading out", "more sparingly")
+
+
+class TokenBucket:
+    """Thread-safe token bucket that hands out reservations.
+
+    ``reserve`` takes a token even when none is left, letting the balance go
+    negative, and returns how long the caller must wait for its token. Each
+    caller is then served in arrival order without holding the lock while
+    it sleeps.
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float):
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self._tokens = capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.refill_per_second
+        )
+        self._updated = now
+
+    def reserve(self, max_wait: float = None) -> float:
+        """Claim a token and return the seconds to wait for it.
+
+        Raises:
+            AlphaVantageRateLimitError: If the wait would exceed ``max_wait``
+        """
+        with self._lock:
+            self._refill(time.monotonic())
+            wait = max(0.0, (1.0 - self._tokens) / self.refill_per_second)
+            if max_wait is not None and wait > max_wait:
+                raise AlphaVantageRateLimitError(
+                    f"Alpha Vantage request queue is {wait:.0f}s long (max_wait_seconds={max_wait})"
+                )
+            self._tokens -= 1.0
+            return wait
+
+    def set_rate(self, capacity: float, refill_per_second: float) -> None:
+        """Change the limits, keeping the tokens already spent."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.capacity = capacity
+            self.refill_per_second = refill_per_second
+            self._tokens = min(self._tokens, capacity)
+
+    def drain(self) -> None:
+        """Empty the bucket, e.g. after the server reported the quota as used up."""
+        with self._lock:
+            self._refill(time.monotonic())
+            self._tokens = min(self._tokens, 0.0)
+
+
+class AlphaVantageClient:
+    """Shared Alpha Vantage HTTP client.
+
+    One pooled ``requests.Session`` keeps connections alive across calls, and
+    a per-minute token bucket plus a per-day counter queue requests
+    client-side instead of spending them on rate-limit errors. Async callers
+    reach it through worker threads, so every analysis in the process draws
+    on the same quota.
+    """
+
+    def __init__(
+        self,
+        requests_per_minute: float = 5,
+        requests_per_day: int = None,
+        max_wait_seconds: float = 120,
+        pool_size: int = 16,
+        request_timeout: float = 30,
+    ):
+        self.minute_bucket = TokenBucket(requests_per_minute, requests_per_minute / 60.0)
+        self._day = date.today()
+        self._day_count = 0
+        self._day_lock = threading.Lock()
+        self.session = requests.Session()
+        self.pool_size = None
+        self.configure(
+            requests_per_minute=requests_per_minute,
+            requests_per_day=requests_per_day,
+            max_wait_seconds=max_wait_seconds,
+            pool_size=pool_size,
+            request_timeout=request_timeout,
+        )
+
+    def configure(
+        self,
+        requests_per_minute: float,
+        requests_per_day: int,
+        max_wait_seconds: float,
+        pool_size: int,
+        request_timeout: float,
+    ) -> None:
+        """Apply new limits in place, keeping the quota already used and the open connections."""
+        self.requests_per_day = requests_per_day
+        self.max_wait_seconds = max_wait_seconds
+        self.request_timeout = request_timeout
+        if (self.minute_bucket.capacity, self.minute_bucket.refill_per_second) != (
+            requests_per_minute,
+            requests_per_minute / 60.0,
+        ):
+            self.minute_bucket.set_rate(requests_per_minute, requests_per_minute / 60.0)
+        if pool_size != self.pool_size:
+            self.pool_size = pool_size
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+            # Mounting replaces the old adapters; close their pools so no sockets leak
+            for old_adapter in set(self.session.adapters.values()):
+                old_adapter.close()
+            self.session.mount("https://", adapter)
+            self.session.mount("http://", adapter)
+
+    def _take_daily_quota(self) -> None:
+        if self.requests_per_day is None:
+            return
+        with self._day_lock:
+            if date.today() != self._day:
+                self._day = date.today()
+                self._day_count = 0
+            if self._day_count >= self.requests_per_day:
+                raise AlphaVantageRateLimitError(
+                    f"Alpha Vantage daily quota of {self.requests_per_day} requests is used up"
+                )
+            self._day_count += 1
+
+    def _acquire(self) -> None:
+        """Block until this request may be sent."""
+        self._take_daily_quota()
+        try:
+            wait = self.minute_bucket.reserve(self.max_wait_seconds)
+        except AlphaVantageRateLimitError:
+            with self._day_lock:
+                self._day_count -= 1
+            raise
+        if wait > 0:
+            print(f"RATE_LIMIT: Alpha Vantage request queued for {wait:.1f}s")
+            time.sleep(wait)
+
+    def get(self, params: dict) -> requests.Response:
+        self._acquire()
+        response = self.session.get(API_BASE_URL, params=params, timeout=self.request_timeout)
+        response.raise_for_status()
+        return response
+
+    def record_server_rate_limit(self) -> None:
+        """The server refused a request; hold back the other queued callers too."""
+        self.minute_bucket.drain()
+
+
+_client = None
+_client_settings = None
+_client_lock = threading.Lock()
+
+
+def get_client() -> AlphaVantageClient:
+    """Return the process-wide client, applying changed settings to it in place.
+
+    The token bucket and daily counter survive a settings change, so the
+    quota already used stays counted.
+    """
+    global _client, _client_settings
+    settings = get_config_section("alpha_vantage")
+    with _client_lock:
+        if _client is None:
+            _client = AlphaVantageClient(**settings)
+        elif settings != _client_settings:
+            _client.configure(**settings)
+        _client_settings = settings
+        return _client
+
 def _make_api_request(function_name: str, params: dict) -> dict | str:
     """Helper function to make API requests and handle responses.
     
     Raises:
         AlphaVantageRateLimitError: When API rate limit is exceeded
+        AlphaVantageAPIKeyError: When the API key is invalid or missing
     """
     # Create a copy of params to avoid modifying the original
     api_params = params.copy()
@@ -63,8 +249,8 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Remove entitlement if it's None or empty
         api_params.pop("entitlement", None)
     
-    response = requests.get(API_BASE_URL, params=api_params)
-    response.raise_for_status()
+    client = get_client()
+    response = client.get(api_params)
 
     response_text = response.text
     
@@ -74,8 +260,14 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
         # Check for rate limit error
         if "Information" in response_json:
             info_message = response_json["Information"]
-            if "rate limit" in info_message.lower() or "api key" in info_message.lower():
+            lowered = info_message.lower()
+            # Only a real rate limit holds back the other queued callers; a key
+            # problem is a configuration error that waiting won't fix
+            if any(phrase in lowered for phrase in _RATE_LIMIT_PHRASES):
+                client.record_server_rate_limit()
                 raise AlphaVantageRateLimitError(f"Alpha Vantage rate limit exceeded: {info_message}")
+            if "api key" in lowered or "apikey" in lowered:
+                raise AlphaVantageAPIKeyError(f"Alpha Vantage rejected the API key: {info_message}")
     except json.JSONDecodeError:
         # Response is not JSON (likely CSV data), which is normal
         pass
@@ -84,6 +276,93 @@ def _make_api_request(function_name: str, params: dict) -> dict | str:
 
 
 
+# (function, params) key -> (day last checked, full series frame)
+_series_frames = {}
+_series_locks = {}
+_series_locks_guard = threading.Lock()
+
+
+def _series_lock(key: str) -> threading.Lock:
+    with _series_locks_guard:
+        if key not in _series_locks:
+            _series_locks[key] = threading.Lock()
+        return _series_locks[key]
+
+
+def _series_path(function_name: str, params: dict, key: str) -> str:
+    cache_dir = os.path.join(get_config()["data_cache_dir"], "alpha_vantage")
+    os.makedirs(cache_dir, exist_ok=True)
+    symbol = params.get("symbol", "")
+    return os.path.join(cache_dir, f"{function_name}_{symbol}_{key[:16]}.pkl")
+
+
+def _parse_series_csv(response: str, function_name: str) -> pd.DataFrame:
+    """Parse a CSV series response into a frame with an ascending date index."""
+    data = pd.read_csv(StringIO(response))
+    if data.empty or data.columns[0] not in ("timestamp", "time"):
+        raise ValueError(f"Unexpected Alpha Vantage {function_name} response: {response[:200]}")
+    date_col = data.columns[0]
+    data[date_col] = pd.to_datetime(data[date_col])
+    return data.set_index(date_col).sort_index()
+
+
+def get_series_frame(function_name: str, params: dict, covers_through: str = None) -> pd.DataFrame:
+    """
+    Return the full series of an Alpha Vantage CSV endpoint as a DataFrame.
+
+    Each (function, params) series is fetched once and kept both in memory and
+    as a pickle under ``<data_cache_dir>/alpha_vantage``. A stored series is
+    served without an API call if it was fetched today, or if it already
+    covers ``covers_through`` (yyyy-mm-dd) with a settled bar: one after that
+    day, or one on that day fetched after it ended. Windows in the past
+    therefore never trigger a refresh, while a bar fetched mid-session is
+    replaced on a later day. If a refresh fails the stored series is served
+    instead.
+
+    Callers must not modify the returned frame in place.
+    """
+    key = hashlib.sha1(
+        json.dumps([function_name, params], sort_keys=True).encode("utf-8")
+    ).hexdigest()
+    today = date.today().isoformat()
+
+    with _series_lock(key):
+        path = _series_path(function_name, params, key)
+        cached = _series_frames.get(key)
+        if cached is None and os.path.exists(path):
+            stored = pd.read_pickle(path)
+            cached = (stored["checked_on"], stored["frame"])
+            _series_frames[key] = cached
+
+        if cached is not None:
+            checked_on, frame = cached
+            covered = False
+            if covers_through is not None and not frame.empty:
+                # A bar on covers_through itself may have been fetched mid-session;
+                # it is only final if a later bar exists or it was fetched a day later
+                through = pd.Timestamp(covers_through)
+                covered = frame.index[-1] > through or (
+                    frame.index[-1] == through and pd.Timestamp(checked_on) > through
+                )
+            if checked_on == today or covered:
+                return frame
+
+        try:
+            response = _make_api_request(function_name, {**params, "datatype": "csv"})
+            frame = _parse_series_csv(response, function_name)
+        except Exception as e:
+            if cached is None:
+                raise
+            print(f"WARNING: Could not refresh Alpha Vantage {function_name} for {params.get('symbol')}, serving cached series: {e}")
+            return cached[1]
+
+        tmp_path = path + ".tmp"
+        pd.to_pickle({"checked_on": today, "frame": frame}, tmp_path)
+        os.replace(tmp_path, path)
+        _series_frames[key] = (today, frame)
+        return frame
+
+
 def _filter_csv_by_date_range(csv_data: str, start_date: str, end_date: str) -> str:
     """
     Filter CSV data to include only rows within the specified date range.
@@ -1,4 +1,5 @@
-from .alpha_vantage_common import _make_api_request
+from .alpha_vantage_common import AlphaVantageRateLimitError, get_series_frame
+from .price_store import slice_price_frame
 
 def get_indicator(
     symbol: str,
@@ -72,138 +73,32 @@ def get_indicator(
     if required_series_type:
         series_type = required_series_type
 
+    if indicator == "vwma":
+        # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
+        # In a real implementation, this would need to be calculated from OHLCV data
+        return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
+
+    function_name, params, target_col_name = _indicator_request(
+        indicator, interval, time_period, series_type
+    )
+
     try:
-        # Get indicator data for the period
-        if indicator == "close_50_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "50",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_200_sma":
-            data = _make_api_request("SMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "200",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "close_10_ema":
-            data = _make_api_request("EMA", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "10",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macd":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macds":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "macdh":
-            data = _make_api_request("MACD", {
-                "symbol": symbol,
-                "interval": interval,
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "rsi":
-            data = _make_api_request("RSI", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator in ["boll", "boll_ub", "boll_lb"]:
-            data = _make_api_request("BBANDS", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": "20",
-                "series_type": series_type,
-                "datatype": "csv"
-            })
-        elif indicator == "atr":
-            data = _make_api_request("ATR", {
-                "symbol": symbol,
-                "interval": interval,
-                "time_period": str(time_period),
-                "datatype": "csv"
-            })
-        elif indicator == "vwma":
-            # Alpha Vantage doesn't have direct VWMA, so we'll return an informative message
-            # In a real implementation, this would need to be calculated from OHLCV data
-            return f"## VWMA (Volume Weighted Moving Average) for {symbol}:\n\nVWMA calculation requires OHLCV data and is not directly available from Alpha Vantage API.\nThis indicator would need to be calculated from the raw stock data using volume-weighted price averaging.\n\n{indicator_descriptions.get('vwma', 'No description available.')}"
-        else:
-            return f"Error: Indicator {indicator} not implemented yet."
-
-        # Parse CSV data and extract values for the date range
-        lines = data.strip().split('\n')
-        if len(lines) < 2:
-            return f"Error: No data returned for {indicator}"
-
-        # Parse header and data
-        header = [col.strip() for col in lines[0].split(',')]
-        try:
-            date_col_idx = header.index('time')
-        except ValueError:
-            return f"Error: 'time' column not found in data for {indicator}. Available columns: {header}"
-
-        # Map internal indicator names to expected CSV column names from Alpha Vantage
-        col_name_map = {
-            "macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist",
-            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band",
-            "rsi": "RSI", "atr": "ATR", "close_10_ema": "EMA",
-            "close_50_sma": "SMA", "close_200_sma": "SMA"
-        }
-
-        target_col_name = col_name_map.get(indicator)
-
-        if not target_col_name:
-            # Default to the second column if no specific mapping exists
-            value_col_idx = 1
-        else:
-            try:
-                value_col_idx = header.index(target_col_name)
-            except ValueError:
-                return f"Error: Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {header}"
-
-        result_data = []
-        for line in lines[1:]:
-            if not line.strip():
-                continue
-            values = line.split(',')
-            if len(values) > value_col_idx:
-                try:
-                    date_str = values[date_col_idx].strip()
-                    # Parse the date
-                    date_dt = datetime.strptime(date_str, "%Y-%m-%d")
-
-                    # Check if date is in our range
-                    if before <= date_dt <= curr_date_dt:
-                        value = values[value_col_idx].strip()
-                        result_data.append((date_dt, value))
-                except (ValueError, IndexError):
-                    continue
-
-        # Sort by date and format output
-        result_data.sort(key=lambda x: x[0])
+        # The full indicator series is cached per (function, symbol, params), so
+        # e.g. macd/macds/macdh share one request and past windows cost none
+        data = get_series_frame(
+            function_name, {"symbol": symbol, **params}, covers_through=curr_date
+        )
+
+        if target_col_name not in data.columns:
+            raise ValueError(
+                f"Column '{target_col_name}' not found for indicator '{indicator}'. Available columns: {list(data.columns)}"
+            )
+
+        window = slice_price_frame(data, before.strftime("%Y-%m-%d"), curr_date)
 
         ind_string = ""
-        for date_dt, value in result_data:
-            ind_string += f"{date_dt.strftime('%Y-%m-%d')}: {value}\n"
+        for date_dt, value in window[target_col_name].items():
+            ind_string += f"{date_dt.strftime('%Y-%m-%d')}: {value:.4f}\n"
 
         if not ind_string:
             ind_string = "No data available for the specified date range.\n"
@@ -217,6 +112,61 @@ def get_indicator(
 
         return result_str
 
+    except (AlphaVantageRateLimitError, ValueError):
+        raise
     except Exception as e:
-        print(f"Error getting Alpha Vantage indicator data for {indicator}: {e}")
-        return f"Error retrieving {indicator} data: {str(e)}"
+        raise RuntimeError(f"Error retrieving {indicator} data: {e}") from e
+
+
+def _indicator_request(indicator: str, interval: str, time_period: int, series_type: str):
+    """Alpha Vantage function, request params and CSV value column of an indicator."""
+    if indicator == "close_50_sma":
+        return "SMA", {"interval": interval, "time_period": "50", "series_type": series_type}, "SMA"
+    if indicator == "close_200_sma":
+        return "SMA", {"interval": interval, "time_period": "200", "series_type": series_type}, "SMA"
+    if indicator == "close_10_ema":
+        return "EMA", {"interval": interval, "time_period": "10", "series_type": series_type}, "EMA"
+    if indicator in ("macd", "macds", "macdh"):
+        column = {"macd": "MACD", "macds": "MACD_Signal", "macdh": "MACD_Hist"}[indicator]
+        return "MACD", {"interval": interval, "series_type": series_type}, column
+    if indicator == "rsi":
+        return "RSI", {"interval": interval, "time_period": str(time_period), "series_type": series_type}, "RSI"
+    if indicator in ("boll", "boll_ub", "boll_lb"):
+        column = {
+            "boll": "Real Middle Band", "boll_ub": "Real Upper Band", "boll_lb": "Real Lower Band"
+        }[indicator]
+        return "BBANDS", {"interval": interval, "time_period": "20", "series_type": series_type}, column
+    if indicator == "atr":
+        return "ATR", {"interval": interval, "time_period": str(time_period)}, "ATR"
+    raise ValueError(f"Indicator {indicator} not implemented yet.")
+
+
+def get_indicators_batch(
+    symbol: str,
+    indicators,
+    curr_date: str,
+    look_back_days: int,
+) -> str:
+    """
+    Returns several Alpha Vantage technical indicators in one report.
+
+    Alpha Vantage serves one indicator per request, so each indicator is still
+    fetched separately; this keeps the batched tool usable with this vendor.
+
+    Args:
+        symbol: ticker symbol of the company
+        indicators: list or comma-separated string of indicator names
+        curr_date: The current trading date you are trading on, YYYY-mm-dd
+        look_back_days: how many days to look back
+
+    Returns:
+        String containing each indicator's values and description
+    """
+    if isinstance(indicators, str):
+        indicators = [ind.strip() for ind in indicators.split(",")]
+    indicators = list(dict.fromkeys(ind for ind in indicators if ind))
+
+    return "\n\n".join(
+        get_indicator(symbol, indicator, curr_date, look_back_days)
+        for indicator in indicators
+    )
@@ -1,5 +1,6 @@
-from datetime import datetime
-from .alpha_vantage_common import _make_api_request, _filter_csv_by_date_range
+from .alpha_vantage_common import get_series_frame
+from .price_store import slice_price_frame
+
 
 def get_stock(
     symbol: str,
@@ -10,6 +11,10 @@ def get_stock(
     Returns raw daily OHLCV values, adjusted close values, and historical split/dividend events
     filtered to the specified date range.
 
+    The full daily series is fetched once and kept in the Alpha Vantage series
+    cache; every range is sliced from it, and ranges the cached series already
+    covers cost no API call.
+
     Args:
         symbol: The name of the equity. For example: symbol=IBM
         start_date: Start date in yyyy-mm-dd format
@@ -18,21 +23,12 @@ def get_stock(
     Returns:
         CSV string containing the daily adjusted time series data filtered to the date range.
     """
-    # Parse dates to determine the range
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    today = datetime.now()
-
-    # Choose outputsize based on whether the requested range is within the latest 100 days
-    # Compact returns latest 100 data points, so check if start_date is recent enough
-    days_from_today_to_start = (today - start_dt).days
-    outputsize = "compact" if days_from_today_to_start < 100 else "full"
-
-    params = {
-        "symbol": symbol,
-        "outputsize": outputsize,
-        "datatype": "csv",
-    }
-
-    response = _make_api_request("TIME_SERIES_DAILY_ADJUSTED", params)
+    history = get_series_frame(
+        "TIME_SERIES_DAILY_ADJUSTED",
+        {"symbol": symbol, "outputsize": "full"},
+        covers_through=end_date,
+    )
+    window = slice_price_frame(history, start_date, end_date)
 
-    return _filter_csv_by_date_range(response, start_date, end_date)
\ No newline at end of file
+    # Newest first, like the API's own CSV
+    return window.iloc[::-1].reset_index().to_csv(index=False)
@@ -30,5 +30,12 @@ def get_config() -> Dict:
     return _config.copy()
 
 
+def get_config_section(name: str) -> Dict:
+    """Get a nested settings section, filling the keys it leaves out from the defaults."""
+    section = dict(default_config.DEFAULT_CONFIG.get(name) or {})
+    section.update(get_config().get(name) or {})
+    return section
+
+
 # Initialize with default config
 initialize_config()
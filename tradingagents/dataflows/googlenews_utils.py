@@ -1,9 +1,14 @@
+import hashlib
 import json
+import os
+import random
+import threading
+import time
+from datetime import date, datetime
+from urllib.parse import quote_plus, urlparse
+
 import requests
 from bs4 import BeautifulSoup
-from datetime import datetime
-import time
-import random
 from tenacity import (
     retry,
     stop_after_attempt,
@@ -12,6 +17,53 @@ from tenacity import (
     retry_if_result,
 )
 
+from .config import get_config, get_config_section
+
+try:
+    import lxml  # noqa: F401
+
+    # lxml builds the tree several times faster than the pure-Python parser
+    HTML_PARSER = "lxml"
+except ImportError:
+    HTML_PARSER = "html.parser"
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/101.0.4951.54 Safari/537.36"
+    )
+}
+
+_session = requests.Session()
+
+
+class HostScheduler:
+    """Spaces requests to the same host at least ``min_interval`` seconds apart.
+
+    Each caller reserves the next free slot for its host under a lock and
+    sleeps until then outside it, so concurrent fetches queue up per host
+    instead of every request sleeping a fixed random delay.
+    """
+
+    def __init__(self, min_interval: float):
+        self.min_interval = min_interval
+        self._next_slot = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            # A little jitter keeps the spacing from looking machine-regular
+            self._next_slot[host] = slot + self.min_interval * random.uniform(1.0, 1.5)
+        if slot > now:
+            time.sleep(slot - now)
+
+
+_scheduler = HostScheduler(get_config_section("google_news")["min_request_interval"])
+
 
 def is_rate_limited(response):
     """Check if the response indicates rate limiting (status code 429)"""
@@ -23,86 +75,135 @@ def is_rate_limited(response):
     wait=wait_exponential(multiplier=1, min=4, max=60),
     stop=stop_after_attempt(5),
 )
-def make_request(url, headers):
+def make_request(url, headers, timeout=None):
     """Make a request with retry logic for rate limiting"""
-    # Random delay before each request to avoid detection
-    time.sleep(random.uniform(2, 6))
-    response = requests.get(url, headers=headers)
+    # Wait for this host's next politeness slot
+    _scheduler.wait(url)
+    response = _session.get(url, headers=headers, timeout=timeout)
     return response
 
 
-def getNewsData(query, start_date, end_date):
+def _to_query_date(value):
+    """yyyy-mm-dd or mm/dd/yyyy -> mm/dd/yyyy"""
+    if "-" in value:
+        return datetime.strptime(value, "%Y-%m-%d").strftime("%m/%d/%Y")
+    return value
+
+
+def _page_cache_path(query, start_date, end_date, page):
+    cache_dir = os.path.join(get_config()["data_cache_dir"], "google_news")
+    os.makedirs(cache_dir, exist_ok=True)
+    key = hashlib.sha1(
+        json.dumps([query, start_date, end_date, page]).encode("utf-8")
+    ).hexdigest()
+    return os.path.join(cache_dir, f"{key}.json")
+
+
+def _read_cached_page(path, end_date, ttl):
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        cached = json.load(f)
+    # Result pages for a range that ended before today don't change
+    closed = datetime.strptime(end_date, "%m/%d/%Y").date() < date.today()
+    if not closed and ttl is not None and time.time() - cached["fetched_at"] > ttl:
+        return None
+    return cached
+
+
+def _write_cached_page(path, page_data):
+    tmp_path = f"{path}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(page_data, f, ensure_ascii=False)
+    os.replace(tmp_path, path)
+
+
+def _parse_page(content):
+    """Extract the news results and whether a next page exists from one result page."""
+    soup = BeautifulSoup(content, HTML_PARSER)
+    results = []
+    for el in soup.select("div.SoaBEf"):
+        try:
+            results.append(
+                {
+                    "link": el.find("a")["href"],
+                    "title": el.select_one("div.MBeuO").get_text(),
+                    "snippet": el.select_one(".GI74Re").get_text(),
+                    "date": el.select_one(".LfVVr").get_text(),
+                    "source": el.select_one(".NUnG9d span").get_text(),
+                }
+            )
+        except Exception as e:
+            print(f"Error processing result: {e}")
+            # If one of the fields is not found, skip this result
+            continue
+    return results, soup.find("a", id="pnnext") is not None
+
+
+def fetch_page(query, start_date, end_date, page, settings=None):
+    """
+    Return one result page as {"results": [...], "has_next": bool}, served
+    from the on-disk cache keyed by (query, date range, page) when possible.
+    Dates are mm/dd/yyyy.
+
+    Pages without results are never cached: consent or CAPTCHA pages and
+    layout changes also come back as HTTP 200 with nothing to parse, and a
+    cached one would hide that query's results for good.
+    """
+    settings = settings or get_config_section("google_news")
+    path = _page_cache_path(query, start_date, end_date, page)
+    cached = _read_cached_page(path, end_date, settings["cache_ttl"])
+    if cached is not None:
+        return cached
+
+    url = (
+        f"https://www.google.com/search?q={quote_plus(query, safe='+')}"
+        f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
+        f"&tbm=nws&start={page * 10}"
+    )
+    response = make_request(url, HEADERS, timeout=settings["request_timeout"])
+    response.raise_for_status()
+    results, has_next = _parse_page(response.content)
+
+    page_data = {"fetched_at": time.time(), "results": results, "has_next": has_next}
+    if results:
+        _write_cached_page(path, page_data)
+    return page_data
+
+
+def getNewsData(query, start_date, end_date, max_pages=None, max_results=None):
     """
     Scrape Google News search results for a given query and date range.
     query: str - search query
     start_date: str - start date in the format yyyy-mm-dd or mm/dd/yyyy
     end_date: str - end date in the format yyyy-mm-dd or mm/dd/yyyy
+    max_pages: int - result pages to fetch at most (default from config["google_news"])
+    max_results: int - results to return at most (default from config["google_news"])
+
+    Pages are fetched one after another, and page N+1 only when page N has
+    results and a "Next" link, so no request is spent on pages that don't
+    exist. Requests to one host are spaced min_request_interval apart anyway,
+    so fetching pages concurrently would gain little.
     """
-    if "-" in start_date:
-        start_date = datetime.strptime(start_date, "%Y-%m-%d")
-        start_date = start_date.strftime("%m/%d/%Y")
-    if "-" in end_date:
-        end_date = datetime.strptime(end_date, "%Y-%m-%d")
-        end_date = end_date.strftime("%m/%d/%Y")
-
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/101.0.4951.54 Safari/537.36"
-        )
-    }
+    settings = get_config_section("google_news")
+    max_pages = max_pages or settings["max_pages"]
+    max_results = max_results or settings["max_results"]
+    _scheduler.min_interval = settings["min_request_interval"]
 
-    news_results = []
-    page = 0
-    while True:
-        offset = page * 10
-        url = (
-            f"https://www.google.com/search?q={query}"
-            f"&tbs=cdr:1,cd_min:{start_date},cd_max:{end_date}"
-            f"&tbm=nws&start={offset}"
-        )
+    start_date = _to_query_date(start_date)
+    end_date = _to_query_date(end_date)
 
+    news_results = []
+    for page in range(max_pages):
         try:
-            response = make_request(url, headers)
-            soup = BeautifulSoup(response.content, "html.parser")
-            results_on_page = soup.select("div.SoaBEf")
-
-            if not results_on_page:
-                break  # No more results found
-
-            for el in results_on_page:
-                try:
-                    link = el.find("a")["href"]
-                    title = el.select_one("div.MBeuO").get_text()
-                    snippet = el.select_one(".GI74Re").get_text()
-                    date = el.select_one(".LfVVr").get_text()
-                    source = el.select_one(".NUnG9d span").get_text()
-                    news_results.append(
-                        {
-                            "link": link,
-                            "title": title,
-                            "snippet": snippet,
-                            "date": date,
-                            "source": source,
-                        }
-                    )
-                except Exception as e:
-                    print(f"Error processing result: {e}")
-                    # If one of the fields is not found, skip this result
-                    continue
-
-            # Update the progress bar with the current count of results scraped
-
-            # Check for the "Next" link (pagination)
-            next_link = soup.find("a", id="pnnext")
-            if not next_link:
-                break
-
-            page += 1
-
+            page_data = fetch_page(query, start_date, end_date, page, settings)
         except Exception as e:
             print(f"Failed after multiple retries: {e}")
             break
+        if not page_data["results"]:
+            break
+        news_results.extend(page_data["results"])
+        if len(news_results) >= max_results or not page_data["has_next"]:
+            break
 
-    return news_results
+    return news_results[:max_results]
@@ -1,13 +1,19 @@
+import asyncio
+import inspect
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Annotated
 
 # Import from vendor-specific modules
 from .local import get_YFin_data, get_finnhub_news, get_finnhub_company_insider_sentiment, get_finnhub_company_insider_transactions, get_simfin_balance_sheet, get_simfin_cashflow, get_simfin_income_statements, get_reddit_global_news, get_reddit_company_news
-from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
+from .y_finance import get_YFin_data_online, get_stock_stats_indicators_window, get_stock_stats_indicators_batch, get_balance_sheet as get_yfinance_balance_sheet, get_cashflow as get_yfinance_cashflow, get_income_statement as get_yfinance_income_statement, get_insider_transactions as get_yfinance_insider_transactions
 from .google import get_google_news
 from .openai import get_stock_news_openai, get_global_news_openai, get_fundamentals_openai
 from .alpha_vantage import (
     get_stock as get_alpha_vantage_stock,
     get_indicator as get_alpha_vantage_indicator,
+    get_indicators_batch as get_alpha_vantage_indicators_batch,
     get_fundamentals as get_alpha_vantage_fundamentals,
     get_balance_sheet as get_alpha_vantage_balance_sheet,
     get_cashflow as get_alpha_vantage_cashflow,
@@ -15,7 +21,7 @@ from .alpha_vantage import (
     get_insider_transactions as get_alpha_vantage_insider_transactions,
     get_news as get_alpha_vantage_news
 )
-from .alpha_vantage_common import AlphaVantageRateLimitError
+from .alpha_vantage_common import AlphaVantageAPIKeyError, AlphaVantageRateLimitError
 from .akshare_data import (
     get_stock_data as get_akshare_stock,
     get_fund_data as get_akshare_fund,
@@ -31,7 +37,18 @@ from .market_detector import (
 )
 
 # Configuration and routing logic
-from .config import get_config
+from .config import get_config, get_config_section
+from .tool_cache import get_tool_cache, tool_cache_ttl, is_cacheable_result
+
+ROUTING_MODES = ("sequential", "hedged", "first_success", "gather")
+
+# Shared worker pools for concurrent routing. Vendor attempts and the
+# implementations inside a multi-implementation vendor use separate pools so a
+# vendor waiting on its implementations can never starve them of workers.
+# A vendor call abandoned after its timeout keeps its worker until the call
+# returns by itself; only the vendors' own request timeouts end it.
+_VENDOR_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="vendor")
+_IMPL_POOL = ThreadPoolExecutor(max_workers=16, thread_name_prefix="vendor-impl")
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -44,7 +61,8 @@ TOOLS_CATEGORIES = {
     "technical_indicators": {
         "description": "Technical analysis indicators",
         "tools": [
-            "get_indicators"
+            "get_indicators",
+            "get_indicators_batch"
         ]
     },
     "fundamental_data": {
@@ -97,6 +115,11 @@ VENDOR_METHODS = {
         "yfinance": get_stock_stats_indicators_window,
         "local": get_stock_stats_indicators_window
     },
+    "get_indicators_batch": {
+        "alpha_vantage": get_alpha_vantage_indicators_batch,
+        "yfinance": get_stock_stats_indicators_batch,
+        "local": get_stock_stats_indicators_batch
+    },
     # fundamental_data
     "get_fundamentals": {
         "alpha_vantage": get_alpha_vantage_fundamentals,
@@ -167,12 +190,11 @@ def get_vendor(category: str, method: str = None) -> str:
     # Fall back to category-level configuration
     return config.get("data_vendors", {}).get(category, "default")
 
-def route_to_vendor(method: str, *args, **kwargs):
-    """Route method calls to appropriate vendor implementation with fallback support.
+def _resolve_vendor_chain(method: str, args, kwargs):
+    """Work out the primary vendors and the full fallback order for a method call.
 
-    Supports intelligent market detection for stock data:
-    - If vendor_config is "auto", automatically detects market and selects best vendor
-    - For get_stock_data with symbol parameter, can use smart routing
+    Returns:
+        (primary_vendors, fallback_vendors, smart_routing_enabled)
     """
     category = get_category_for_method(method)
     vendor_config = get_vendor(category, method)
@@ -222,11 +244,11 @@ def route_to_vendor(method: str, *args, **kwargs):
     fallback_str = " → ".join(fallback_vendors)
     print(f"DEBUG: {method} - Primary: [{primary_str}] | Full fallback order: [{fallback_str}]")
 
-    # Track results and execution state
-    results = []
+    return primary_vendors, fallback_vendors, smart_routing_enabled
+
+def _iter_vendor_attempts(method: str, primary_vendors, fallback_vendors):
+    """Yield (vendor, implementations) for each vendor to try, in fallback order."""
     vendor_attempt_count = 0
-    any_primary_vendor_attempted = False
-    successful_vendor = None
 
     for vendor in fallback_vendors:
         if vendor not in VENDOR_METHODS[method]:
@@ -238,59 +260,44 @@ def route_to_vendor(method: str, *args, **kwargs):
         is_primary_vendor = vendor in primary_vendors
         vendor_attempt_count += 1
 
-        # Track if we attempted any primary vendor
-        if is_primary_vendor:
-            any_primary_vendor_attempted = True
-
         # Debug: Print current attempt
         vendor_type = "PRIMARY" if is_primary_vendor else "FALLBACK"
         print(f"DEBUG: Attempting {vendor_type} vendor '{vendor}' for {method} (attempt #{vendor_attempt_count})")
 
         # Handle list of methods for a vendor
         if isinstance(vendor_impl, list):
-            vendor_methods = [(impl, vendor) for impl in vendor_impl]
-            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_methods)} functions")
+            print(f"DEBUG: Vendor '{vendor}' has multiple implementations: {len(vendor_impl)} functions")
+            yield vendor, vendor_impl
         else:
-            vendor_methods = [(vendor_impl, vendor)]
+            yield vendor, [vendor_impl]
 
-        # Run methods for this vendor
-        vendor_results = []
-        for impl_func, vendor_name in vendor_methods:
-            try:
-                print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor_name}'...")
-                result = impl_func(*args, **kwargs)
-                vendor_results.append(result)
-                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor_name}' completed successfully")
-                    
-            except AlphaVantageRateLimitError as e:
-                if vendor == "alpha_vantage":
-                    print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
-                    print(f"DEBUG: Rate limit details: {e}")
-                # Continue to next vendor for fallback
-                continue
-            except Exception as e:
-                # Log error but continue with other implementations
-                print(f"FAILED: {impl_func.__name__} from vendor '{vendor_name}' failed: {e}")
-                continue
+def _should_stop_after(vendor: str, primary_vendors, smart_routing_enabled: bool) -> bool:
+    """Decide whether to stop after a vendor that produced results.
 
-        # Add this vendor's results
-        if vendor_results:
-            results.extend(vendor_results)
-            successful_vendor = vendor
-            result_summary = f"Got {len(vendor_results)} result(s)"
-            print(f"SUCCESS: Vendor '{vendor}' succeeded - {result_summary}")
-
-            # Stopping logic:
-            # 1. Stop after first successful vendor for single-vendor configs
-            # 2. Stop after first successful vendor for smart routing (auto mode)
-            # 3. Multiple vendor configs (comma-separated) may want to collect from multiple sources
-            if len(primary_vendors) == 1 or smart_routing_enabled:
-                stop_reason = "single-vendor config" if len(primary_vendors) == 1 else "smart routing mode"
-                print(f"DEBUG: Stopping after successful vendor '{vendor}' ({stop_reason})")
-                break
-        else:
-            print(f"FAILED: Vendor '{vendor}' produced no results")
+    Stopping logic:
+    1. Stop after first successful vendor for single-vendor configs
+    2. Stop after first successful vendor for smart routing (auto mode)
+    3. Multiple vendor configs (comma-separated) may want to collect from multiple sources
+    """
+    if len(primary_vendors) == 1 or smart_routing_enabled:
+        stop_reason = "single-vendor config" if len(primary_vendors) == 1 else "smart routing mode"
+        print(f"DEBUG: Stopping after successful vendor '{vendor}' ({stop_reason})")
+        return True
+    return False
+
+def _report_impl_failure(impl_func, vendor: str, error: Exception):
+    """Log a failed vendor implementation; the caller moves on to the next one."""
+    if isinstance(error, AlphaVantageRateLimitError):
+        if vendor == "alpha_vantage":
+            print(f"RATE_LIMIT: Alpha Vantage rate limit exceeded, falling back to next available vendor")
+            print(f"DEBUG: Rate limit details: {error}")
+    elif isinstance(error, AlphaVantageAPIKeyError):
+        print(f"FAILED: {error} (check ALPHA_VANTAGE_API_KEY), falling back to next available vendor")
+    else:
+        print(f"FAILED: {impl_func.__name__} from vendor '{vendor}' failed: {error}")
 
+def _combine_results(method: str, results, vendor_attempt_count: int):
+    """Return the single result, or all results concatenated as a string."""
     # Final result summary
     if not results:
         print(f"FAILURE: All {vendor_attempt_count} vendor attempts failed for method '{method}'")
@@ -303,4 +310,376 @@ def route_to_vendor(method: str, *args, **kwargs):
         return results[0]
     else:
         # Convert all results to strings and concatenate
-        return '\n'.join(str(result) for result in results)
\ No newline at end of file
+        return '\n'.join(str(result) for result in results)
+
+def _routing_settings():
+    """Return the vendor routing settings, filling gaps from the defaults."""
+    settings = get_config_section("vendor_routing")
+    if settings["mode"] not in ROUTING_MODES:
+        raise ValueError(
+            f"Unknown vendor routing mode '{settings['mode']}'. Please choose from: {list(ROUTING_MODES)}"
+        )
+    return settings
+
+def _vendor_timeout(vendor: str, routing):
+    """Per-vendor timeout in seconds, or None to wait indefinitely."""
+    return routing.get("vendor_timeouts", {}).get(vendor, routing.get("vendor_timeout"))
+
+def _cached_results(method: str, vendor: str, args, kwargs):
+    """Return (cache, cached results or None) for a vendor call."""
+    cache = get_tool_cache()
+    if cache is None:
+        return None, None
+    cached = cache.get(method, vendor, args, kwargs)
+    if cached is not None:
+        print(f"CACHE: {method} from vendor '{vendor}' served from the tool cache")
+    return cache, cached
+
+def _store_results(cache, method: str, vendor: str, args, kwargs, vendor_results):
+    if cache is not None and is_cacheable_result(vendor_results):
+        ttl = tool_cache_ttl(get_category_for_method(method), args, kwargs, vendor_results)
+        cache.put(method, vendor, args, kwargs, vendor_results, ttl)
+
+def _call_vendor(method: str, vendor: str, impls, args, kwargs, parallel_impls: bool):
+    """Return a vendor's results from the tool cache, or run it and cache them."""
+    cache, cached = _cached_results(method, vendor, args, kwargs)
+    if cached is not None:
+        return cached
+    vendor_results = _run_vendor_impls(vendor, impls, args, kwargs, parallel_impls)
+    _store_results(cache, method, vendor, args, kwargs, vendor_results)
+    return vendor_results
+
+def _run_vendor_impls(vendor: str, impls, args, kwargs, parallel_impls: bool):
+    """Run every implementation of a vendor and return the successful results.
+
+    Multiple implementations run concurrently when parallel_impls is set; the
+    results keep the order of the implementation list either way.
+    """
+    vendor_results = []
+
+    if parallel_impls and len(impls) > 1:
+        futures = []
+        for impl_func in impls:
+            print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor}'...")
+            futures.append((impl_func, _IMPL_POOL.submit(impl_func, *args, **kwargs)))
+        for impl_func, future in futures:
+            try:
+                vendor_results.append(future.result())
+                print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor}' completed successfully")
+            except Exception as e:
+                _report_impl_failure(impl_func, vendor, e)
+        return vendor_results
+
+    for impl_func in impls:
+        try:
+            print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor}'...")
+            result = impl_func(*args, **kwargs)
+            vendor_results.append(result)
+            print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor}' completed successfully")
+        except Exception as e:
+            # Log error but continue with other implementations
+            _report_impl_failure(impl_func, vendor, e)
+            continue
+    return vendor_results
+
+def _call_vendor_with_timeout(method: str, vendor: str, impls, args, kwargs, routing):
+    """Run a vendor, giving up on it after its configured timeout.
+
+    Giving up only stops waiting: a call that has already started cannot be
+    cancelled, so it keeps one of the 16 _VENDOR_POOL workers until it returns
+    on its own. A vendor that hangs on every call therefore ties up one more
+    worker per timeout, until later routed calls queue behind them. The
+    vendors' HTTP requests carry their own timeouts (vendor_routing
+    "request_timeout" for yfinance and OpenAI, the alpha_vantage and
+    google_news settings), which is what eventually frees those workers.
+    """
+    timeout = _vendor_timeout(vendor, routing)
+    if timeout is None:
+        return _call_vendor(method, vendor, impls, args, kwargs, routing["parallel_impls"])
+
+    future = _VENDOR_POOL.submit(
+        _call_vendor, method, vendor, impls, args, kwargs, routing["parallel_impls"]
+    )
+    try:
+        return future.result(timeout=timeout)
+    except FuturesTimeoutError:
+        future.cancel()
+        print(f"TIMEOUT: Vendor '{vendor}' did not answer within {timeout}s")
+        return []
+
+def _race_vendors(method: str, attempts, args, kwargs, routing, hedge_delay):
+    """Run vendors concurrently and return the first one that produces results.
+
+    With hedge_delay=None every vendor starts at once (first-success-wins), so
+    callers only pass the configured vendors here, never the whole fallback
+    chain.
+    Otherwise vendors start in fallback order: the next one is launched when
+    the running ones have all failed or timed out, or hedge_delay seconds after
+    the previous launch, whichever comes first.
+
+    Returns:
+        (vendor, vendor_results, launched_count); vendor is None if all failed.
+        Abandoned attempts finish in the background, holding their pool
+        worker until they return, and their results are dropped.
+    """
+    pending = {}
+    next_index = 0
+    last_launch = 0.0
+
+    def launch():
+        nonlocal next_index, last_launch
+        vendor, impls = attempts[next_index]
+        next_index += 1
+        last_launch = time.monotonic()
+        future = _VENDOR_POOL.submit(
+            _call_vendor, method, vendor, impls, args, kwargs, routing["parallel_impls"]
+        )
+        pending[future] = (vendor, last_launch, _vendor_timeout(vendor, routing))
+
+    def cancel_pending():
+        for future in pending:
+            future.cancel()
+
+    if hedge_delay is None:
+        while next_index < len(attempts):
+            launch()
+    elif attempts:
+        launch()
+
+    while pending or next_index < len(attempts):
+        if not pending:
+            launch()
+            continue
+
+        now = time.monotonic()
+        waits = [
+            started + timeout - now
+            for _, started, timeout in pending.values()
+            if timeout is not None
+        ]
+        if hedge_delay is not None and next_index < len(attempts):
+            waits.append(last_launch + hedge_delay - now)
+        wait_for = max(0.0, min(waits)) if waits else None
+
+        done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+        for future in done:
+            vendor, _, _ = pending.pop(future)
+            vendor_results = future.result()
+            if vendor_results:
+                print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+                cancel_pending()
+                return vendor, vendor_results, next_index
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+
+        now = time.monotonic()
+        for future, (vendor, started, timeout) in list(pending.items()):
+            if timeout is not None and now - started >= timeout:
+                pending.pop(future)
+                future.cancel()
+                print(f"TIMEOUT: Vendor '{vendor}' did not answer within {timeout}s")
+
+        if (
+            hedge_delay is not None
+            and pending
+            and next_index < len(attempts)
+            and now - last_launch >= hedge_delay
+        ):
+            print(f"DEBUG: Hedging - no answer after {hedge_delay * 1000:.0f}ms, starting next vendor")
+            launch()
+
+    return None, [], next_index
+
+def _gather_vendors(method: str, attempts, args, kwargs, routing):
+    """Run vendors concurrently and collect every result in attempt order."""
+    futures = [
+        (vendor, _VENDOR_POOL.submit(
+            _call_vendor, method, vendor, impls, args, kwargs, routing["parallel_impls"]
+        ))
+        for vendor, impls in attempts
+    ]
+    started = time.monotonic()
+
+    results = []
+    for vendor, future in futures:
+        timeout = _vendor_timeout(vendor, routing)
+        remaining = None if timeout is None else max(0.0, started + timeout - time.monotonic())
+        try:
+            vendor_results = future.result(timeout=remaining)
+        except FuturesTimeoutError:
+            future.cancel()
+            print(f"TIMEOUT: Vendor '{vendor}' did not answer within {timeout}s")
+            continue
+        if vendor_results:
+            results.extend(vendor_results)
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+        else:
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+    return results
+
+def _try_fallbacks(method: str, fallback_attempts, args, kwargs, routing):
+    """Try fallback vendors once every configured vendor has failed.
+
+    Fallbacks are hedged in hedged mode and tried one at a time otherwise, so
+    unconfigured (and possibly paid) vendors only run while the ones before
+    them have failed. Returns (vendor_results, attempt_count).
+    """
+    if routing["mode"] == "hedged":
+        _, results, launched = _race_vendors(
+            method, fallback_attempts, args, kwargs, routing,
+            hedge_delay=routing["hedge_delay_ms"] / 1000.0,
+        )
+        return results, launched
+
+    attempt_count = 0
+    for vendor, impls in fallback_attempts:
+        attempt_count += 1
+        vendor_results = _call_vendor_with_timeout(method, vendor, impls, args, kwargs, routing)
+        if vendor_results:
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+            return vendor_results, attempt_count
+        print(f"FAILED: Vendor '{vendor}' produced no results")
+    return [], attempt_count
+
+def _route_concurrently(method: str, primary_vendors, fallback_vendors, args, kwargs, routing):
+    """Concurrent counterpart of the sequential loop in route_to_vendor.
+
+    Only the configured (primary) vendors run concurrently; the rest of the
+    fallback chain is tried through _try_fallbacks when all of them fail.
+    """
+    attempts = list(_iter_vendor_attempts(method, primary_vendors, fallback_vendors))
+    primary_attempts = [a for a in attempts if a[0] in primary_vendors]
+    fallback_attempts = [a for a in attempts if a[0] not in primary_vendors]
+    mode = routing["mode"]
+
+    if mode == "gather":
+        results = _gather_vendors(method, primary_attempts, args, kwargs, routing)
+        attempt_count = len(primary_attempts)
+    else:
+        hedge_delay = routing["hedge_delay_ms"] / 1000.0 if mode == "hedged" else None
+        _, results, attempt_count = _race_vendors(
+            method, primary_attempts, args, kwargs, routing, hedge_delay
+        )
+
+    if not results and fallback_attempts:
+        results, launched = _try_fallbacks(method, fallback_attempts, args, kwargs, routing)
+        attempt_count += launched
+    return _combine_results(method, results, attempt_count)
+
+def route_to_vendor(method: str, *args, **kwargs):
+    """Route method calls to appropriate vendor implementation with fallback support.
+
+    Supports intelligent market detection for stock data:
+    - If vendor_config is "auto", automatically detects market and selects best vendor
+    - For get_stock_data with symbol parameter, can use smart routing
+
+    The "vendor_routing" config selects how vendors are tried: one after another
+    (sequential, the default), hedged, first_success or gather. See
+    DEFAULT_CONFIG for the options.
+    """
+    routing = _routing_settings()
+    primary_vendors, fallback_vendors, smart_routing_enabled = _resolve_vendor_chain(
+        method, args, kwargs
+    )
+
+    if routing["mode"] != "sequential":
+        return _route_concurrently(
+            method, primary_vendors, fallback_vendors, args, kwargs, routing
+        )
+
+    # Track results and execution state
+    results = []
+    vendor_attempt_count = 0
+
+    for vendor, impls in _iter_vendor_attempts(method, primary_vendors, fallback_vendors):
+        vendor_attempt_count += 1
+
+        # Run methods for this vendor
+        vendor_results = _call_vendor_with_timeout(method, vendor, impls, args, kwargs, routing)
+
+        # Add this vendor's results
+        if vendor_results:
+            results.extend(vendor_results)
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+            if _should_stop_after(vendor, primary_vendors, smart_routing_enabled):
+                break
+        else:
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+
+    return _combine_results(method, results, vendor_attempt_count)
+
+async def _acall_impl(impl_func, vendor: str, args, kwargs):
+    print(f"DEBUG: Calling {impl_func.__name__} from vendor '{vendor}'...")
+    if inspect.iscoroutinefunction(impl_func):
+        return await impl_func(*args, **kwargs)
+    return await asyncio.to_thread(impl_func, *args, **kwargs)
+
+async def _acall_vendor(method: str, vendor: str, impls, args, kwargs, parallel_impls: bool):
+    """Async counterpart of _call_vendor."""
+    cache, cached = _cached_results(method, vendor, args, kwargs)
+    if cached is not None:
+        return cached
+
+    if parallel_impls and len(impls) > 1:
+        outcomes = await asyncio.gather(
+            *(_acall_impl(impl_func, vendor, args, kwargs) for impl_func in impls),
+            return_exceptions=True,
+        )
+    else:
+        outcomes = []
+        for impl_func in impls:
+            try:
+                outcomes.append(await _acall_impl(impl_func, vendor, args, kwargs))
+            except Exception as e:
+                outcomes.append(e)
+
+    vendor_results = []
+    for impl_func, outcome in zip(impls, outcomes):
+        if isinstance(outcome, Exception):
+            _report_impl_failure(impl_func, vendor, outcome)
+        else:
+            vendor_results.append(outcome)
+            print(f"SUCCESS: {impl_func.__name__} from vendor '{vendor}' completed successfully")
+    _store_results(cache, method, vendor, args, kwargs, vendor_results)
+    return vendor_results
+
+async def aroute_to_vendor(method: str, *args, **kwargs):
+    """Async variant of route_to_vendor with the same routing and fallback rules.
+
+    Coroutine implementations are awaited directly. The synchronous vendor SDKs
+    (yfinance, akshare, requests) are run in a worker thread so they never block
+    the event loop. The concurrent routing modes run the thread-pool router in a
+    worker thread as well.
+    """
+    routing = _routing_settings()
+    if routing["mode"] != "sequential":
+        return await asyncio.to_thread(route_to_vendor, method, *args, **kwargs)
+
+    primary_vendors, fallback_vendors, smart_routing_enabled = _resolve_vendor_chain(
+        method, args, kwargs
+    )
+
+    results = []
+    vendor_attempt_count = 0
+
+    for vendor, impls in _iter_vendor_attempts(method, primary_vendors, fallback_vendors):
+        vendor_attempt_count += 1
+
+        timeout = _vendor_timeout(vendor, routing)
+        try:
+            vendor_results = await asyncio.wait_for(
+                _acall_vendor(method, vendor, impls, args, kwargs, routing["parallel_impls"]),
+                timeout,
+            )
+        except asyncio.TimeoutError:
+            print(f"TIMEOUT: Vendor '{vendor}' did not answer within {timeout}s")
+            vendor_results = []
+
+        if vendor_results:
+            results.extend(vendor_results)
+            print(f"SUCCESS: Vendor '{vendor}' succeeded - Got {len(vendor_results)} result(s)")
+            if _should_stop_after(vendor, primary_vendors, smart_routing_enabled):
+                break
+        else:
+            print(f"FAILED: Vendor '{vendor}' produced no results")
+
+    return _combine_results(method, results, vendor_attempt_count)
@@ -1,12 +1,13 @@
 from typing import Annotated
 import pandas as pd
 import os
-from .config import DATA_DIR
+import threading
+from .config import DATA_DIR, get_config
 from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import json
-from .reddit_utils import fetch_top_from_category
-from tqdm import tqdm
+from .reddit_utils import fetch_top_from_category_range
+from .price_store import load_local_price_csv
 
 def get_YFin_data_window(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -18,8 +19,8 @@ def get_YFin_data_window(
     before = date_obj - relativedelta(days=look_back_days)
     start_date = before.strftime("%Y-%m-%d")
 
-    # read in data
-    data = pd.read_csv(
+    # read in data (parsed once per process and shared across calls)
+    data = load_local_price_csv(
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
@@ -27,15 +28,10 @@ def get_YFin_data_window(
     )
 
     # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    date_only = data["Date"].str[:10]
 
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= curr_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = data[(date_only >= start_date) & (date_only <= curr_date)]
 
     # Set pandas display options to show the full DataFrame
     with pd.option_context(
@@ -53,8 +49,8 @@ def get_YFin_data(
     start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
     end_date: Annotated[str, "End date in yyyy-mm-dd format"],
 ) -> str:
-    # read in data
-    data = pd.read_csv(
+    # read in data (parsed once per process and shared across calls)
+    data = load_local_price_csv(
         os.path.join(
             DATA_DIR,
             f"market_data/price_data/{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
@@ -67,15 +63,10 @@ def get_YFin_data(
         )
 
     # Extract just the date part for comparison
-    data["DateOnly"] = data["Date"].str[:10]
+    date_only = data["Date"].str[:10]
 
     # Filter data between the start and end dates (inclusive)
-    filtered_data = data[
-        (data["DateOnly"] >= start_date) & (data["DateOnly"] <= end_date)
-    ]
-
-    # Drop the temporary column we created
-    filtered_data = filtered_data.drop("DateOnly", axis=1)
+    filtered_data = data[(date_only >= start_date) & (date_only <= end_date)]
 
     # remove the index from the dataframe
     filtered_data = filtered_data.reset_index(drop=True)
@@ -224,43 +215,122 @@ def get_data_in_range(ticker, start_date, end_date, data_type, data_dir, period=
             filtered_data[key] = value
     return filtered_data
 
-def get_simfin_balance_sheet(
-    ticker: Annotated[str, "ticker symbol"],
-    freq: Annotated[
-        str,
-        "reporting frequency of the company's financial history: annual / quarterly",
-    ],
-    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
-):
-    data_path = os.path.join(
+
+# SimFin statement folders and file prefixes, keyed by statement type
+SIMFIN_STATEMENTS = {
+    "balance_sheet": ("balance_sheet", "us-balance"),
+    "cashflow": ("cash_flow", "us-cashflow"),
+    "income": ("income_statements", "us-income"),
+}
+
+_simfin_tables = {}
+_simfin_guard = threading.Lock()
+
+
+def _read_simfin_csv(csv_path: str, mtime: float) -> pd.DataFrame:
+    """
+    Parse a SimFin CSV into a frame sorted by (Ticker, Publish Date).
+
+    The parsed frame is also pickled under <data_cache_dir>/simfin so later
+    processes skip the CSV parse until the source file changes.
+    """
+    cache_dir = os.path.join(get_config()["data_cache_dir"], "simfin")
+    cache_path = os.path.join(cache_dir, os.path.basename(csv_path) + ".pkl")
+    if os.path.exists(cache_path):
+        cached = pd.read_pickle(cache_path)
+        if cached.get("mtime") == mtime:
+            return cached["frame"]
+
+    df = pd.read_csv(csv_path, sep=";")
+
+    # Convert date strings to datetime objects and remove any time components
+    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
+    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+    # Rows without a ticker or publish date can never match a lookup. The rest
+    # keep their original labels; a stable sort keeps file order within ties
+    df = df[df["Ticker"].notna() & df["Publish Date"].notna()]
+    df = df.sort_values(["Ticker", "Publish Date"], kind="mergesort")
+
+    os.makedirs(cache_dir, exist_ok=True)
+    tmp_path = cache_path + ".tmp"
+    pd.to_pickle({"mtime": mtime, "frame": df}, tmp_path)
+    os.replace(tmp_path, cache_path)
+    return df
+
+
+def _load_simfin_table(statement: str, freq: str):
+    """
+    Return (frame, tickers, publish_ns) for a statement, loaded once per process.
+
+    tickers and publish_ns are the sorted Ticker column and the Publish Date
+    column as int64 nanoseconds, ready for binary search.
+    """
+    folder, prefix = SIMFIN_STATEMENTS[statement]
+    csv_path = os.path.join(
         DATA_DIR,
         "fundamental_data",
         "simfin_data_all",
-        "balance_sheet",
+        folder,
         "companies",
         "us",
-        f"us-balance-{freq}.csv",
+        f"{prefix}-{freq}.csv",
     )
-    df = pd.read_csv(data_path, sep=";")
+    mtime = os.path.getmtime(csv_path)
+
+    with _simfin_guard:
+        cached = _simfin_tables.get(csv_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+
+        df = _read_simfin_csv(csv_path, mtime)
+        table = (
+            df,
+            df["Ticker"].astype(str).to_numpy(),
+            pd.DatetimeIndex(df["Publish Date"]).asi8,
+        )
+        _simfin_tables[csv_path] = (mtime, table)
+        return table
 
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
+
+def _latest_simfin_report(statement: str, ticker: str, freq: str, curr_date: str):
+    """
+    Latest report for a ticker published on or before curr_date, or None.
+
+    Both the ticker and the publish date are located by binary search.
+    """
+    df, tickers, publish_ns = _load_simfin_table(statement, freq)
 
     # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
+    curr_date_ns = pd.to_datetime(curr_date, utc=True).normalize().value
+
+    start = tickers.searchsorted(ticker, side="left")
+    stop = tickers.searchsorted(ticker, side="right")
+    end = start + publish_ns[start:stop].searchsorted(curr_date_ns, side="right")
+    if end == start:
+        return None
+
+    # Among reports sharing the latest Publish Date, take the first one in file order
+    first = start + publish_ns[start:end].searchsorted(publish_ns[end - 1], side="left")
+    return df.iloc[first]
 
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+
+def get_simfin_balance_sheet(
+    ticker: Annotated[str, "ticker symbol"],
+    freq: Annotated[
+        str,
+        "reporting frequency of the company's financial history: annual / quarterly",
+    ],
+    curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
+):
+    # Point-in-time lookup in the preloaded, ticker-sorted table
+    latest_balance_sheet = _latest_simfin_report("balance_sheet", ticker, freq, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_balance_sheet is None:
         print("No balance sheet available before the given current date.")
         return ""
 
-    # Get the most recent balance sheet by selecting the row with the latest Publish Date
-    latest_balance_sheet = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_balance_sheet = latest_balance_sheet.drop("SimFinId")
 
@@ -279,35 +349,14 @@ def get_simfin_cashflow(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "cash_flow",
-        "companies",
-        "us",
-        f"us-cashflow-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Point-in-time lookup in the preloaded, ticker-sorted table
+    latest_cash_flow = _latest_simfin_report("cashflow", ticker, freq, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_cash_flow is None:
         print("No cash flow statement available before the given current date.")
         return ""
 
-    # Get the most recent cash flow statement by selecting the row with the latest Publish Date
-    latest_cash_flow = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_cash_flow = latest_cash_flow.drop("SimFinId")
 
@@ -326,35 +375,14 @@ def get_simfin_income_statements(
     ],
     curr_date: Annotated[str, "current date you are trading at, yyyy-mm-dd"],
 ):
-    data_path = os.path.join(
-        DATA_DIR,
-        "fundamental_data",
-        "simfin_data_all",
-        "income_statements",
-        "companies",
-        "us",
-        f"us-income-{freq}.csv",
-    )
-    df = pd.read_csv(data_path, sep=";")
-
-    # Convert date strings to datetime objects and remove any time components
-    df["Report Date"] = pd.to_datetime(df["Report Date"], utc=True).dt.normalize()
-    df["Publish Date"] = pd.to_datetime(df["Publish Date"], utc=True).dt.normalize()
-
-    # Convert the current date to datetime and normalize
-    curr_date_dt = pd.to_datetime(curr_date, utc=True).normalize()
-
-    # Filter the DataFrame for the given ticker and for reports that were published on or before the current date
-    filtered_df = df[(df["Ticker"] == ticker) & (df["Publish Date"] <= curr_date_dt)]
+    # Point-in-time lookup in the preloaded, ticker-sorted table
+    latest_income = _latest_simfin_report("income", ticker, freq, curr_date)
 
     # Check if there are any available reports; if not, return a notification
-    if filtered_df.empty:
+    if latest_income is None:
         print("No income statement available before the given current date.")
         return ""
 
-    # Get the most recent income statement by selecting the row with the latest Publish Date
-    latest_income = filtered_df.loc[filtered_df["Publish Date"].idxmax()]
-
     # drop the SimFinID column
     latest_income = latest_income.drop("SimFinId")
 
@@ -384,26 +412,14 @@ def get_reddit_global_news(
     before = curr_date_dt - relativedelta(days=look_back_days)
     before = before.strftime("%Y-%m-%d")
 
-    posts = []
-    # iterate from before to curr_date
-    curr_iter_date = datetime.strptime(before, "%Y-%m-%d")
-
-    total_iterations = (curr_date_dt - curr_iter_date).days + 1
-    pbar = tqdm(desc=f"Getting Global News on {curr_date}", total=total_iterations)
-
-    while curr_iter_date <= curr_date_dt:
-        curr_date_str = curr_iter_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "global_news",
-            curr_date_str,
-            limit,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_iter_date += relativedelta(days=1)
-        pbar.update(1)
-
-    pbar.close()
+    # One indexed range query instead of a corpus scan per day
+    posts = fetch_top_from_category_range(
+        "global_news",
+        before,
+        curr_date,
+        limit,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
+    )
 
     if len(posts) == 0:
         return ""
@@ -433,35 +449,19 @@ def get_reddit_company_news(
         str: A formatted string containing news articles posts on reddit
     """
 
-    start_date_dt = datetime.strptime(start_date, "%Y-%m-%d")
-    end_date_dt = datetime.strptime(end_date, "%Y-%m-%d")
-
-    posts = []
-    # iterate from start_date to end_date
-    curr_date = start_date_dt
-
-    total_iterations = (end_date_dt - curr_date).days + 1
-    pbar = tqdm(
-        desc=f"Getting Company News for {query} from {start_date} to {end_date}",
-        total=total_iterations,
+    datetime.strptime(start_date, "%Y-%m-%d")
+    datetime.strptime(end_date, "%Y-%m-%d")
+
+    # One indexed range query instead of a corpus scan per day
+    posts = fetch_top_from_category_range(
+        "company_news",
+        start_date,
+        end_date,
+        10,  # max limit per day
+        query,
+        data_path=os.path.join(DATA_DIR, "reddit_data"),
     )
 
-    while curr_date <= end_date_dt:
-        curr_date_str = curr_date.strftime("%Y-%m-%d")
-        fetch_result = fetch_top_from_category(
-            "company_news",
-            curr_date_str,
-            10,  # max limit per day
-            query,
-            data_path=os.path.join(DATA_DIR, "reddit_data"),
-        )
-        posts.extend(fetch_result)
-        curr_date += relativedelta(days=1)
-
-        pbar.update(1)
-
-    pbar.close()
-
     if len(posts) == 0:
         return ""
 
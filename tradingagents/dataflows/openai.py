@@ -1,10 +1,13 @@
 from openai import OpenAI
-from .config import get_config
+from .config import get_config, get_config_section
 
 
 def get_stock_news_openai(query, start_date, end_date):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(
+        base_url=config["backend_url"],
+        timeout=get_config_section("vendor_routing")["request_timeout"],
+    )
 
     response = client.responses.create(
         model=config["quick_think_llm"],
@@ -39,7 +42,10 @@ def get_stock_news_openai(query, start_date, end_date):
 
 def get_global_news_openai(curr_date, look_back_days=7, limit=5):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(
+        base_url=config["backend_url"],
+        timeout=get_config_section("vendor_routing")["request_timeout"],
+    )
 
     response = client.responses.create(
         model=config["quick_think_llm"],
@@ -74,7 +80,10 @@ def get_global_news_openai(curr_date, look_back_days=7, limit=5):
 
 def get_fundamentals_openai(ticker, curr_date):
     config = get_config()
-    client = OpenAI(base_url=config["backend_url"])
+    client = OpenAI(
+        base_url=config["backend_url"],
+        timeout=get_config_section("vendor_routing")["request_timeout"],
+    )
 
     response = client.responses.create(
         model=config["quick_think_llm"],
@@ -0,0 +1,230 @@
+"""Persistent per-symbol OHLCV store.
+
+Each symbol keeps one pickled DataFrame under ``<data_cache_dir>/price_store``
+plus a small JSON sidecar recording the last day it was refreshed. Refreshing
+only downloads the bars from the last settled stored one on, so a symbol costs at most
+one (small) download per day no matter how many tools read it.
+
+On top of that, every full daily frame served in this process is kept in
+memory keyed by (symbol, adjustment), so stock data and indicator tools of any
+vendor slice one shared DataFrame instead of loading the series again.
+"""
+import json
+import os
+import threading
+from typing import Annotated, Callable, Dict, Optional, Tuple
+
+import pandas as pd
+import yfinance as yf
+
+from .config import get_config, get_config_section
+
+# How much history a freshly created symbol is seeded with
+STORE_HISTORY_YEARS = 15
+
+# Adjustment key of the Yahoo Finance bars in the persistent store (auto_adjust=True)
+YFINANCE_ADJUSTMENT = "yfinance_auto_adjust"
+
+_symbol_locks: Dict[str, threading.Lock] = {}
+_symbol_locks_guard = threading.Lock()
+
+_local_csv_frames: Dict[str, tuple] = {}
+_local_csv_guard = threading.Lock()
+
+# (symbol, adjustment) -> (day loaded, full daily frame)
+_price_frames: Dict[Tuple[str, str], Tuple[str, pd.DataFrame]] = {}
+
+
+def _symbol_lock(symbol: str) -> threading.Lock:
+    with _symbol_locks_guard:
+        if symbol not in _symbol_locks:
+            _symbol_locks[symbol] = threading.Lock()
+        return _symbol_locks[symbol]
+
+
+def _store_dir() -> str:
+    store_dir = os.path.join(get_config()["data_cache_dir"], "price_store")
+    os.makedirs(store_dir, exist_ok=True)
+    return store_dir
+
+
+def _frame_path(symbol: str) -> str:
+    return os.path.join(_store_dir(), f"{symbol}.pkl")
+
+
+def _meta_path(symbol: str) -> str:
+    return os.path.join(_store_dir(), f"{symbol}.json")
+
+
+def _download(symbol: str, start: pd.Timestamp, end: pd.Timestamp) -> pd.DataFrame:
+    """Fetch adjusted daily bars in [start, end) from Yahoo Finance."""
+    data = yf.Ticker(symbol).history(
+        start=start.strftime("%Y-%m-%d"),
+        end=end.strftime("%Y-%m-%d"),
+        auto_adjust=True,
+        timeout=get_config_section("vendor_routing")["request_timeout"],
+    )
+    if data.index.tz is not None:
+        data.index = data.index.tz_localize(None)
+    data.index = data.index.normalize()
+    data.index.name = "Date"
+    return data
+
+
+def _read_store(symbol: str):
+    frame_path = _frame_path(symbol)
+    meta_path = _meta_path(symbol)
+    if not (os.path.exists(frame_path) and os.path.exists(meta_path)):
+        return None, None
+    with open(meta_path, "r") as f:
+        meta = json.load(f)
+    return pd.read_pickle(frame_path), meta
+
+
+def _write_store(symbol: str, data: pd.DataFrame, checked_on: str) -> None:
+    frame_path = _frame_path(symbol)
+    tmp_path = frame_path + ".tmp"
+    data.to_pickle(tmp_path)
+    os.replace(tmp_path, frame_path)
+    with open(_meta_path(symbol), "w") as f:
+        json.dump({"checked_on": checked_on, "last_bar": str(data.index.max())[:10]}, f)
+
+
+def get_price_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    adjustment: Annotated[str, "vendor / price adjustment the frame holds"],
+    loader: Callable[[str], pd.DataFrame],
+) -> pd.DataFrame:
+    """
+    Return the full daily frame for (symbol, adjustment) from the in-process
+    registry, calling ``loader(symbol)`` at most once a day per key.
+
+    ``loader`` must return a frame indexed by ascending tz-naive dates. Empty
+    frames are not kept. Callers must not modify the returned frame in place.
+    """
+    key = (symbol.upper(), adjustment)
+    today_str = pd.Timestamp.today().strftime("%Y-%m-%d")
+
+    with _symbol_lock(f"{adjustment}:{key[0]}"):
+        cached = _price_frames.get(key)
+        if cached is not None and cached[0] == today_str:
+            return cached[1]
+
+        data = loader(symbol)
+        if not data.empty:
+            _price_frames[key] = (today_str, data)
+        return data
+
+
+def slice_price_frame(
+    data: pd.DataFrame,
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    inclusive_end: bool = True,
+) -> pd.DataFrame:
+    """Return the rows of a date-indexed frame between start_date and end_date."""
+    if data.empty:
+        return data
+    left = data.index.searchsorted(pd.Timestamp(start_date), side="left")
+    right = data.index.searchsorted(
+        pd.Timestamp(end_date), side="right" if inclusive_end else "left"
+    )
+    return data.iloc[left:right]
+
+
+def clear_price_frames(symbol: Optional[str] = None) -> None:
+    """Drop in-memory frames (of one symbol, or all of them)."""
+    for key in list(_price_frames):
+        if symbol is None or key[0] == symbol.upper():
+            _price_frames.pop(key, None)
+
+
+def get_price_history(
+    symbol: Annotated[str, "ticker symbol of the company"],
+) -> pd.DataFrame:
+    """
+    Return the full stored daily history for a symbol, refreshing it first if
+    it has not been checked today.
+
+    Returns:
+        DataFrame indexed by a tz-naive ``Date`` with Open, High, Low, Close,
+        Volume (and Dividends / Stock Splits) columns, adjusted for splits and
+        dividends.
+    """
+    return get_price_frame(symbol, YFINANCE_ADJUSTMENT, _load_stored_history)
+
+
+def _load_stored_history(symbol: str) -> pd.DataFrame:
+    """Read the persistent store for a symbol, refreshing it if not checked today."""
+    symbol = symbol.upper()
+    today = pd.Timestamp.today().normalize()
+    today_str = today.strftime("%Y-%m-%d")
+
+    with _symbol_lock(symbol):
+        stored, meta = _read_store(symbol)
+        if stored is not None and meta.get("checked_on") == today_str:
+            return stored
+
+        tomorrow = today + pd.DateOffset(days=1)
+        if stored is None or stored.empty:
+            data = _download(
+                symbol, today - pd.DateOffset(years=STORE_HISTORY_YEARS), tomorrow
+            )
+        else:
+            # The newest stored bar may have been written while its session was
+            # still trading, so it is re-downloaded but never compared; the
+            # re-basing check uses the settled bar before it.
+            settled_bar = stored.index[-2] if len(stored) > 1 else None
+            since = stored.index[-1] if settled_bar is None else settled_bar
+            try:
+                fresh = _download(symbol, since, tomorrow)
+            except Exception as e:
+                print(f"WARNING: Could not refresh stored prices for {symbol}, serving cached bars: {e}")
+                return stored
+            overlap_moved = (
+                settled_bar is not None
+                and settled_bar in fresh.index
+                and abs(fresh.loc[settled_bar, "Close"] - stored.loc[settled_bar, "Close"])
+                > 1e-6 * max(abs(stored.loc[settled_bar, "Close"]), 1.0)
+            )
+            if overlap_moved:
+                # A split or dividend re-based the adjusted series; reseed it
+                data = _download(
+                    symbol, today - pd.DateOffset(years=STORE_HISTORY_YEARS), tomorrow
+                )
+            else:
+                data = pd.concat([stored, fresh])
+                data = data[~data.index.duplicated(keep="last")].sort_index()
+
+        if not data.empty:
+            _write_store(symbol, data, today_str)
+        return data
+
+
+def get_price_window(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    start_date: Annotated[str, "Start date in yyyy-mm-dd format"],
+    end_date: Annotated[str, "End date in yyyy-mm-dd format"],
+    inclusive_end: bool = True,
+) -> pd.DataFrame:
+    """Return the stored bars between start_date and end_date."""
+    return slice_price_frame(
+        get_price_history(symbol), start_date, end_date, inclusive_end
+    )
+
+
+def load_local_price_csv(path: str) -> pd.DataFrame:
+    """
+    Read one of the bundled ``*-YFin-data-*.csv`` files once per process.
+
+    The parsed frame is reused until the file changes on disk. Callers must
+    not modify the returned frame in place.
+    """
+    mtime = os.path.getmtime(path)
+    with _local_csv_guard:
+        cached = _local_csv_frames.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        data = pd.read_csv(path)
+        _local_csv_frames[path] = (mtime, data)
+        return data
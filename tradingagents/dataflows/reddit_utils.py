@@ -6,6 +6,10 @@ from contextlib import contextmanager
 from typing import Annotated
 import os
 import re
+import sqlite3
+import hashlib
+import threading
+from .config import get_config
 
 ticker_to_company = {
     "AAPL": "Apple",
@@ -49,87 +53,293 @@ ticker_to_company = {
 }
 
 
-def fetch_top_from_category(
+# Bump when the index layout changes so stale indexes are rebuilt
+REDDIT_INDEX_VERSION = 1
+
+_index_lock = threading.Lock()
+
+
+def _company_pattern(ticker: str):
+    """Case-insensitive pattern matching a ticker or any of its company names."""
+    search_terms = ticker_to_company.get(ticker, "").split(" OR ")
+    search_terms = [term for term in search_terms if term]
+    search_terms.append(ticker)
+    # Terms are regexes, as they always have been for company news filtering
+    return re.compile("|".join(f"(?:{term})" for term in search_terms), re.IGNORECASE)
+
+
+_COMPANY_PATTERNS = {ticker: _company_pattern(ticker) for ticker in ticker_to_company}
+
+
+def _index_path(data_path: str) -> str:
+    cache_dir = get_config()["data_cache_dir"]
+    os.makedirs(cache_dir, exist_ok=True)
+    digest = hashlib.sha1(os.path.abspath(data_path).encode("utf-8")).hexdigest()[:12]
+    return os.path.join(cache_dir, f"reddit_index_{digest}.sqlite3")
+
+
+def _connect(data_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(_index_path(data_path))
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != REDDIT_INDEX_VERSION:
+        conn.executescript(
+            """
+            DROP TABLE IF EXISTS files;
+            DROP TABLE IF EXISTS posts;
+            DROP TABLE IF EXISTS post_tickers;
+            """
+        )
+    conn.executescript(
+        """
+        CREATE TABLE IF NOT EXISTS files (
+            category TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            size INTEGER NOT NULL,
+            mtime REAL NOT NULL,
+            PRIMARY KEY (category, file_name)
+        );
+        CREATE TABLE IF NOT EXISTS posts (
+            id INTEGER PRIMARY KEY,
+            category TEXT NOT NULL,
+            file_name TEXT NOT NULL,
+            line_no INTEGER NOT NULL,
+            post_date TEXT NOT NULL,
+            upvotes INTEGER NOT NULL,
+            title TEXT NOT NULL,
+            content TEXT NOT NULL,
+            url TEXT
+        );
+        -- Date partition with the per-subreddit upvote order precomputed
+        CREATE INDEX IF NOT EXISTS posts_by_day
+            ON posts (category, post_date, file_name, upvotes DESC, line_no);
+        CREATE TABLE IF NOT EXISTS post_tickers (
+            ticker TEXT NOT NULL,
+            post_id INTEGER NOT NULL,
+            PRIMARY KEY (ticker, post_id)
+        ) WITHOUT ROWID;
+        """
+    )
+    conn.execute(f"PRAGMA user_version = {REDDIT_INDEX_VERSION}")
+    return conn
+
+
+def _index_file(conn: sqlite3.Connection, category: str, file_name: str, file_path: str):
+    conn.execute(
+        "DELETE FROM post_tickers WHERE post_id IN "
+        "(SELECT id FROM posts WHERE category = ? AND file_name = ?)",
+        (category, file_name),
+    )
+    conn.execute(
+        "DELETE FROM posts WHERE category = ? AND file_name = ?", (category, file_name)
+    )
+
+    tag_tickers = "company" in category
+    with open(file_path, "rb") as f:
+        for line_no, line in enumerate(f):
+            # skip empty lines
+            if not line.strip():
+                continue
+
+            parsed_line = json.loads(line)
+            post_date = datetime.utcfromtimestamp(parsed_line["created_utc"]).strftime(
+                "%Y-%m-%d"
+            )
+            cursor = conn.execute(
+                "INSERT INTO posts (category, file_name, line_no, post_date, upvotes, title, content, url)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    category,
+                    file_name,
+                    line_no,
+                    post_date,
+                    parsed_line["ups"],
+                    parsed_line["title"],
+                    parsed_line["selftext"],
+                    parsed_line["url"],
+                ),
+            )
+
+            if tag_tickers:
+                conn.executemany(
+                    "INSERT INTO post_tickers (ticker, post_id) VALUES (?, ?)",
+                    [
+                        (ticker, cursor.lastrowid)
+                        for ticker, pattern in _COMPANY_PATTERNS.items()
+                        if pattern.search(parsed_line["title"])
+                        or pattern.search(parsed_line["selftext"])
+                    ],
+                )
+
+
+def build_reddit_index(
+    data_path: Annotated[str, "Path to the reddit data folder"],
+    categories: Annotated[list, "Categories to index; default is every category folder"] = None,
+) -> None:
+    """
+    Index the reddit JSONL dumps into a date-partitioned, ticker-tagged SQLite file.
+
+    Only files that are new or changed since the last run are (re)parsed, so
+    this is cheap to call before every query.
+    """
+    if categories is None:
+        categories = [
+            name
+            for name in sorted(os.listdir(data_path))
+            if os.path.isdir(os.path.join(data_path, name))
+        ]
+
+    with _index_lock:
+        conn = _connect(data_path)
+        try:
+            for category in categories:
+                category_path = os.path.join(data_path, category)
+                on_disk = {}
+                for file_name in os.listdir(category_path):
+                    if file_name.endswith(".jsonl"):
+                        stat = os.stat(os.path.join(category_path, file_name))
+                        on_disk[file_name] = (stat.st_size, stat.st_mtime)
+
+                indexed = {
+                    row[0]: (row[1], row[2])
+                    for row in conn.execute(
+                        "SELECT file_name, size, mtime FROM files WHERE category = ?",
+                        (category,),
+                    )
+                }
+
+                for file_name in indexed.keys() - on_disk.keys():
+                    conn.execute(
+                        "DELETE FROM post_tickers WHERE post_id IN "
+                        "(SELECT id FROM posts WHERE category = ? AND file_name = ?)",
+                        (category, file_name),
+                    )
+                    conn.execute(
+                        "DELETE FROM posts WHERE category = ? AND file_name = ?",
+                        (category, file_name),
+                    )
+                    conn.execute(
+                        "DELETE FROM files WHERE category = ? AND file_name = ?",
+                        (category, file_name),
+                    )
+
+                for file_name, (size, mtime) in sorted(on_disk.items()):
+                    if indexed.get(file_name) == (size, mtime):
+                        continue
+                    print(f"DEBUG: Indexing reddit file {category}/{file_name}")
+                    _index_file(
+                        conn, category, file_name, os.path.join(category_path, file_name)
+                    )
+                    conn.execute(
+                        "INSERT OR REPLACE INTO files (category, file_name, size, mtime) VALUES (?, ?, ?, ?)",
+                        (category, file_name, size, mtime),
+                    )
+                conn.commit()
+        finally:
+            conn.close()
+
+
+def fetch_top_from_category_range(
     category: Annotated[
         str, "Category to fetch top post from. Collection of subreddits."
     ],
-    date: Annotated[str, "Date to fetch top posts from."],
-    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    start_date: Annotated[str, "First date to fetch top posts from, yyyy-mm-dd."],
+    end_date: Annotated[str, "Last date to fetch top posts from, yyyy-mm-dd."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch per day."],
     query: Annotated[str, "Optional query to search for in the subreddit."] = None,
     data_path: Annotated[
         str,
         "Path to the data folder. Default is 'reddit_data'.",
     ] = "reddit_data",
 ):
-    base_path = data_path
+    """
+    Top posts for every day in [start_date, end_date] from the reddit index.
 
-    all_content = []
-
-    if max_limit < len(os.listdir(os.path.join(base_path, category))):
+    Each day keeps the top max_limit // <files in category> posts per
+    subreddit by upvotes, ordered by day, then subreddit, then upvotes.
+    """
+    category_files = os.listdir(os.path.join(data_path, category))
+    if max_limit < len(category_files):
         raise ValueError(
             "REDDIT FETCHING ERROR: max limit is less than the number of files in the category. Will not be able to fetch any posts"
         )
+    limit_per_subreddit = max_limit // len(category_files)
+
+    build_reddit_index(data_path, [category])
 
-    limit_per_subreddit = max_limit // len(
-        os.listdir(os.path.join(base_path, category))
+    filter_by_company = "company" in category and query
+    # Tagged tickers are resolved by the index; anything else is matched at
+    # read time, over the requested days only
+    pattern = (
+        _company_pattern(query)
+        if filter_by_company and query not in _COMPANY_PATTERNS
+        else None
     )
 
-    for data_file in os.listdir(os.path.join(base_path, category)):
-        # check if data_file is a .jsonl file
-        if not data_file.endswith(".jsonl"):
-            continue
-
-        all_content_curr_subreddit = []
-
-        with open(os.path.join(base_path, category, data_file), "rb") as f:
-            for i, line in enumerate(f):
-                # skip empty lines
-                if not line.strip():
-                    continue
-
-                parsed_line = json.loads(line)
-
-                # select only lines that are from the date
-                post_date = datetime.utcfromtimestamp(
-                    parsed_line["created_utc"]
-                ).strftime("%Y-%m-%d")
-                if post_date != date:
-                    continue
-
-                # if is company_news, check that the title or the content has the company's name (query) mentioned
-                if "company" in category and query:
-                    search_terms = []
-                    if "OR" in ticker_to_company[query]:
-                        search_terms = ticker_to_company[query].split(" OR ")
-                    else:
-                        search_terms = [ticker_to_company[query]]
-
-                    search_terms.append(query)
-
-                    found = False
-                    for term in search_terms:
-                        if re.search(
-                            term, parsed_line["title"], re.IGNORECASE
-                        ) or re.search(term, parsed_line["selftext"], re.IGNORECASE):
-                            found = True
-                            break
-
-                    if not found:
-                        continue
+    sql = "SELECT p.post_date, p.file_name, p.upvotes, p.title, p.content, p.url FROM posts p"
+    params = []
+    if filter_by_company and pattern is None:
+        sql += " JOIN post_tickers t ON t.post_id = p.id AND t.ticker = ?"
+        params.append(query)
+    sql += " WHERE p.category = ? AND p.post_date BETWEEN ? AND ?"
+    params.extend([category, start_date, end_date])
 
-                post = {
-                    "title": parsed_line["title"],
-                    "content": parsed_line["selftext"],
-                    "url": parsed_line["url"],
-                    "upvotes": parsed_line["ups"],
-                    "posted_date": post_date,
-                }
+    if pattern is None:
+        # Let SQLite keep the top posts of each day and subreddit
+        sql = (
+            "SELECT post_date, file_name, upvotes, title, content, url FROM ("
+            " SELECT p.post_date, p.file_name, p.upvotes, p.title, p.content, p.url,"
+            " ROW_NUMBER() OVER (PARTITION BY p.post_date, p.file_name"
+            " ORDER BY p.upvotes DESC, p.line_no) AS rank"
+            + sql[sql.index(" FROM posts p"):]
+            + ") WHERE rank <= ? ORDER BY post_date, file_name, rank"
+        )
+        params.append(limit_per_subreddit)
+    else:
+        sql += " ORDER BY p.post_date, p.file_name, p.upvotes DESC, p.line_no"
 
-                all_content_curr_subreddit.append(post)
+    conn = sqlite3.connect(_index_path(data_path))
+    try:
+        rows = conn.execute(sql, params).fetchall()
+    finally:
+        conn.close()
 
-        # sort all_content_curr_subreddit by upvote_ratio in descending order
-        all_content_curr_subreddit.sort(key=lambda x: x["upvotes"], reverse=True)
+    all_content = []
+    kept_per_subreddit = {}
+    for post_date, file_name, upvotes, title, content, url in rows:
+        if pattern is not None:
+            if not (pattern.search(title) or pattern.search(content)):
+                continue
+            kept = kept_per_subreddit.get((post_date, file_name), 0)
+            if kept >= limit_per_subreddit:
+                continue
+            kept_per_subreddit[(post_date, file_name)] = kept + 1
 
-        all_content.extend(all_content_curr_subreddit[:limit_per_subreddit])
+        all_content.append(
+            {
+                "title": title,
+                "content": content,
+                "url": url,
+                "upvotes": upvotes,
+                "posted_date": post_date,
+            }
+        )
 
     return all_content
+
+
+def fetch_top_from_category(
+    category: Annotated[
+        str, "Category to fetch top post from. Collection of subreddits."
+    ],
+    date: Annotated[str, "Date to fetch top posts from."],
+    max_limit: Annotated[int, "Maximum number of posts to fetch."],
+    query: Annotated[str, "Optional query to search for in the subreddit."] = None,
+    data_path: Annotated[
+        str,
+        "Path to the data folder. Default is 'reddit_data'.",
+    ] = "reddit_data",
+):
+    """Top posts of a single day; see fetch_top_from_category_range."""
+    return fetch_top_from_category_range(
+        category, date, date, max_limit, query, data_path=data_path
+    )
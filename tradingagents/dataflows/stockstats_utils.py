@@ -1,82 +1,100 @@
+import numpy as np
 import pandas as pd
-import yfinance as yf
 from stockstats import wrap
 from typing import Annotated
 import os
 from .config import get_config, DATA_DIR
+from .price_store import get_price_history, load_local_price_csv
 
 
 class StockstatsUtils:
     @staticmethod
-    def get_stock_stats(
+    def get_stock_stats_series(
         symbol: Annotated[str, "ticker symbol for the company"],
         indicator: Annotated[
             str, "quantitative indicators based off of the stock data for the company"
         ],
-        curr_date: Annotated[
-            str, "curr date for retrieving stock price data, YYYY-mm-dd"
-        ],
-    ):
+    ) -> pd.Series:
+        """
+        Load the price data once and compute an indicator for every available day.
+
+        Returns:
+            pd.Series of raw indicator values indexed by ascending YYYY-mm-dd strings
+        """
         # Get config and set up data directory path
         config = get_config()
         online = config["data_vendors"]["technical_indicators"] != "local"
 
-        df = None
-        data = None
-
         if not online:
             try:
-                data = pd.read_csv(
+                data = load_local_price_csv(
                     os.path.join(
                         DATA_DIR,
                         f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                     )
                 )
-                df = wrap(data)
+                df = wrap(data.copy())
             except FileNotFoundError:
                 raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
         else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
+            # Served from the persistent price store, refreshed at most once a day
+            data = get_price_history(symbol).reset_index()
 
             df = wrap(data)
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
 
-        df[indicator]  # trigger stockstats to calculate the indicator
-        matching_rows = df[df["Date"].str.startswith(curr_date)]
+        return indicator_series(df, indicator)
 
-        if not matching_rows.empty:
-            indicator_value = matching_rows[indicator].values[0]
-            return indicator_value
+    @staticmethod
+    def get_stock_stats(
+        symbol: Annotated[str, "ticker symbol for the company"],
+        indicator: Annotated[
+            str, "quantitative indicators based off of the stock data for the company"
+        ],
+        curr_date: Annotated[
+            str, "curr date for retrieving stock price data, YYYY-mm-dd"
+        ],
+    ):
+        series = StockstatsUtils.get_stock_stats_series(symbol, indicator)
+        curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
+
+        if curr_date in series.index:
+            return series[curr_date]
         else:
             return "N/A: Not a trading day (weekend or holiday)"
+
+
+def indicator_series(df, indicator: str) -> pd.Series:
+    """Compute an indicator on a wrapped frame and index it by date string."""
+    values = df[indicator]  # trigger stockstats to calculate the indicator
+    dates = pd.Index(df["Date"].astype(str).str[:10])
+
+    series = pd.Series(values.to_numpy(), index=dates)
+    # Keep the last row for a repeated date, and make the index sliceable
+    series = series[~series.index.duplicated(keep="last")]
+    return series.sort_index()
+
+
+def format_indicator_window(
+    series: pd.Series, start_date: str, end_date: str
+) -> str:
+    """
+    Render one "date: value" line per calendar day from end_date back to start_date.
+
+    Only the requested slice of the series is touched, so the cost depends on
+    the window length rather than on the length of the price history.
+    """
+    window_dates = pd.date_range(start_date, end_date, freq="D")[::-1].strftime(
+        "%Y-%m-%d"
+    )
+    window = series.loc[start_date:end_date].reindex(window_dates)
+
+    traded = window_dates.isin(series.index)
+    missing_value = window.isna().to_numpy()
+    text = np.where(
+        ~traded,
+        "N/A: Not a trading day (weekend or holiday)",
+        np.where(missing_value, "N/A", window.astype(str).to_numpy()),
+    )
+
+    return "".join(f"{date_str}: {value}\n" for date_str, value in zip(window_dates, text))
@@ -0,0 +1,267 @@
+"""Two-tier cache for vendor tool results.
+
+Results are keyed by (method, vendor, args). An in-process LRU answers repeat
+calls within a run (e.g. the Social and News analysts both calling get_news),
+and a SQLite file under ``<data_cache_dir>`` keeps them across runs. Entries
+expire per data category; requests that only cover closed past dates can be
+kept longer (or forever) since the data behind them no longer changes, but
+only when the result actually holds dated values.
+"""
+import hashlib
+import json
+import os
+import pickle
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from .config import get_config, get_config_section
+
+_DATE_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}")
+
+# First lines vendors use to report a failure or an empty answer as text
+_FAILURE_PATTERN = re.compile(
+    r"^\s*(error|failed|no data|no .* found|获取.*(出错|失败)|未找到)", re.IGNORECASE
+)
+
+# A "date, value" / "date: value" row with a real number, as in the CSV and
+# indicator outputs (an "N/A" row does not count)
+_DATED_VALUE_PATTERN = re.compile(
+    r"^\s*(\d+\s+)?\d{4}-\d{2}-\d{2}[ T\d:]*[,:\t ]\s*-?\d", re.MULTILINE
+)
+
+_MISSING = object()
+
+
+def _latest_requested_date(args, kwargs) -> Optional[str]:
+    """Return the latest YYYY-mm-dd value among the call arguments, if any."""
+    dates = [
+        value[:10]
+        for value in list(args) + list(kwargs.values())
+        if isinstance(value, str) and _DATE_PATTERN.match(value)
+    ]
+    return max(dates) if dates else None
+
+
+def is_cacheable_result(results: List[Any]) -> bool:
+    """Vendors often report failures as text; never persist those."""
+    if not results:
+        return False
+    for result in results:
+        if result is None:
+            return False
+        if isinstance(result, str) and (
+            not result.strip() or _FAILURE_PATTERN.match(result.strip().splitlines()[0])
+        ):
+            return False
+    return True
+
+
+def has_dated_values(results: List[Any]) -> bool:
+    """Whether every result is text holding at least one dated numeric row."""
+    return bool(results) and all(
+        isinstance(result, str) and _DATED_VALUE_PATTERN.search(result)
+        for result in results
+    )
+
+
+class ToolResultCache:
+    """LRU memory tier in front of a SQLite tier, with hit/miss counters."""
+
+    def __init__(self, db_path: str, memory_entries: int = 512):
+        self.db_path = db_path
+        self.memory_entries = memory_entries
+        self._memory: "OrderedDict[str, Tuple[Optional[float], Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "stores": 0}
+        self._method_stats: Dict[str, Dict[str, int]] = {}
+
+        os.makedirs(os.path.dirname(db_path), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS tool_results ("
+            " key TEXT PRIMARY KEY,"
+            " method TEXT NOT NULL,"
+            " vendor TEXT NOT NULL,"
+            " expires_at REAL,"
+            " value BLOB NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(method: str, vendor: str, args, kwargs) -> str:
+        payload = json.dumps(
+            [method, vendor, list(args), kwargs], sort_keys=True, default=str
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _count(self, method: str, outcome: str) -> None:
+        self._stats[outcome] += 1
+        method_stats = self._method_stats.setdefault(
+            method, {"hits": 0, "misses": 0}
+        )
+        method_stats["misses" if outcome == "misses" else "hits"] += 1
+
+    def get(self, method: str, vendor: str, args, kwargs):
+        """Return the cached vendor results, or None on a miss."""
+        key = self.make_key(method, vendor, args, kwargs)
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key, _MISSING)
+            if entry is not _MISSING:
+                expires_at, value = entry
+                if expires_at is None or expires_at > now:
+                    self._memory.move_to_end(key)
+                    self._count(method, "memory_hits")
+                    return value
+                del self._memory[key]
+
+            if self._conn is None:
+                self._count(method, "misses")
+                return None
+            row = self._conn.execute(
+                "SELECT expires_at, value FROM tool_results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                expires_at, blob = row
+                if expires_at is None or expires_at > now:
+                    value = pickle.loads(blob)
+                    self._remember(key, expires_at, value)
+                    self._count(method, "disk_hits")
+                    return value
+                self._conn.execute("DELETE FROM tool_results WHERE key = ?", (key,))
+                self._conn.commit()
+
+            self._count(method, "misses")
+            return None
+
+    def put(self, method: str, vendor: str, args, kwargs, value, ttl: Optional[float]) -> None:
+        """Store vendor results; ttl is in seconds, None keeps them forever."""
+        if ttl is not None and ttl <= 0:
+            return
+        key = self.make_key(method, vendor, args, kwargs)
+        expires_at = None if ttl is None else time.time() + ttl
+        blob = pickle.dumps(value)
+
+        with self._lock:
+            self._remember(key, expires_at, value)
+            if self._conn is None:
+                return
+            self._conn.execute(
+                "INSERT OR REPLACE INTO tool_results (key, method, vendor, expires_at, value)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, method, vendor, expires_at, blob),
+            )
+            self._conn.commit()
+            self._stats["stores"] += 1
+
+    def _remember(self, key: str, expires_at: Optional[float], value) -> None:
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def clear(self, expired_only: bool = False) -> None:
+        """Drop cached entries (only the expired ones if expired_only)."""
+        with self._lock:
+            if expired_only:
+                now = time.time()
+                self._memory = OrderedDict(
+                    (key, entry)
+                    for key, entry in self._memory.items()
+                    if entry[0] is None or entry[0] > now
+                )
+                if self._conn is None:
+                    return
+                self._conn.execute(
+                    "DELETE FROM tool_results WHERE expires_at IS NOT NULL AND expires_at <= ?",
+                    (now,),
+                )
+            else:
+                self._memory.clear()
+                if self._conn is None:
+                    return
+                self._conn.execute("DELETE FROM tool_results")
+            self._conn.commit()
+
+    def close(self) -> None:
+        """Close the SQLite connection; later calls only use the memory tier."""
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+    def stats(self) -> Dict:
+        """Hit/miss counters since the cache was created, overall and per method."""
+        with self._lock:
+            stats = dict(self._stats)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = (
+                (stats["memory_hits"] + stats["disk_hits"]) / lookups if lookups else 0.0
+            )
+            stats["memory_entries"] = len(self._memory)
+            stats["by_method"] = {
+                method: dict(counts) for method, counts in self._method_stats.items()
+            }
+            return stats
+
+
+_cache: Optional[ToolResultCache] = None
+_cache_guard = threading.Lock()
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """Return the process-wide tool cache, or None if caching is disabled."""
+    global _cache
+    settings = get_config_section("tool_cache")
+    if not settings["enabled"]:
+        return None
+
+    db_path = os.path.join(get_config()["data_cache_dir"], "tool_cache.sqlite3")
+    with _cache_guard:
+        if _cache is None or _cache.db_path != db_path:
+            # Close the old cache, or every data_cache_dir switch leaks a connection
+            if _cache is not None:
+                _cache.close()
+            _cache = ToolResultCache(db_path, settings["memory_entries"])
+        return _cache
+
+
+def tool_cache_ttl(category: str, args, kwargs, results: List[Any]) -> Optional[float]:
+    """
+    Seconds these results may be reused, or None for no expiry.
+
+    A request whose latest date lies before today is "closed" and uses the
+    category's closed_ttl when one is configured. A closed_ttl of None (never
+    expire) only applies to results that hold dated values; anything else,
+    such as an empty window or an unrecognised message, keeps the regular ttl
+    so it gets fetched again.
+    """
+    settings = get_config_section("tool_cache")
+    ttl = settings["ttl"].get(category, settings["ttl"]["default"])
+    latest = _latest_requested_date(args, kwargs)
+    closed_ttl = settings["closed_ttl"]
+    if latest is None or latest >= date.today().isoformat() or category not in closed_ttl:
+        return ttl
+    if closed_ttl[category] is None and not has_dated_values(results):
+        return ttl
+    return closed_ttl[category]
+
+
+def get_tool_cache_stats() -> Dict:
+    """Hit/miss counters of the process-wide tool cache."""
+    cache = get_tool_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def clear_tool_cache(expired_only: bool = False) -> None:
+    """Drop entries from the process-wide tool cache."""
+    cache = get_tool_cache()
+    if cache is not None:
+        cache.clear(expired_only=expired_only)
@@ -3,7 +3,11 @@ from datetime import datetime
 from dateutil.relativedelta import relativedelta
 import yfinance as yf
 import os
-from .stockstats_utils import StockstatsUtils
+import pandas as pd
+from stockstats import wrap
+from .config import get_config
+from .stockstats_utils import StockstatsUtils, indicator_series, format_indicator_window
+from .price_store import get_price_history, load_local_price_csv, get_price_window
 
 def get_YFin_data_online(
     symbol: Annotated[str, "ticker symbol of the company"],
@@ -14,15 +18,15 @@ def get_YFin_data_online(
     datetime.strptime(start_date, "%Y-%m-%d")
     datetime.strptime(end_date, "%Y-%m-%d")
 
-    # Create ticker object
-    ticker = yf.Ticker(symbol.upper())
+    # Fetch historical data for the specified date range from the persistent
+    # price store (end date is exclusive, matching yfinance's history())
+    data = get_price_window(
+        symbol, start_date, end_date, inclusive_end=False
+    ).copy()
 
-    # Fetch historical data for the specified date range
-    data = ticker.history(start=start_date, end=end_date)
-
-    # Check if data is empty
+    # Raise on no data so the router can fall back and the result isn't cached
     if data.empty:
-        return (
+        raise ValueError(
             f"No data found for symbol '{symbol}' between {start_date} and {end_date}"
         )
 
@@ -46,6 +50,82 @@ def get_YFin_data_online(
 
     return header + csv_string
 
+
+# Supported stockstats indicators and the guidance returned alongside their values
+INDICATOR_DESCRIPTIONS = {
+    # Moving Averages
+    "close_50_sma": (
+        "50 SMA: A medium-term trend indicator. "
+        "Usage: Identify trend direction and serve as dynamic support/resistance. "
+        "Tips: It lags price; combine with faster indicators for timely signals."
+    ),
+    "close_200_sma": (
+        "200 SMA: A long-term trend benchmark. "
+        "Usage: Confirm overall market trend and identify golden/death cross setups. "
+        "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
+    ),
+    "close_10_ema": (
+        "10 EMA: A responsive short-term average. "
+        "Usage: Capture quick shifts in momentum and potential entry points. "
+        "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
+    ),
+    # MACD Related
+    "macd": (
+        "MACD: Computes momentum via differences of EMAs. "
+        "Usage: Look for crossovers and divergence as signals of trend changes. "
+        "Tips: Confirm with other indicators in low-volatility or sideways markets."
+    ),
+    "macds": (
+        "MACD Signal: An EMA smoothing of the MACD line. "
+        "Usage: Use crossovers with the MACD line to trigger trades. "
+        "Tips: Should be part of a broader strategy to avoid false positives."
+    ),
+    "macdh": (
+        "MACD Histogram: Shows the gap between the MACD line and its signal. "
+        "Usage: Visualize momentum strength and spot divergence early. "
+        "Tips: Can be volatile; complement with additional filters in fast-moving markets."
+    ),
+    # Momentum Indicators
+    "rsi": (
+        "RSI: Measures momentum to flag overbought/oversold conditions. "
+        "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
+        "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
+    ),
+    # Volatility Indicators
+    "boll": (
+        "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
+        "Usage: Acts as a dynamic benchmark for price movement. "
+        "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
+    ),
+    "boll_ub": (
+        "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
+        "Usage: Signals potential overbought conditions and breakout zones. "
+        "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
+    ),
+    "boll_lb": (
+        "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
+        "Usage: Indicates potential oversold conditions. "
+        "Tips: Use additional analysis to avoid false reversal signals."
+    ),
+    "atr": (
+        "ATR: Averages true range to measure volatility. "
+        "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
+        "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
+    ),
+    # Volume-Based Indicators
+    "vwma": (
+        "VWMA: A moving average weighted by volume. "
+        "Usage: Confirm trends by integrating price action with volume data. "
+        "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
+    ),
+    "mfi": (
+        "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
+        "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
+        "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
+    ),
+}
+
+
 def get_stock_stats_indicators_window(
     symbol: Annotated[str, "ticker symbol of the company"],
     indicator: Annotated[str, "technical indicator to get the analysis and report of"],
@@ -55,216 +135,149 @@ def get_stock_stats_indicators_window(
     look_back_days: Annotated[int, "how many days to look back"],
 ) -> str:
 
-    best_ind_params = {
-        # Moving Averages
-        "close_50_sma": (
-            "50 SMA: A medium-term trend indicator. "
-            "Usage: Identify trend direction and serve as dynamic support/resistance. "
-            "Tips: It lags price; combine with faster indicators for timely signals."
-        ),
-        "close_200_sma": (
-            "200 SMA: A long-term trend benchmark. "
-            "Usage: Confirm overall market trend and identify golden/death cross setups. "
-            "Tips: It reacts slowly; best for strategic trend confirmation rather than frequent trading entries."
-        ),
-        "close_10_ema": (
-            "10 EMA: A responsive short-term average. "
-            "Usage: Capture quick shifts in momentum and potential entry points. "
-            "Tips: Prone to noise in choppy markets; use alongside longer averages for filtering false signals."
-        ),
-        # MACD Related
-        "macd": (
-            "MACD: Computes momentum via differences of EMAs. "
-            "Usage: Look for crossovers and divergence as signals of trend changes. "
-            "Tips: Confirm with other indicators in low-volatility or sideways markets."
-        ),
-        "macds": (
-            "MACD Signal: An EMA smoothing of the MACD line. "
-            "Usage: Use crossovers with the MACD line to trigger trades. "
-            "Tips: Should be part of a broader strategy to avoid false positives."
-        ),
-        "macdh": (
-            "MACD Histogram: Shows the gap between the MACD line and its signal. "
-            "Usage: Visualize momentum strength and spot divergence early. "
-            "Tips: Can be volatile; complement with additional filters in fast-moving markets."
-        ),
-        # Momentum Indicators
-        "rsi": (
-            "RSI: Measures momentum to flag overbought/oversold conditions. "
-            "Usage: Apply 70/30 thresholds and watch for divergence to signal reversals. "
-            "Tips: In strong trends, RSI may remain extreme; always cross-check with trend analysis."
-        ),
-        # Volatility Indicators
-        "boll": (
-            "Bollinger Middle: A 20 SMA serving as the basis for Bollinger Bands. "
-            "Usage: Acts as a dynamic benchmark for price movement. "
-            "Tips: Combine with the upper and lower bands to effectively spot breakouts or reversals."
-        ),
-        "boll_ub": (
-            "Bollinger Upper Band: Typically 2 standard deviations above the middle line. "
-            "Usage: Signals potential overbought conditions and breakout zones. "
-            "Tips: Confirm signals with other tools; prices may ride the band in strong trends."
-        ),
-        "boll_lb": (
-            "Bollinger Lower Band: Typically 2 standard deviations below the middle line. "
-            "Usage: Indicates potential oversold conditions. "
-            "Tips: Use additional analysis to avoid false reversal signals."
-        ),
-        "atr": (
-            "ATR: Averages true range to measure volatility. "
-            "Usage: Set stop-loss levels and adjust position sizes based on current market volatility. "
-            "Tips: It's a reactive measure, so use it as part of a broader risk management strategy."
-        ),
-        # Volume-Based Indicators
-        "vwma": (
-            "VWMA: A moving average weighted by volume. "
-            "Usage: Confirm trends by integrating price action with volume data. "
-            "Tips: Watch for skewed results from volume spikes; use in combination with other volume analyses."
-        ),
-        "mfi": (
-            "MFI: The Money Flow Index is a momentum indicator that uses both price and volume to measure buying and selling pressure. "
-            "Usage: Identify overbought (>80) or oversold (<20) conditions and confirm the strength of trends or reversals. "
-            "Tips: Use alongside RSI or MACD to confirm signals; divergence between price and MFI can indicate potential reversals."
-        ),
-    }
-
-    if indicator not in best_ind_params:
+
+    if indicator not in INDICATOR_DESCRIPTIONS:
         raise ValueError(
-            f"Indicator {indicator} is not supported. Please choose from: {list(best_ind_params.keys())}"
+            f"Indicator {indicator} is not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
         )
 
     end_date = curr_date
     curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
     before = curr_date_dt - relativedelta(days=look_back_days)
 
-    # Optimized: Get stock data once and calculate indicators for all dates
+    start_date = before.strftime("%Y-%m-%d")
+
+    # Optimized: Get stock data once, calculate the indicator for all dates,
+    # then slice and format only the requested window
     try:
         indicator_data = _get_stock_stats_bulk(symbol, indicator, curr_date)
-        
-        # Generate the date range we need
-        current_dt = curr_date_dt
-        date_values = []
-        
-        while current_dt >= before:
-            date_str = current_dt.strftime('%Y-%m-%d')
-            
-            # Look up the indicator value for this date
-            if date_str in indicator_data:
-                indicator_value = indicator_data[date_str]
-            else:
-                indicator_value = "N/A: Not a trading day (weekend or holiday)"
-            
-            date_values.append((date_str, indicator_value))
-            current_dt = current_dt - relativedelta(days=1)
-        
-        # Build the result string
-        ind_string = ""
-        for date_str, value in date_values:
-            ind_string += f"{date_str}: {value}\n"
-        
+        ind_string = format_indicator_window(indicator_data, start_date, end_date)
+
     except Exception as e:
         print(f"Error getting bulk stockstats data: {e}")
-        # Fallback to original implementation if bulk method fails
-        ind_string = ""
-        curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
-        while curr_date_dt >= before:
-            indicator_value = get_stockstats_indicator(
-                symbol, indicator, curr_date_dt.strftime("%Y-%m-%d")
-            )
-            ind_string += f"{curr_date_dt.strftime('%Y-%m-%d')}: {indicator_value}\n"
-            curr_date_dt = curr_date_dt - relativedelta(days=1)
+        # Fallback to the StockstatsUtils data path, still loading it only once
+        try:
+            indicator_data = StockstatsUtils.get_stock_stats_series(symbol, indicator)
+            ind_string = format_indicator_window(indicator_data, start_date, end_date)
+        except Exception as e:
+            raise RuntimeError(
+                f"Error getting stockstats indicator data for indicator {indicator} from {start_date} to {end_date}: {e}"
+            ) from e
 
     result_str = (
         f"## {indicator} values from {before.strftime('%Y-%m-%d')} to {end_date}:\n\n"
         + ind_string
         + "\n\n"
-        + best_ind_params.get(indicator, "No description available.")
+        + INDICATOR_DESCRIPTIONS.get(indicator, "No description available.")
     )
 
     return result_str
 
 
-def _get_stock_stats_bulk(
+def get_stock_stats_indicators_batch(
     symbol: Annotated[str, "ticker symbol of the company"],
-    indicator: Annotated[str, "technical indicator to calculate"],
-    curr_date: Annotated[str, "current date for reference"]
-) -> dict:
+    indicators: Annotated[
+        list, "technical indicators to compute, as a list or comma-separated string"
+    ],
+    curr_date: Annotated[
+        str, "The current trading date you are trading on, YYYY-mm-dd"
+    ],
+    look_back_days: Annotated[int, "how many days to look back"],
+) -> str:
     """
-    Optimized bulk calculation of stock stats indicators.
-    Fetches data once and calculates indicator for all available dates.
-    Returns dict mapping date strings to indicator values.
+    Compute several indicators in one pass and return them as a single table.
+
+    The price history is loaded and wrapped once; every indicator is then
+    computed on the same frame, so related indicators (e.g. macd/macds/macdh,
+    boll/boll_ub/boll_lb) share their intermediate columns. Rows are trading
+    days in the window, newest first, with one column per indicator.
+    """
+    if isinstance(indicators, str):
+        indicators = [ind.strip() for ind in indicators.split(",")]
+    # Keep the caller's order but drop empty entries and repeats
+    indicators = list(dict.fromkeys(ind for ind in indicators if ind))
+    if not indicators:
+        raise ValueError("At least one indicator must be requested.")
+
+    unsupported = [ind for ind in indicators if ind not in INDICATOR_DESCRIPTIONS]
+    if unsupported:
+        raise ValueError(
+            f"Indicators {unsupported} are not supported. Please choose from: {list(INDICATOR_DESCRIPTIONS.keys())}"
+        )
+
+    end_date = curr_date
+    curr_date_dt = datetime.strptime(curr_date, "%Y-%m-%d")
+    start_date = (curr_date_dt - relativedelta(days=look_back_days)).strftime(
+        "%Y-%m-%d"
+    )
+
+    df = _get_stock_stats_frame(symbol)
+    columns = {ind: indicator_series(df, ind) for ind in indicators}
+    table = pd.DataFrame(columns).loc[start_date:end_date].iloc[::-1]
+    table.index.name = "Date"
+
+    if table.empty:
+        table_str = f"No trading days found for {symbol} between {start_date} and {end_date}\n"
+    else:
+        table_str = table.round(4).to_csv(na_rep="N/A")
+
+    descriptions = "\n".join(
+        f"- {ind}: {INDICATOR_DESCRIPTIONS[ind]}" for ind in indicators
+    )
+
+    return (
+        f"## {', '.join(indicators)} values for {symbol.upper()} from {start_date} to {end_date} "
+        f"(trading days only, newest first):\n\n"
+        + table_str
+        + "\n"
+        + descriptions
+    )
+
+
+def _get_stock_stats_frame(
+    symbol: Annotated[str, "ticker symbol of the company"],
+):
+    """
+    Load the configured price history for a symbol and wrap it for stockstats.
+    The "Date" column holds YYYY-mm-dd strings.
     """
-    from .config import get_config
-    import pandas as pd
-    from stockstats import wrap
-    import os
-    
     config = get_config()
     online = config["data_vendors"]["technical_indicators"] != "local"
-    
+
     if not online:
         # Local data path
         try:
-            data = pd.read_csv(
+            data = load_local_price_csv(
                 os.path.join(
                     config.get("data_cache_dir", "data"),
                     f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
                 )
             )
-            df = wrap(data)
+            df = wrap(data.copy())
         except FileNotFoundError:
             raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
     else:
-        # Online data fetching with caching
-        today_date = pd.Timestamp.today()
-        curr_date_dt = pd.to_datetime(curr_date)
-        
-        end_date = today_date
-        start_date = today_date - pd.DateOffset(years=15)
-        start_date_str = start_date.strftime("%Y-%m-%d")
-        end_date_str = end_date.strftime("%Y-%m-%d")
-        
-        os.makedirs(config["data_cache_dir"], exist_ok=True)
-        
-        data_file = os.path.join(
-            config["data_cache_dir"],
-            f"{symbol}-YFin-data-{start_date_str}-{end_date_str}.csv",
-        )
-        
-        if os.path.exists(data_file):
-            data = pd.read_csv(data_file)
-            data["Date"] = pd.to_datetime(data["Date"])
-        else:
-            data = yf.download(
-                symbol,
-                start=start_date_str,
-                end=end_date_str,
-                multi_level_index=False,
-                progress=False,
-                auto_adjust=True,
-            )
-            data = data.reset_index()
-            data.to_csv(data_file, index=False)
-        
+        # Served from the persistent price store, refreshed at most once a day
+        data = get_price_history(symbol).reset_index()
+
         df = wrap(data)
         df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-    
+
+    return df
+
+
+def _get_stock_stats_bulk(
+    symbol: Annotated[str, "ticker symbol of the company"],
+    indicator: Annotated[str, "technical indicator to calculate"],
+    curr_date: Annotated[str, "current date for reference"]
+) -> pd.Series:
+    """
+    Optimized bulk calculation of stock stats indicators.
+    Fetches data once and calculates indicator for all available dates.
+    Returns a Series of indicator values indexed by ascending date strings.
+    """
     # Calculate the indicator for all rows at once
-    df[indicator]  # This triggers stockstats to calculate the indicator
-    
-    # Create a dictionary mapping date strings to indicator values
-    result_dict = {}
-    for _, row in df.iterrows():
-        date_str = row["Date"]
-        indicator_value = row[indicator]
-        
-        # Handle NaN/None values
-        if pd.isna(indicator_value):
-            result_dict[date_str] = "N/A"
-        else:
-            result_dict[date_str] = str(indicator_value)
-    
-    return result_dict
+    return indicator_series(_get_stock_stats_frame(symbol), indicator)
 
 
 def get_stockstats_indicator(
@@ -308,7 +321,7 @@ def get_balance_sheet(
             data = ticker_obj.balance_sheet
             
         if data.empty:
-            return f"No balance sheet data found for symbol '{ticker}'"
+            raise ValueError(f"No balance sheet data found for symbol '{ticker}'")
             
         # Convert to CSV string for consistency with other functions
         csv_string = data.to_csv()
@@ -319,8 +332,10 @@ def get_balance_sheet(
         
         return header + csv_string
         
+    except ValueError:
+        raise
     except Exception as e:
-        return f"Error retrieving balance sheet for {ticker}: {str(e)}"
+        raise RuntimeError(f"Error retrieving balance sheet for {ticker}: {e}") from e
 
 
 def get_cashflow(
@@ -338,7 +353,7 @@ def get_cashflow(
             data = ticker_obj.cashflow
             
         if data.empty:
-            return f"No cash flow data found for symbol '{ticker}'"
+            raise ValueError(f"No cash flow data found for symbol '{ticker}'")
             
         # Convert to CSV string for consistency with other functions
         csv_string = data.to_csv()
@@ -349,8 +364,10 @@ def get_cashflow(
         
         return header + csv_string
         
+    except ValueError:
+        raise
     except Exception as e:
-        return f"Error retrieving cash flow for {ticker}: {str(e)}"
+        raise RuntimeError(f"Error retrieving cash flow for {ticker}: {e}") from e
 
 
 def get_income_statement(
@@ -368,7 +385,7 @@ def get_income_statement(
             data = ticker_obj.income_stmt
             
         if data.empty:
-            return f"No income statement data found for symbol '{ticker}'"
+            raise ValueError(f"No income statement data found for symbol '{ticker}'")
             
         # Convert to CSV string for consistency with other functions
         csv_string = data.to_csv()
@@ -379,8 +396,10 @@ def get_income_statement(
         
         return header + csv_string
         
+    except ValueError:
+        raise
     except Exception as e:
-        return f"Error retrieving income statement for {ticker}: {str(e)}"
+        raise RuntimeError(f"Error retrieving income statement for {ticker}: {e}") from e
 
 
 def get_insider_transactions(
@@ -392,7 +411,7 @@ def get_insider_transactions(
         data = ticker_obj.insider_transactions
         
         if data is None or data.empty:
-            return f"No insider transactions data found for symbol '{ticker}'"
+            raise ValueError(f"No insider transactions data found for symbol '{ticker}'")
             
         # Convert to CSV string for consistency with other functions
         csv_string = data.to_csv()
@@ -403,5 +422,7 @@ def get_insider_transactions(
         
         return header + csv_string
         
+    except ValueError:
+        raise
     except Exception as e:
-        return f"Error retrieving insider transactions for {ticker}: {str(e)}"
\ No newline at end of file
+        raise RuntimeError(f"Error retrieving insider transactions for {ticker}: {e}") from e
\ No newline at end of file
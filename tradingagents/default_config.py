@@ -26,6 +26,19 @@ def _detect_system_language():
 DEFAULT_CONFIG = {
     "project_dir": os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
     "results_dir": os.getenv("TRADINGAGENTS_RESULTS_DIR", "./results"),
+    # Per-run state logs: <state_log_dir>/<ticker>/TradingAgentsStrategy_logs/runs/*.jsonl
+    # plus an index.jsonl per ticker; node updates are appended as each node completes
+    "state_log_dir": os.getenv("TRADINGAGENTS_STATE_LOG_DIR", "eval_results"),
+    "state_log_node_updates": True,
+    # Where agent memories and their embedding cache persist (None: in-memory only)
+    "memory_dir": os.getenv("TRADINGAGENTS_MEMORY_DIR", "./memory"),
+    # Vector store for agent memories. Options: chroma, local (memory-mapped NumPy
+    # matrix with exact cosine search, no Chroma dependency)
+    "memory_backend": "chroma",
+    # Embeddings for agent memories. Options: openai (OpenAI-compatible API, DashScope
+    # by default), local (deterministic hashed n-grams on CPU, works offline)
+    "embedding_provider": "openai",
+    "embedding_dimensions": None,  # local provider only; None: 256
     "data_dir": "/Users/yluo/Documents/Code/ScAI/FR1-data",
     "data_cache_dir": os.path.join(
         os.path.abspath(os.path.join(os.path.dirname(__file__), ".")),
@@ -36,10 +49,32 @@ DEFAULT_CONFIG = {
     "deep_think_llm": "o4-mini",
     "quick_think_llm": "gpt-4o-mini",
     "backend_url": "https://api.openai.com/v1",
+    # LLM response cache: identical requests (model, parameters, messages and tool
+    # schemas) are answered from <data_cache_dir>/llm_cache.sqlite3 or "path"
+    "llm_cache": {
+        "enabled": False,
+        "path": None,
+    },
     # Debate and discussion settings
     "max_debate_rounds": 1,
     "max_risk_discuss_rounds": 1,
     "max_recur_limit": 100,
+    # Debate history compaction: once the history a debate prompt embeds exceeds
+    # history_token_budget, all but the last keep_last_turns turns are folded into
+    # a rolling summary written by the quick-thinking LLM (None: never compact)
+    "debate_context": {
+        "history_token_budget": 8000,
+        "keep_last_turns": 2,
+        "summary_token_target": 800,
+    },
+    # Analyst execution settings
+    # True: every selected analyst runs concurrently in its own message channel,
+    # and the graph joins at the Bull Researcher once all reports are filled
+    "parallel_analysts": False,
+    # True: a Report Digest node condenses the four analyst reports once, and the
+    # bull/bear researchers and risk debators read the digest instead of the full
+    # reports (which stay in the state and the logs)
+    "report_digest": False,
     # Language settings (auto-detected from system locale, can be overridden by TRADINGAGENTS_LANGUAGE env var)
     "language": os.getenv("TRADINGAGENTS_LANGUAGE", _detect_system_language()),  # Options: zh (Chinese), en (English)
     # Data vendor configuration
@@ -57,4 +92,63 @@ DEFAULT_CONFIG = {
         # Example: "get_stock_data": "alpha_vantage",  # Override category default
         # Example: "get_news": "openai",               # Override category default
     },
+    # Vendor routing settings
+    "vendor_routing": {
+        "mode": "sequential",      # Options: sequential (one vendor after another), hedged (start the next
+                                   # vendor if the current one hasn't answered within hedge_delay_ms),
+                                   # first_success (all configured vendors at once, first result wins),
+                                   # gather (all configured vendors at once, results merged in config order).
+                                   # Unconfigured fallback vendors only run once every configured one has
+                                   # failed: hedged in hedged mode, one at a time otherwise
+        "vendor_timeout": None,    # Seconds before a vendor attempt is abandoned (None: wait indefinitely).
+                                   # An abandoned call can't be cancelled: it keeps one of the 16 routing
+                                   # workers until it returns, so a hanging vendor can starve later calls
+        "vendor_timeouts": {},     # Per-vendor overrides, e.g. {"google": 20, "alpha_vantage": 15}
+        "request_timeout": 30,     # Seconds each yfinance / OpenAI HTTP request may take, so abandoned calls end
+        "hedge_delay_ms": 2000,    # Delay before a hedged request starts the next vendor
+        "parallel_impls": True,    # Run multi-implementation vendors (e.g. local get_news) concurrently
+    },
+    # Tool result cache (in-process LRU in front of <data_cache_dir>/tool_cache.sqlite3)
+    "tool_cache": {
+        "enabled": True,
+        "memory_entries": 512,
+        # Seconds a result stays valid per data category (None: never expires)
+        "ttl": {
+            "core_stock_apis": 15 * 60,
+            "technical_indicators": 15 * 60,
+            "fundamental_data": 24 * 3600,
+            "news_data": 4 * 3600,
+            "fund_data": 3600,
+            "default": 3600,
+        },
+        # Overrides for requests whose dates are all before today (closed bars don't change);
+        # None (never expires) only applies to results that hold dated values
+        "closed_ttl": {
+            "core_stock_apis": None,
+            "technical_indicators": None,
+            "fund_data": None,
+        },
+    },
+    # Google News scraper (news vendor "google")
+    "google_news": {
+        "max_pages": 3,                 # Result pages fetched per query (10 results each)
+        "max_results": 30,
+        "min_request_interval": 1.5,    # Seconds between requests to the same host
+        "request_timeout": 15,
+        "cache_ttl": 6 * 3600,          # Seconds a cached page stays valid (ranges ending before today never
+                                        # expire; pages without results are never cached)
+    },
+    # AkShare data settings
+    "akshare": {
+        "spot_snapshot_ttl": 60,        # Seconds the shared whole-market A-share quote snapshot is reused
+    },
+    # Alpha Vantage client: one pooled HTTP session and one client-side quota shared
+    # by every thread and async task (defaults match the free tier; raise them for premium keys)
+    "alpha_vantage": {
+        "requests_per_minute": 5,
+        "requests_per_day": 25,      # None: no daily cap
+        "max_wait_seconds": 120,     # Longer queue waits raise AlphaVantageRateLimitError instead
+        "pool_size": 16,
+        "request_timeout": 30,
+    },
 }
@@ -6,6 +6,10 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch import PropagationResult
+from .backtest import Backtester, BacktestStep
+from .llm_cache import SQLiteLLMCache
+from .state_log import StateLogReader, StateLogWriter
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +18,10 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "PropagationResult",
+    "Backtester",
+    "BacktestStep",
+    "SQLiteLLMCache",
+    "StateLogReader",
+    "StateLogWriter",
 ]
@@ -0,0 +1,276 @@
+# TradingAgents/graph/backtest.py
+
+import json
+import os
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+from tradingagents.dataflows.price_store import get_price_history
+
+
+@dataclass
+class BacktestStep:
+    """One (ticker, trade_date) decision and the return it realized."""
+
+    ticker: str
+    trade_date: str
+    decision: Optional[str] = None
+    position: int = 0
+    entry_close: Optional[float] = None
+    exit_date: Optional[str] = None
+    exit_close: Optional[float] = None
+    realized_return: Optional[float] = None
+    strategy_return: Optional[float] = None
+    reflected: bool = False
+    error: Optional[str] = None
+
+
+# Decision keywords, in the order they are checked
+_POSITION_KEYWORDS = (
+    ("SELL", -1),
+    ("卖出", -1),
+    ("BUY", 1),
+    ("买入", 1),
+    ("HOLD", 0),
+    ("持有", 0),
+)
+
+
+def decision_to_position(decision: str) -> int:
+    """Map a processed BUY/SELL/HOLD signal to a +1/-1/0 position."""
+    text = (decision or "").upper()
+    for keyword, position in _POSITION_KEYWORDS:
+        if keyword in text:
+            return position
+    return 0
+
+
+def _reflection_state(final_state: Dict[str, Any]) -> Dict[str, Any]:
+    """The parts of a final state the Reflector reads, in JSON-friendly form."""
+    return {
+        "market_report": final_state["market_report"],
+        "sentiment_report": final_state["sentiment_report"],
+        "news_report": final_state["news_report"],
+        "fundamentals_report": final_state["fundamentals_report"],
+        "trader_investment_plan": final_state["trader_investment_plan"],
+        "investment_debate_state": {
+            "bull_history": final_state["investment_debate_state"]["bull_history"],
+            "bear_history": final_state["investment_debate_state"]["bear_history"],
+            "judge_decision": final_state["investment_debate_state"]["judge_decision"],
+        },
+        "risk_debate_state": {
+            "judge_decision": final_state["risk_debate_state"]["judge_decision"],
+        },
+    }
+
+
+class Backtester:
+    """Runs a TradingAgentsGraph over every trading day in a date range.
+
+    For each (trade_date, ticker) the graph is propagated, the decision is
+    scored against the close ``holding_days`` trading days later, and the
+    reflection is fed back through ``reflect_and_remember`` once that exit
+    close would have been known, i.e. before the first decision made on or
+    after the exit date. Progress is checkpointed to JSON after every step
+    and every reflection, so an interrupted run resumes at the first
+    unfinished day without repeating reflections already remembered.
+    """
+
+    def __init__(
+        self,
+        graph,
+        tickers: List[str],
+        start_date: str,
+        end_date: str,
+        holding_days: int = 1,
+        checkpoint_path: Optional[str] = None,
+        reflect: bool = True,
+        price_loader: Callable[[str], pd.DataFrame] = get_price_history,
+    ):
+        """
+        Args:
+            graph: TradingAgentsGraph to drive
+            tickers: Symbols to trade
+            start_date: First trade date, yyyy-mm-dd
+            end_date: Last trade date, yyyy-mm-dd
+            holding_days: Trading days each decision is held for
+            checkpoint_path: JSON checkpoint file; defaults to one under results_dir
+            reflect: Whether realized returns are fed to reflect_and_remember
+            price_loader: Returns a daily frame with a Close column and a date index
+        """
+        if holding_days < 1:
+            raise ValueError("holding_days must be at least 1")
+
+        self.graph = graph
+        self.tickers = list(tickers)
+        self.start_date = start_date
+        self.end_date = end_date
+        self.holding_days = holding_days
+        self.reflect = reflect
+        self.price_loader = price_loader
+        self.checkpoint_path = checkpoint_path or os.path.join(
+            graph.config["results_dir"],
+            "backtests",
+            f"{'_'.join(self.tickers)}_{start_date}_{end_date}_h{holding_days}.json",
+        )
+
+        self.steps: List[BacktestStep] = []
+        # Finished steps whose reflection waits for the exit close to be known
+        self._pending: List[Dict[str, Any]] = []
+        self._closes: Dict[str, pd.Series] = {}
+
+    def _close_series(self, ticker: str) -> pd.Series:
+        if ticker not in self._closes:
+            data = self.price_loader(ticker)
+            closes = data["Close"].dropna()
+            closes.index = pd.to_datetime(closes.index).strftime("%Y-%m-%d")
+            self._closes[ticker] = closes[~closes.index.duplicated(keep="last")].sort_index()
+        return self._closes[ticker]
+
+    def schedule(self) -> List[tuple]:
+        """All (trade_date, ticker) pairs to run, in chronological order."""
+        pairs = []
+        for ticker in self.tickers:
+            closes = self._close_series(ticker)
+            for trade_date in closes.loc[self.start_date:self.end_date].index:
+                pairs.append((trade_date, ticker))
+        order = {ticker: i for i, ticker in enumerate(self.tickers)}
+        return sorted(pairs, key=lambda pair: (pair[0], order[pair[1]]))
+
+    def _score(self, step: BacktestStep) -> None:
+        """Fill in the entry/exit closes and returns for a finished step."""
+        closes = self._close_series(step.ticker)
+        entry_index = closes.index.get_loc(step.trade_date)
+        step.entry_close = float(closes.iloc[entry_index])
+
+        exit_index = entry_index + self.holding_days
+        if exit_index >= len(closes):
+            return
+        step.exit_date = closes.index[exit_index]
+        step.exit_close = float(closes.iloc[exit_index])
+        step.realized_return = step.exit_close / step.entry_close - 1.0
+        step.strategy_return = step.position * step.realized_return
+
+    def _load_checkpoint(self) -> None:
+        if not os.path.exists(self.checkpoint_path):
+            return
+        with open(self.checkpoint_path, "r", encoding="utf-8") as f:
+            checkpoint = json.load(f)
+        # Failed steps are dropped so the resumed run retries them
+        self.steps = [
+            BacktestStep(**step) for step in checkpoint["steps"] if step["error"] is None
+        ]
+        self._pending = checkpoint["pending"]
+        print(
+            f"Resuming backtest from {self.checkpoint_path}: {len(self.steps)} step(s) already done"
+        )
+
+    def _save_checkpoint(self) -> None:
+        os.makedirs(os.path.dirname(os.path.abspath(self.checkpoint_path)), exist_ok=True)
+        checkpoint = {
+            "tickers": self.tickers,
+            "start_date": self.start_date,
+            "end_date": self.end_date,
+            "holding_days": self.holding_days,
+            "steps": [asdict(step) for step in self.steps],
+            "pending": self._pending,
+        }
+        tmp_path = self.checkpoint_path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self.checkpoint_path)
+
+    def _returns_summary(self, step: BacktestStep) -> str:
+        return (
+            f"{step.ticker} decision {step.decision} on {step.trade_date}: "
+            f"price return {step.realized_return:+.2%} over {self.holding_days} trading day(s) "
+            f"to {step.exit_date}, position return {step.strategy_return:+.2%}"
+        )
+
+    def _flush_reflections(self, known_by: Optional[str]) -> None:
+        """Reflect on pending steps whose exit close is known by a date (None: all).
+
+        reflect_and_remember writes to persistent memory, so the checkpoint is
+        saved after every reflection; a resumed run never reflects a step twice.
+        """
+        if not self.reflect:
+            self._pending = []
+            return
+
+        steps = {(step.trade_date, step.ticker): step for step in self.steps}
+        for pending in list(self._pending):
+            step = steps[(pending["trade_date"], pending["ticker"])]
+            if known_by is not None and step.exit_date > known_by:
+                continue
+
+            # reflect_and_remember works on the graph's current state
+            self.graph.curr_state = pending["state"]
+            self.graph.reflect_and_remember(self._returns_summary(step))
+            step.reflected = True
+            self._pending = [item for item in self._pending if item is not pending]
+            self._save_checkpoint()
+
+    def run(self) -> List[BacktestStep]:
+        """Run (or resume) the backtest and return every step."""
+        self._load_checkpoint()
+        done = {(step.trade_date, step.ticker) for step in self.steps}
+
+        for trade_date, ticker in self.schedule():
+            if (trade_date, ticker) in done:
+                continue
+
+            self._flush_reflections(known_by=trade_date)
+
+            step = BacktestStep(ticker=ticker, trade_date=trade_date)
+            try:
+                final_state, decision = self.graph.propagate(ticker, trade_date)
+                step.decision = decision.strip()
+                step.position = decision_to_position(decision)
+                self._score(step)
+            except Exception as e:
+                print(f"FAILED: Backtest step {ticker} on {trade_date}: {e}")
+                step.error = f"{type(e).__name__}: {e}"
+                final_state = None
+
+            self.steps.append(step)
+            if final_state is not None and step.realized_return is not None:
+                self._pending.append(
+                    {
+                        "trade_date": trade_date,
+                        "ticker": ticker,
+                        "state": _reflection_state(final_state),
+                    }
+                )
+            self._save_checkpoint()
+
+        self._flush_reflections(known_by=None)
+        self._save_checkpoint()
+        self.steps.sort(key=lambda step: (step.trade_date, self.tickers.index(step.ticker)))
+        return self.steps
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """Per-ticker compounded strategy return, hit rate and step counts."""
+        summary = {}
+        for ticker in self.tickers:
+            scored = [
+                step for step in self.steps
+                if step.ticker == ticker and step.strategy_return is not None
+            ]
+            traded = [step for step in scored if step.position != 0]
+            compounded = 1.0
+            for step in scored:
+                compounded *= 1.0 + step.strategy_return
+            summary[ticker] = {
+                "steps": sum(step.ticker == ticker for step in self.steps),
+                "errors": sum(step.ticker == ticker and step.error is not None for step in self.steps),
+                "scored": len(scored),
+                "traded": len(traded),
+                "hit_rate": (
+                    sum(step.strategy_return > 0 for step in traded) / len(traded)
+                    if traded else None
+                ),
+                "cumulative_return": compounded - 1.0,
+            }
+        return summary
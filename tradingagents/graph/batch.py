@@ -0,0 +1,21 @@
+# TradingAgents/graph/batch.py
+
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+
+
+@dataclass
+class PropagationResult:
+    """Outcome of one (ticker, trade_date) run in a batch propagation."""
+
+    ticker: str
+    trade_date: str
+    final_state: Optional[Dict[str, Any]] = None
+    decision: Optional[str] = None
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        """Whether the run finished without raising."""
+        return self.error is None
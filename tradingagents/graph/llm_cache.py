@@ -0,0 +1,88 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Sequence
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+from langchain_core.outputs import ChatGeneration, Generation
+
+
+class SQLiteLLMCache(BaseCache):
+    """Persistent LangChain LLM cache keyed by a hash of (prompt, llm_string).
+
+    LangChain hands the cache the serialized messages as ``prompt`` and the
+    model name, call parameters and bound tool schemas as ``llm_string``, so
+    a hit means the exact same request was made before. Generations are
+    stored as LangChain JSON in SQLite, and hit/miss counters are kept for
+    the lifetime of the object.
+    """
+
+    def __init__(self, db_path: str):
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stores": 0}
+
+        os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+        self._conn = sqlite3.connect(db_path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS llm_responses ("
+            " key TEXT PRIMARY KEY,"
+            " llm_string TEXT NOT NULL,"
+            " created_at REAL NOT NULL,"
+            " generations TEXT NOT NULL)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[Sequence[Generation]]:
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT generations FROM llm_responses WHERE key = ?", (key,)
+            ).fetchone()
+            self._stats["hits" if row is not None else "misses"] += 1
+        if row is None:
+            return None
+        return loads(row[0])
+
+    def update(self, prompt: str, llm_string: str, return_val: Sequence[Generation]) -> None:
+        generations = []
+        for generation in return_val:
+            if isinstance(generation, ChatGeneration):
+                # Let each replay get a fresh message id; LangGraph merges messages by id
+                generation = generation.model_copy(
+                    update={"message": generation.message.model_copy(update={"id": None})}
+                )
+            generations.append(generation)
+
+        key = self._key(prompt, llm_string)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_responses (key, llm_string, created_at, generations)"
+                " VALUES (?, ?, ?, ?)",
+                (key, llm_string, time.time(), dumps(generations)),
+            )
+            self._conn.commit()
+            self._stats["stores"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_responses")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters since this cache was created."""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
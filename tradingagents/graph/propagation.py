@@ -24,7 +24,14 @@ class Propagator:
             "company_of_interest": company_name,
             "trade_date": str(trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "summary": "",
+                    "summarized_upto": 0,
+                    "token_usage": [],
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -33,12 +40,16 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "summary": "",
+                    "summarized_upto": 0,
+                    "token_usage": [],
                 }
             ),
             "market_report": "",
             "fundamentals_report": "",
             "sentiment_report": "",
             "news_report": "",
+            "report_digest": "",
         }
 
     def get_graph_args(self) -> Dict[str, Any]:
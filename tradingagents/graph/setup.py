@@ -1,15 +1,25 @@
 # TradingAgents/graph/setup.py
 
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+from langchain_core.runnables import RunnableLambda
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
 from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
+from tradingagents.agents.utils.debate_context import DebateContext
 
 from .conditional_logic import ConditionalLogic
 
+# State key each analyst writes its final report to
+ANALYST_REPORT_KEYS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
 
 class GraphSetup:
     """Handles the setup and configuration of the agent graph."""
@@ -25,6 +35,7 @@ class GraphSetup:
         invest_judge_memory,
         risk_manager_memory,
         conditional_logic: ConditionalLogic,
+        debate_context: Optional[DebateContext] = None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -36,9 +47,13 @@ class GraphSetup:
         self.invest_judge_memory = invest_judge_memory
         self.risk_manager_memory = risk_manager_memory
         self.conditional_logic = conditional_logic
+        self.debate_context = debate_context
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"]
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        parallel_analysts=False,
+        report_digest=False,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -48,6 +63,12 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            parallel_analysts (bool): If True, fan out all selected analysts from
+                START concurrently, each in its own isolated message channel, and
+                join at the Bull Researcher. If False, run them in sequence.
+            report_digest (bool): If True, add a Report Digest node between the
+                analysts and the Bull Researcher that condenses the analyst
+                reports once; the debate agents then read the digest instead.
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -87,34 +108,41 @@ class GraphSetup:
 
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
-            self.quick_thinking_llm, self.bull_memory
+            self.quick_thinking_llm, self.bull_memory, self.debate_context
         )
         bear_researcher_node = create_bear_researcher(
-            self.quick_thinking_llm, self.bear_memory
+            self.quick_thinking_llm, self.bear_memory, self.debate_context
         )
         research_manager_node = create_research_manager(
-            self.deep_thinking_llm, self.invest_judge_memory
+            self.deep_thinking_llm, self.invest_judge_memory, self.debate_context
         )
         trader_node = create_trader(self.quick_thinking_llm, self.trader_memory)
 
         # Create risk analysis nodes
-        risky_analyst = create_risky_debator(self.quick_thinking_llm)
-        neutral_analyst = create_neutral_debator(self.quick_thinking_llm)
-        safe_analyst = create_safe_debator(self.quick_thinking_llm)
+        risky_analyst = create_risky_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        neutral_analyst = create_neutral_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
+        safe_analyst = create_safe_debator(
+            self.quick_thinking_llm, self.debate_context
+        )
         risk_manager_node = create_risk_manager(
-            self.deep_thinking_llm, self.risk_manager_memory
+            self.deep_thinking_llm, self.risk_manager_memory, self.debate_context
         )
 
         # Create workflow
         workflow = StateGraph(AgentState)
 
-        # Add analyst nodes to the graph
-        for analyst_type, node in analyst_nodes.items():
-            workflow.add_node(f"{analyst_type.capitalize()} Analyst", node)
+        # Where the analysts hand over to the debate
+        debate_entry = "Bull Researcher"
+        if report_digest:
             workflow.add_node(
-                f"Msg Clear {analyst_type.capitalize()}", delete_nodes[analyst_type]
+                "Report Digest", create_report_digester(self.quick_thinking_llm)
             )
-            workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
+            workflow.add_edge("Report Digest", "Bull Researcher")
+            debate_entry = "Report Digest"
 
         # Add other nodes
         workflow.add_node("Bull Researcher", bull_researcher_node)
@@ -126,31 +154,24 @@ class GraphSetup:
         workflow.add_node("Safe Analyst", safe_analyst)
         workflow.add_node("Risk Judge", risk_manager_node)
 
-        # Define edges
-        # Start with the first analyst
-        first_analyst = selected_analysts[0]
-        workflow.add_edge(START, f"{first_analyst.capitalize()} Analyst")
-
-        # Connect analysts in sequence
-        for i, analyst_type in enumerate(selected_analysts):
-            current_analyst = f"{analyst_type.capitalize()} Analyst"
-            current_tools = f"tools_{analyst_type}"
-            current_clear = f"Msg Clear {analyst_type.capitalize()}"
-
-            # Add conditional edges for current analyst
-            workflow.add_conditional_edges(
-                current_analyst,
-                getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
-                [current_tools, current_clear],
+        if parallel_analysts:
+            self._add_parallel_analysts(
+                workflow,
+                selected_analysts,
+                analyst_nodes,
+                delete_nodes,
+                tool_nodes,
+                debate_entry,
+            )
+        else:
+            self._add_sequential_analysts(
+                workflow,
+                selected_analysts,
+                analyst_nodes,
+                delete_nodes,
+                tool_nodes,
+                debate_entry,
             )
-            workflow.add_edge(current_tools, current_analyst)
-
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
-            if i < len(selected_analysts) - 1:
-                next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
-                workflow.add_edge(current_clear, next_analyst)
-            else:
-                workflow.add_edge(current_clear, "Bull Researcher")
 
         # Add remaining edges
         workflow.add_conditional_edges(
@@ -200,3 +221,116 @@ class GraphSetup:
 
         # Compile and return
         return workflow.compile()
+
+    def _add_analyst_loop(
+        self, workflow, analyst_type, analyst_node, delete_node, tool_node
+    ):
+        """Add one analyst's tool-calling loop (analyst -> tools -> analyst -> clear)."""
+        current_analyst = f"{analyst_type.capitalize()} Analyst"
+        current_tools = f"tools_{analyst_type}"
+        current_clear = f"Msg Clear {analyst_type.capitalize()}"
+
+        workflow.add_node(current_analyst, analyst_node)
+        workflow.add_node(current_clear, delete_node)
+        workflow.add_node(current_tools, tool_node)
+
+        workflow.add_conditional_edges(
+            current_analyst,
+            getattr(self.conditional_logic, f"should_continue_{analyst_type}"),
+            [current_tools, current_clear],
+        )
+        workflow.add_edge(current_tools, current_analyst)
+
+        return current_analyst, current_clear
+
+    def _add_sequential_analysts(
+        self,
+        workflow,
+        selected_analysts,
+        analyst_nodes,
+        delete_nodes,
+        tool_nodes,
+        debate_entry="Bull Researcher",
+    ):
+        """Chain the analysts one after another on the shared message channel."""
+        loops = [
+            self._add_analyst_loop(
+                workflow,
+                analyst_type,
+                analyst_nodes[analyst_type],
+                delete_nodes[analyst_type],
+                tool_nodes[analyst_type],
+            )
+            for analyst_type in selected_analysts
+        ]
+
+        # Start with the first analyst
+        workflow.add_edge(START, loops[0][0])
+
+        # Connect to next analyst or to the debate entry if this is the last analyst
+        for i, (_, current_clear) in enumerate(loops):
+            if i < len(loops) - 1:
+                workflow.add_edge(current_clear, loops[i + 1][0])
+            else:
+                workflow.add_edge(current_clear, debate_entry)
+
+    def _add_parallel_analysts(
+        self,
+        workflow,
+        selected_analysts,
+        analyst_nodes,
+        delete_nodes,
+        tool_nodes,
+        debate_entry="Bull Researcher",
+    ):
+        """Fan the analysts out from START and join them at the debate entry node.
+
+        Each analyst loop is compiled into its own subgraph so its tool-call
+        messages never interleave with the other analysts'. Only the finished
+        report is written back to the parent state.
+        """
+        team_nodes = []
+        for analyst_type in selected_analysts:
+            subgraph = StateGraph(AgentState)
+            current_analyst, current_clear = self._add_analyst_loop(
+                subgraph,
+                analyst_type,
+                analyst_nodes[analyst_type],
+                delete_nodes[analyst_type],
+                tool_nodes[analyst_type],
+            )
+            subgraph.add_edge(START, current_analyst)
+            subgraph.add_edge(current_clear, END)
+
+            team_node = f"{analyst_type.capitalize()} Analyst Team"
+            workflow.add_node(
+                team_node,
+                self._create_isolated_analyst_node(analyst_type, subgraph.compile()),
+            )
+            workflow.add_edge(START, team_node)
+            team_nodes.append(team_node)
+
+        # Wait for every analyst before the debate starts
+        workflow.add_edge(team_nodes, debate_entry)
+
+    @staticmethod
+    def _create_isolated_analyst_node(analyst_type, analyst_graph):
+        """Wrap a compiled analyst subgraph so it runs on a private message list."""
+        report_key = ANALYST_REPORT_KEYS[analyst_type]
+
+        def build_input(state):
+            return {
+                "messages": [("human", state["company_of_interest"])],
+                "company_of_interest": state["company_of_interest"],
+                "trade_date": state["trade_date"],
+            }
+
+        def isolated_analyst_node(state, config):
+            result = analyst_graph.invoke(build_input(state), config)
+            return {report_key: result.get(report_key, "")}
+
+        async def aisolated_analyst_node(state, config):
+            result = await analyst_graph.ainvoke(build_input(state), config)
+            return {report_key: result.get(report_key, "")}
+
+        return RunnableLambda(isolated_analyst_node, afunc=aisolated_analyst_node)
@@ -11,6 +11,17 @@ class SignalProcessor:
         """Initialize with an LLM for processing."""
         self.quick_thinking_llm = quick_thinking_llm
 
+    def _build_messages(self, full_signal: str) -> list:
+        """Build the extraction prompt for a full trading signal."""
+        return [
+            (
+                "system",
+                "你是一名高效的助手，专门分析分析师团队提供的段落或金融报告。你的任务是提取投资决策：卖出 (SELL)、买入 (BUY) 或持有 (HOLD)。仅输出提取的决策（SELL、BUY 或 HOLD），不要添加任何额外的文本或信息。"
+                + get_language_instruction(),
+            ),
+            ("human", full_signal),
+        ]
+
     def process_signal(self, full_signal: str) -> str:
         """
         Process a full trading signal to extract the core decision.
@@ -21,13 +32,9 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
-        messages = [
-            (
-                "system",
-                "你是一名高效的助手，专门分析分析师团队提供的段落或金融报告。你的任务是提取投资决策：卖出 (SELL)、买入 (BUY) 或持有 (HOLD)。仅输出提取的决策（SELL、BUY 或 HOLD），不要添加任何额外的文本或信息。"
-                + get_language_instruction(),
-            ),
-            ("human", full_signal),
-        ]
+        return self.quick_thinking_llm.invoke(self._build_messages(full_signal)).content
 
-        return self.quick_thinking_llm.invoke(messages).content
+    async def aprocess_signal(self, full_signal: str) -> str:
+        """Async variant of process_signal."""
+        result = await self.quick_thinking_llm.ainvoke(self._build_messages(full_signal))
+        return result.content
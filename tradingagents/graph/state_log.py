@@ -0,0 +1,129 @@
+# TradingAgents/graph/state_log.py
+
+import json
+import os
+import threading
+import time
+import uuid
+from typing import Any, Dict, Iterator, List, Optional
+
+_index_lock = threading.Lock()
+
+
+def _to_jsonable(value: Any) -> Any:
+    """json.dumps fallback for LangChain messages and other objects in node updates."""
+    if hasattr(value, "model_dump"):
+        return value.model_dump()
+    return str(value)
+
+
+def _ticker_log_dir(log_dir: str, ticker: str) -> str:
+    return os.path.join(log_dir, ticker, "TradingAgentsStrategy_logs")
+
+
+class StateLogWriter:
+    """Append-only JSON Lines log of one run.
+
+    Each run gets its own file under
+    ``<log_dir>/<ticker>/TradingAgentsStrategy_logs/runs/``: one line per node
+    update as the graph produces it, then one ``final`` line with the logged
+    final state. Finishing a run appends a line to the ticker's
+    ``index.jsonl`` recording where that final line starts, so a reader can
+    seek straight to it.
+    """
+
+    def __init__(self, log_dir: str, ticker: str, trade_date: str, run_id: Optional[str] = None):
+        self.log_dir = log_dir
+        self.ticker = ticker
+        self.trade_date = str(trade_date)
+        self.run_id = run_id or f"{time.strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        self.events = 0
+
+        ticker_dir = _ticker_log_dir(log_dir, ticker)
+        os.makedirs(os.path.join(ticker_dir, "runs"), exist_ok=True)
+        self.relative_path = os.path.join("runs", f"{self.trade_date}_{self.run_id}.jsonl")
+        self.path = os.path.join(ticker_dir, self.relative_path)
+        self._file = open(self.path, "ab")
+
+    def _append(self, record: Dict[str, Any]) -> int:
+        """Write one line and return the byte offset it starts at."""
+        offset = self._file.tell()
+        line = json.dumps(record, ensure_ascii=False, default=_to_jsonable) + "\n"
+        self._file.write(line.encode("utf-8"))
+        self._file.flush()
+        return offset
+
+    def log_update(self, update: Dict[str, Any]) -> None:
+        """Record the state update of the node(s) that just completed."""
+        for node, node_update in update.items():
+            self._append(
+                {"type": "update", "seq": self.events, "node": node, "update": node_update}
+            )
+            self.events += 1
+
+    def log_final(self, entry: Dict[str, Any]) -> None:
+        """Record the final logged state, close the file and index the run."""
+        offset = self._append({"type": "final", "seq": self.events, "state": entry})
+        self.close()
+
+        index_record = {
+            "ticker": self.ticker,
+            "trade_date": self.trade_date,
+            "run_id": self.run_id,
+            "path": self.relative_path,
+            "final_offset": offset,
+            "events": self.events,
+            "finished_at": time.time(),
+        }
+        index_path = os.path.join(_ticker_log_dir(self.log_dir, self.ticker), "index.jsonl")
+        with _index_lock:
+            with open(index_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(index_record, ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class StateLogReader:
+    """Random access to the runs logged for one ticker."""
+
+    def __init__(self, ticker: str, log_dir: str = "eval_results"):
+        self.ticker = ticker
+        self.ticker_dir = _ticker_log_dir(log_dir, ticker)
+
+    def runs(self, trade_date: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Index entries of finished runs, oldest first, optionally for one date."""
+        index_path = os.path.join(self.ticker_dir, "index.jsonl")
+        if not os.path.exists(index_path):
+            return []
+        with open(index_path, "r", encoding="utf-8") as f:
+            entries = [json.loads(line) for line in f if line.strip()]
+        if trade_date is not None:
+            entries = [entry for entry in entries if entry["trade_date"] == str(trade_date)]
+        return entries
+
+    def _find_run(self, trade_date: str, run_id: Optional[str]) -> Dict[str, Any]:
+        entries = self.runs(trade_date)
+        if run_id is not None:
+            entries = [entry for entry in entries if entry["run_id"] == run_id]
+        if not entries:
+            raise KeyError(f"No logged run for {self.ticker} on {trade_date}")
+        return entries[-1]
+
+    def load(self, trade_date: str, run_id: Optional[str] = None) -> Dict[str, Any]:
+        """Final logged state of a run (the latest one for the date by default)."""
+        entry = self._find_run(trade_date, run_id)
+        with open(os.path.join(self.ticker_dir, entry["path"]), "rb") as f:
+            f.seek(entry["final_offset"])
+            return json.loads(f.readline())["state"]
+
+    def iter_updates(self, trade_date: str, run_id: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        """Node updates of a run, in the order the nodes completed."""
+        entry = self._find_run(trade_date, run_id)
+        with open(os.path.join(self.ticker_dir, entry["path"]), "rb") as f:
+            for line in f:
+                record = json.loads(line)
+                if record["type"] != "update":
+                    break
+                yield record
@@ -1,10 +1,13 @@
 # TradingAgents/graph/trading_graph.py
 
 import os
+import time
+import asyncio
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 import json
 from datetime import date
-from typing import Dict, Any, Tuple, List, Optional
+from typing import Dict, Any, Tuple, List, Optional, Callable, Iterator
 
 from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
@@ -15,6 +18,7 @@ from langgraph.prebuilt import ToolNode
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
 from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.debate_context import DebateContext, token_usage_by_node
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
@@ -26,6 +30,7 @@ from tradingagents.dataflows.config import set_config
 from tradingagents.agents.utils.agent_utils import (
     get_stock_data,
     get_indicators,
+    get_indicators_batch,
     get_fundamentals,
     get_balance_sheet,
     get_cashflow,
@@ -41,6 +46,9 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .batch import PropagationResult
+from .llm_cache import SQLiteLLMCache
+from .state_log import StateLogWriter
 
 
 class TradingAgentsGraph:
@@ -95,7 +103,13 @@ class TradingAgentsGraph:
             self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
         else:
             raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
-        
+
+        # Optional persistent response cache shared by every node's LLM calls
+        self.llm_cache = self._create_llm_cache()
+        if self.llm_cache is not None:
+            self.deep_thinking_llm.cache = self.llm_cache
+            self.quick_thinking_llm.cache = self.llm_cache
+
         # Initialize memories
         self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
         self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
@@ -118,6 +132,7 @@ class TradingAgentsGraph:
             self.invest_judge_memory,
             self.risk_manager_memory,
             self.conditional_logic,
+            self._create_debate_context(),
         )
 
         self.propagator = Propagator()
@@ -127,10 +142,46 @@ class TradingAgentsGraph:
         # State tracking
         self.curr_state = None
         self.ticker = None
-        self.log_states_dict = {}  # date to full state dict
 
         # Set up the graph
-        self.graph = self.graph_setup.setup_graph(selected_analysts)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts,
+            parallel_analysts=self.config.get("parallel_analysts", False),
+            report_digest=self.config.get("report_digest", False),
+        )
+
+    def _create_llm_cache(self) -> Optional[SQLiteLLMCache]:
+        """Create the LLM response cache if it is enabled in the config."""
+        cache_config = self.config.get("llm_cache") or {}
+        if not cache_config.get("enabled"):
+            return None
+        return SQLiteLLMCache(
+            cache_config.get("path")
+            or os.path.join(self.config["data_cache_dir"], "llm_cache.sqlite3")
+        )
+
+    def llm_cache_stats(self) -> Dict[str, Any]:
+        """Hit/miss counters of the LLM response cache ({} if disabled)."""
+        return self.llm_cache.stats() if self.llm_cache is not None else {}
+
+    def _create_debate_context(self) -> DebateContext:
+        """Create the debate history compactor, summarizing with the quick-thinking LLM."""
+        settings = {
+            **DEFAULT_CONFIG["debate_context"],
+            **(self.config.get("debate_context") or {}),
+        }
+        return DebateContext(self.quick_thinking_llm, **settings)
+
+    def debate_token_usage(self, final_state=None) -> Dict[str, Dict[str, int]]:
+        """Per-node prompt/response token totals of both debates in a final state.
+
+        Defaults to the state of the last ``propagate`` call.
+        """
+        final_state = final_state if final_state is not None else self.curr_state
+        return token_usage_by_node(
+            final_state["investment_debate_state"].get("token_usage", [])
+            + final_state["risk_debate_state"].get("token_usage", [])
+        )
 
     def _create_tool_nodes(self) -> Dict[str, ToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
@@ -141,6 +192,7 @@ class TradingAgentsGraph:
                     get_stock_data,
                     # Technical indicators
                     get_indicators,
+                    get_indicators_batch,
                 ]
             ),
             "social": ToolNode(
@@ -174,45 +226,254 @@ class TradingAgentsGraph:
 
         self.ticker = company_name
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
+        state_log = self._open_state_log(company_name, trade_date)
+        final_state = self._run_graph(
+            company_name, trade_date, debug=self.debug, state_log=state_log
         )
-        args = self.propagator.get_graph_args()
-
-        if self.debug:
-            # Debug mode with tracing
-            trace = []
-            for chunk in self.graph.stream(init_agent_state, **args):
-                if len(chunk["messages"]) == 0:
-                    pass
-                else:
-                    chunk["messages"][-1].pretty_print()
-                    trace.append(chunk)
-
-            final_state = trace[-1]
-        else:
-            # Standard mode without tracing
-            final_state = self.graph.invoke(init_agent_state, **args)
 
         # Store current state for reflection
         self.curr_state = final_state
 
         # Log state
-        self._log_state(trade_date, final_state)
+        self._log_state(state_log, final_state)
 
         # Return decision and processed signal
         return final_state, self.process_signal(final_state["final_trade_decision"])
 
-    def _log_state(self, trade_date, final_state):
-        """Log the final state to a JSON file."""
-        self.log_states_dict[str(trade_date)] = {
+    async def apropagate(self, company_name, trade_date):
+        """Async variant of propagate, driving the graph with ainvoke/astream."""
+
+        self.ticker = company_name
+
+        state_log = self._open_state_log(company_name, trade_date)
+        final_state = await self._arun_graph(
+            company_name, trade_date, debug=self.debug, state_log=state_log
+        )
+
+        # Store current state for reflection
+        self.curr_state = final_state
+
+        # Log state
+        self._log_state(state_log, final_state)
+
+        # Return decision and processed signal
+        return final_state, await self.aprocess_signal(
+            final_state["final_trade_decision"]
+        )
+
+    def propagate_many(
+        self,
+        runs: List[Tuple[str, str]],
+        max_concurrency: int = 4,
+        on_result: Optional[Callable[[PropagationResult], None]] = None,
+    ) -> List[PropagationResult]:
+        """Run the graph for many (ticker, trade_date) pairs with a worker pool.
+
+        The compiled graph, LLM clients and data caches are shared, but every run
+        keeps its own state (and its own state log file), so this does not touch
+        ``self.ticker`` or ``self.curr_state``. A failing run is recorded
+        in its result instead of aborting the batch.
+
+        Args:
+            runs: List of (ticker, trade_date) pairs
+            max_concurrency: Maximum number of runs in flight at once
+            on_result: Optional callback invoked with each result as it finishes
+
+        Returns:
+            List of PropagationResult in the same order as ``runs``
+        """
+        results: List[Optional[PropagationResult]] = [None] * len(runs)
+        for index, result in self.iter_propagate_many(runs, max_concurrency):
+            results[index] = result
+            if on_result is not None:
+                on_result(result)
+        return results
+
+    def iter_propagate_many(
+        self, runs: List[Tuple[str, str]], max_concurrency: int = 4
+    ) -> Iterator[Tuple[int, PropagationResult]]:
+        """Yield (index, PropagationResult) for each run in completion order."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        with ThreadPoolExecutor(max_workers=max_concurrency) as executor:
+            futures = {
+                executor.submit(self._propagate_isolated, ticker, trade_date): index
+                for index, (ticker, trade_date) in enumerate(runs)
+            }
+            for future in as_completed(futures):
+                yield futures[future], future.result()
+
+    async def apropagate_many(
+        self,
+        runs: List[Tuple[str, str]],
+        max_concurrency: int = 16,
+        on_result: Optional[Callable[[PropagationResult], None]] = None,
+    ) -> List[PropagationResult]:
+        """Async variant of propagate_many that keeps every run on one event loop."""
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+
+        async def run_one(ticker, trade_date):
+            async with semaphore:
+                result = await self._apropagate_isolated(ticker, trade_date)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        return await asyncio.gather(
+            *(run_one(ticker, trade_date) for ticker, trade_date in runs)
+        )
+
+    def _propagate_isolated(self, company_name, trade_date) -> PropagationResult:
+        """Run one analysis without touching per-instance run state."""
+        started = time.perf_counter()
+        try:
+            state_log = self._open_state_log(company_name, trade_date)
+            final_state = self._run_graph(company_name, trade_date, state_log=state_log)
+            self._log_state(state_log, final_state)
+            decision = self.process_signal(final_state["final_trade_decision"])
+        except Exception as e:
+            return PropagationResult(
+                ticker=company_name,
+                trade_date=str(trade_date),
+                error=f"{type(e).__name__}: {e}",
+                elapsed=time.perf_counter() - started,
+            )
+        return PropagationResult(
+            ticker=company_name,
+            trade_date=str(trade_date),
+            final_state=final_state,
+            decision=decision,
+            elapsed=time.perf_counter() - started,
+        )
+
+    async def _apropagate_isolated(
+        self, company_name, trade_date
+    ) -> PropagationResult:
+        """Async variant of _propagate_isolated."""
+        started = time.perf_counter()
+        try:
+            state_log = self._open_state_log(company_name, trade_date)
+            final_state = await self._arun_graph(
+                company_name, trade_date, state_log=state_log
+            )
+            self._log_state(state_log, final_state)
+            decision = await self.aprocess_signal(
+                final_state["final_trade_decision"]
+            )
+        except Exception as e:
+            return PropagationResult(
+                ticker=company_name,
+                trade_date=str(trade_date),
+                error=f"{type(e).__name__}: {e}",
+                elapsed=time.perf_counter() - started,
+            )
+        return PropagationResult(
+            ticker=company_name,
+            trade_date=str(trade_date),
+            final_state=final_state,
+            decision=decision,
+            elapsed=time.perf_counter() - started,
+        )
+
+    def _run_graph(self, company_name, trade_date, debug=False, state_log=None):
+        """Invoke the compiled graph for one run and return its final state.
+
+        With a state log, each node's update is appended to it as the node
+        completes; the state log file is closed if the run fails.
+        """
+        # Initialize state
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        if not debug and state_log is None:
+            # Standard mode without tracing
+            return self.graph.invoke(init_agent_state, **args)
+
+        args["stream_mode"] = ["updates", "values"]
+        final_state = None
+        try:
+            for mode, chunk in self.graph.stream(init_agent_state, **args):
+                final_state = self._handle_stream_chunk(
+                    mode, chunk, final_state, debug, state_log
+                )
+        except BaseException:
+            if state_log is not None:
+                state_log.close()
+            raise
+        return final_state
+
+    async def _arun_graph(self, company_name, trade_date, debug=False, state_log=None):
+        """Async variant of _run_graph."""
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date
+        )
+        args = self.propagator.get_graph_args()
+
+        if not debug and state_log is None:
+            return await self.graph.ainvoke(init_agent_state, **args)
+
+        args["stream_mode"] = ["updates", "values"]
+        final_state = None
+        try:
+            async for mode, chunk in self.graph.astream(init_agent_state, **args):
+                final_state = self._handle_stream_chunk(
+                    mode, chunk, final_state, debug, state_log
+                )
+        except BaseException:
+            if state_log is not None:
+                state_log.close()
+            raise
+        return final_state
+
+    @staticmethod
+    def _handle_stream_chunk(mode, chunk, final_state, debug, state_log):
+        """Route one (mode, chunk) pair from a multi-mode stream; returns the latest state."""
+        if mode == "updates":
+            if state_log is not None:
+                state_log.log_update(chunk)
+            return final_state
+
+        # Debug mode with tracing
+        if debug and len(chunk["messages"]) != 0:
+            chunk["messages"][-1].pretty_print()
+        return chunk
+
+    def _open_state_log(self, ticker, trade_date) -> Optional[StateLogWriter]:
+        """Start the state log file of one run, or None if node updates are not logged."""
+        if not self.config.get("state_log_node_updates", True):
+            return None
+        return StateLogWriter(self._state_log_dir(), ticker, trade_date)
+
+    def _state_log_dir(self) -> str:
+        return self.config.get("state_log_dir", "eval_results")
+
+    def _log_state(self, state_log, final_state):
+        """Append the final state to the run's state log and index the run."""
+        if state_log is None:
+            state_log = StateLogWriter(
+                self._state_log_dir(),
+                final_state["company_of_interest"],
+                final_state["trade_date"],
+            )
+        state_log.log_final(self._build_log_entry(final_state))
+
+    @staticmethod
+    def _build_log_entry(final_state):
+        """Select the parts of a final state that are written to the log."""
+        return {
             "company_of_interest": final_state["company_of_interest"],
             "trade_date": final_state["trade_date"],
             "market_report": final_state["market_report"],
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
             "fundamentals_report": final_state["fundamentals_report"],
+            "report_digest": final_state.get("report_digest", ""),
             "investment_debate_state": {
                 "bull_history": final_state["investment_debate_state"]["bull_history"],
                 "bear_history": final_state["investment_debate_state"]["bear_history"],
@@ -223,6 +484,9 @@ class TradingAgentsGraph:
                 "judge_decision": final_state["investment_debate_state"][
                     "judge_decision"
                 ],
+                "token_usage": final_state["investment_debate_state"].get(
+                    "token_usage", []
+                ),
             },
             "trader_investment_decision": final_state["trader_investment_plan"],
             "risk_debate_state": {
@@ -231,21 +495,12 @@ class TradingAgentsGraph:
                 "neutral_history": final_state["risk_debate_state"]["neutral_history"],
                 "history": final_state["risk_debate_state"]["history"],
                 "judge_decision": final_state["risk_debate_state"]["judge_decision"],
+                "token_usage": final_state["risk_debate_state"].get("token_usage", []),
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
         }
 
-        # Save to file
-        directory = Path(f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/")
-        directory.mkdir(parents=True, exist_ok=True)
-
-        with open(
-            f"eval_results/{self.ticker}/TradingAgentsStrategy_logs/full_states_log_{trade_date}.json",
-            "w",
-        ) as f:
-            json.dump(self.log_states_dict, f, indent=4)
-
     def reflect_and_remember(self, returns_losses):
         """Reflect on decisions and update memory based on returns."""
         self.reflector.reflect_bull_researcher(
@@ -267,3 +522,7 @@ class TradingAgentsGraph:
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    async def aprocess_signal(self, full_signal):
+        """Async variant of process_signal."""
+        return await self.signal_processor.aprocess_signal(full_signal)